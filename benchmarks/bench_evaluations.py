@@ -0,0 +1,83 @@
+"""
+Count model evaluations per optimization with and without the fused
+``value_and_gradient`` protocol.
+
+Run it with::
+
+    python benchmarks/bench_evaluations.py
+"""
+from time import perf_counter
+
+from numpy import exp, log
+from numpy.linalg import cholesky, solve
+from numpy.random import default_rng
+
+from optimix import Function, Scalar
+
+
+class LMM(Function):
+    """
+    Marginal likelihood of ``y ~ N(0, exp(a) * G @ G.T + exp(b) * I)``.
+    """
+
+    def __init__(self, n=300, fused=True):
+        rng = default_rng(0)
+        self._G = rng.normal(size=(n, 10)) / 10
+        self._y = self._G @ rng.normal(size=10) + rng.normal(size=n)
+        self._a = Scalar(0.0)
+        self._b = Scalar(0.0)
+        self._fused = fused
+        self.factorizations = 0
+        super(LMM, self).__init__("LMM", a=self._a, b=self._b)
+
+    def _factorize(self):
+        from numpy import eye
+
+        self.factorizations += 1
+        ea = exp(float(self._a.value))
+        eb = exp(float(self._b.value))
+        K = ea * self._G @ self._G.T + eb * eye(len(self._y))
+        L = cholesky(K)
+        Kiy = solve(K, self._y)
+        return ea, eb, K, L, Kiy
+
+    def value(self):
+        _, _, _, L, Kiy = self._factorize()
+        return log(L.diagonal()).sum() + self._y @ Kiy / 2
+
+    def gradient(self):
+        return self._gradient(self._factorize())
+
+    def _gradient(self, fact):
+        from numpy import eye
+
+        ea, eb, K, _, Kiy = fact
+        Ki = solve(K, eye(len(self._y)))
+        GGt = self._G @ self._G.T
+        da = ea * ((Ki * GGt).sum() - Kiy @ GGt @ Kiy) / 2
+        db = eb * (Ki.trace() - Kiy @ Kiy) / 2
+        return {"a": da, "b": db}
+
+    def value_and_gradient(self):
+        if not self._fused:
+            return super(LMM, self).value_and_gradient()
+        fact = self._factorize()
+        L, Kiy = fact[3], fact[4]
+        value = log(L.diagonal()).sum() + self._y @ Kiy / 2
+        return value, self._gradient(fact)
+
+
+def main():
+    for fused in [False, True]:
+        f = LMM(fused=fused)
+        start = perf_counter()
+        f._minimize(verbose=False)
+        elapsed = perf_counter() - start
+        print(
+            f"fused={fused!s:<5} factorizations={f.factorizations:<4} "
+            f"value={f.value():.6f} time={elapsed:.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+Time optimix hot paths.
+
+Each case is timed with :mod:`timeit`, keeping the best of several repeats, and
+the results can be saved as JSON and compared against a previous run::
+
+    python benchmarks/bench_suite.py --output baseline.json
+    python benchmarks/bench_suite.py --baseline baseline.json
+
+The comparison exits with status 1 if any case is slower than its baseline by
+more than ``--tolerance`` (a fraction). Use ``--quick`` to skip the largest
+sizes and ``--filter`` to run only the cases whose name contains a substring.
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+
+import numpy
+from numpy import arange, full, zeros
+
+from optimix import Function, Scalar, VariableSet, Vector
+from optimix._variables import Variables, merge_variables
+
+SIZES = [1, 10, 1000, 100000]
+QUICK_SIZES = [1, 10, 1000]
+DEPTHS = [1, 8, 32]
+
+
+class Quadratic(Function):
+    """
+    ``(s - 1)² + Σᵢ (vᵢ - i)²`` over a scalar ``s`` and, for ``n > 1``, a vector
+    ``v`` of size ``n - 1``.
+    """
+
+    def __init__(self, n):
+        self._s = Scalar(0.0)
+        self._t = arange(n - 1, dtype=float)
+        kwargs = dict(s=self._s)
+        if n > 1:
+            self._v = Vector(zeros(n - 1))
+            kwargs["v"] = self._v
+        super(Quadratic, self).__init__("Quadratic", **kwargs)
+
+    def reset(self):
+        self._s.value = 0.0
+        if len(self._t) > 0:
+            self._v.value = zeros(len(self._t))
+
+    def value(self):
+        v = (float(self._s.value) - 1) ** 2
+        if len(self._t) > 0:
+            d = self._v.value - self._t
+            v += d @ d
+        return v
+
+    def gradient(self):
+        g = {"s": 2 * (float(self._s.value) - 1)}
+        if len(self._t) > 0:
+            g["v"] = 2 * (self._v.value - self._t)
+        return g
+
+
+class Chain(Function):
+    """
+    Composite tree of the given depth, each level adding ``(s - 1)²``.
+    """
+
+    def __init__(self, depth):
+        self._s = Scalar(0.0)
+        self._child = None
+        composite = []
+        if depth > 1:
+            self._child = type(self)(depth - 1)
+            composite = [("child", self._child)]
+        super(Chain, self).__init__("Chain", composite, s=self._s)
+
+    def reset(self):
+        self._s.value = 0.0
+        if self._child is not None:
+            self._child.reset()
+
+    def value(self):
+        v = (float(self._s.value) - 1) ** 2
+        if self._child is not None:
+            v += self._child.value()
+        return v
+
+    def gradient(self):
+        g = {"s": 2 * (float(self._s.value) - 1)}
+        if self._child is not None:
+            for name, gi in self._child.gradient().items():
+                g["child." + name] = gi
+        return g
+
+
+class BlockChain(Chain):
+    """
+    :class:`Chain` writing its gradient through ``gradient_into``.
+    """
+
+    def gradient_into(self, out):
+        out["s"] = 2 * (float(self._s.value) - 1)
+        if self._child is not None:
+            self._child.gradient_into(out.child("child"))
+
+
+def case_minimize(n):
+    f = Quadratic(n)
+
+    def run():
+        f.reset()
+        f._minimize(verbose=False)
+
+    return run
+
+
+def case_minimize_composite(depth, cls=Chain):
+    f = cls(depth)
+
+    def run():
+        f.reset()
+        f._minimize(verbose=False)
+
+    return run
+
+
+def case_minimize_blocks(depth):
+    return case_minimize_composite(depth, BlockChain)
+
+
+def case_minimize_scalar(_):
+    f = Quadratic(1)
+    f._s.bounds = (-10.0, 10.0)
+
+    def run():
+        f.reset()
+        f._minimize_scalar(verbose=False)
+
+    return run
+
+
+def case_call(n):
+    f = Quadratic(n)
+    f._minimize(verbose=False)
+    x = full(n, 0.5)
+    return lambda: f(x)
+
+
+def case_approx_fprime(n):
+    f = Quadratic(n)
+    return f._approx_fprime
+
+
+def case_merge_variables(n):
+    children = {
+        f"f{i}": Variables(a=Scalar(0.0), b=Vector(zeros(3))) for i in range(n)
+    }
+    return lambda: merge_variables(children)
+
+
+def case_select(n):
+    variables = Variables({f"x{i}": Scalar(0.0) for i in range(n)})
+    return lambda: variables.select(False)
+
+
+def case_select_set(n):
+    variables = VariableSet({f"x{i}": 0.0 for i in range(n)})
+    return lambda: variables.select(False)
+
+
+def case_plan(n, compact=False):
+    spec = {f"x{i}": 0.0 for i in range(n)}
+    if compact:
+        variables = VariableSet(spec)
+    else:
+        variables = Variables({k: Scalar(v) for k, v in spec.items()})
+    first = variables[f"x{0}"]
+
+    def run():
+        # Fixing invalidates the cached plan, forcing a rebuild.
+        first.fix()
+        first.unfix()
+        variables.plan()
+
+    return run
+
+
+def case_plan_set(n):
+    return case_plan(n, compact=True)
+
+
+def case_scalar_get(_):
+    s = Scalar(0.0)
+    return lambda: s.value
+
+
+def case_scalar_set(_):
+    s = Scalar(0.0)
+
+    def run():
+        s.value = 1.5
+
+    return run
+
+
+def case_vector_set(n):
+    v = Vector(zeros(n))
+    x = full(n, 1.5)
+
+    def run():
+        v.value = x
+
+    return run
+
+
+def cases(quick):
+    sizes = QUICK_SIZES if quick else SIZES
+    yield "scalar_get", case_scalar_get, None
+    yield "scalar_set", case_scalar_set, None
+    for n in sizes:
+        yield f"vector_set[{n}]", case_vector_set, n
+    for n in [10, 100, 1000]:
+        yield f"merge_variables[{n}]", case_merge_variables, n
+        yield f"select[{n}]", case_select, n
+        yield f"select_set[{n}]", case_select_set, n
+        yield f"plan[{n}]", case_plan, n
+        yield f"plan_set[{n}]", case_plan_set, n
+    for n in sizes:
+        yield f"call[{n}]", case_call, n
+        yield f"minimize[{n}]", case_minimize, n
+    for n in [1, 10, 1000]:
+        yield f"approx_fprime[{n}]", case_approx_fprime, n
+    yield "minimize_scalar", case_minimize_scalar, None
+    for depth in DEPTHS:
+        yield f"minimize_composite[{depth}]", case_minimize_composite, depth
+        yield f"minimize_blocks[{depth}]", case_minimize_blocks, depth
+
+
+def measure(func, repeat, min_time):
+    """
+    Best time per call, in seconds.
+    """
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    best = min(timer.repeat(repeat, number)) / number
+    return dict(time=best, number=number, repeat=repeat)
+
+
+def machine():
+    return dict(
+        python=platform.python_version(),
+        numpy=numpy.__version__,
+        platform=platform.platform(),
+        processor=platform.processor(),
+    )
+
+
+def compare(results, baseline, tolerance):
+    """
+    Print the ratio of each time to its baseline and return the regressions.
+    """
+    regressions = []
+    for name, r in results.items():
+        if name not in baseline:
+            print(f"{name:<28} {r['time']:>12.3e} s   (new)")
+            continue
+        ratio = r["time"] / baseline[name]["time"]
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<28} {r['time']:>12.3e} s {ratio:>7.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    p.add_argument("--output", help="write the results to this JSON file")
+    p.add_argument("--baseline", help="compare against this JSON file")
+    p.add_argument("--tolerance", type=float, default=0.2)
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--min-time", type=float, default=0.2)
+    p.add_argument("--quick", action="store_true")
+    p.add_argument("--filter", default="")
+    args = p.parse_args(argv)
+
+    results = {}
+    for name, case, size in cases(args.quick):
+        if args.filter not in name:
+            continue
+        results[name] = measure(case(size), args.repeat, args.min_time)
+        if args.baseline is None:
+            print(f"{name:<28} {results[name]['time']:>12.3e} s")
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(dict(machine=machine(), results=results), f, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        if len(compare(results, baseline, args.tolerance)) > 0:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
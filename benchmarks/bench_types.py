@@ -0,0 +1,124 @@
+"""
+Compare variable value access against the former ``__getattr__`` and
+``__setattr__`` dispatch, and the trusted internal setter against the public
+property.
+
+Run it with::
+
+    python benchmarks/bench_types.py
+"""
+import timeit
+
+from numpy import asarray, atleast_1d, float64, ndarray, zeros
+
+from optimix import Scalar, Vector
+from optimix._types import _assign
+
+
+class DispatchScalar(object):
+    """
+    Value access as implemented before the ``value`` property.
+    """
+
+    __slots__ = ["raw", "value"]
+
+    def __init__(self, value):
+        from ndarray_listener import ndl
+
+        self.raw = ndl(float64(value))
+
+    def __setattr__(self, name, value):
+        if name == "value":
+            if isinstance(value, ndarray):
+                value = value.flat[0]
+            else:
+                value = float64(value)
+            self.raw[()] = value
+        else:
+            DispatchScalar.__dict__[name].__set__(self, value)
+
+    def __getattr__(self, name):
+        if name == "value":
+            name = "raw"
+        try:
+            return DispatchScalar.__dict__[name].__get__(self)
+        except KeyError:
+            raise AttributeError(name)
+
+
+class DispatchVector(object):
+    """
+    Value access as implemented before the ``value`` property.
+    """
+
+    __slots__ = ["raw", "value"]
+
+    def __init__(self, value):
+        from ndarray_listener import ndl
+
+        self.raw = ndl(asarray(value, float))
+
+    def __setattr__(self, name, value):
+        if name == "value":
+            value = asarray(value)
+            value = atleast_1d(value).ravel()
+            self.raw[:] = value
+        else:
+            DispatchVector.__dict__[name].__set__(self, value)
+
+    def __getattr__(self, name):
+        if name == "value":
+            name = "raw"
+        try:
+            return DispatchVector.__dict__[name].__get__(self)
+        except KeyError:
+            raise AttributeError(name)
+
+
+def best(stmt, number=100000):
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number
+
+
+def main():
+    x = zeros(100) + 1.5
+    rows = []
+    trusted = []
+    for label, old, new in [
+        ("Scalar", DispatchScalar(0.0), Scalar(0.0)),
+        ("Vector", DispatchVector(zeros(100)), Vector(zeros(100))),
+    ]:
+        value = 1.5 if label == "Scalar" else x
+        flat = x[:1] if label == "Scalar" else x
+
+        def get_old(v=old):
+            return v.value
+
+        def get_new(v=new):
+            return v.value
+
+        def set_old(v=old):
+            v.value = value
+
+        def set_new(v=new):
+            v.value = value
+
+        def set_trusted(v=new):
+            _assign(v, flat)
+
+        rows.append((f"{label} get", best(get_old), best(get_new)))
+        rows.append((f"{label} set", best(set_old), best(set_new)))
+        trusted.append((f"{label} set", best(set_new), best(set_trusted)))
+
+    report(rows, "dispatch", "property")
+    print()
+    report(trusted, "property", "trusted")
+
+
+def report(rows, old_label, new_label):
+    print(f"{'':<20} {old_label:>10} {new_label:>10} {'speedup':>8}")
+    for name, old, new in rows:
+        print(f"{name:<20} {old * 1e9:>8.0f}ns {new * 1e9:>8.0f}ns {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,27 @@
 """
 Abstract function optimisation.
 """
+from ._blockwise import closed_form
+from ._brent import minimize_scalar_batch
+from ._cache import cached
 from ._exception import OptimixError
 from ._function import Function
 from ._testit import test
 from ._types import Matrix, Scalar, Vector
+from ._variable_set import VariableSet
 
 __version__ = "3.0.5"
 
 __all__ = [
     "__version__",
+    "cached",
+    "closed_form",
     "Function",
     "Matrix",
+    "minimize_scalar_batch",
     "OptimixError",
     "Scalar",
     "test",
+    "VariableSet",
     "Vector",
 ]
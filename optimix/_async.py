@@ -0,0 +1,195 @@
+from ._observer import Observer
+
+__all__ = ["AsyncRun", "Event"]
+
+# Observer methods forwarded as events.
+_EVENTS = [
+    "start",
+    "evaluation_start",
+    "evaluation_end",
+    "step",
+    "retry",
+    "message",
+    "end",
+]
+
+# Events dropped, rather than queued, once too many are waiting.
+_PROGRESS = {"evaluation_start", "evaluation_end", "step"}
+
+
+class Event(object):
+    """
+    Optimization event, named after the :class:`optimix._observer.Observer`
+    method without its ``on_`` prefix.
+
+    Attributes
+    ----------
+    name : str
+        Event name: ``"start"``, ``"evaluation_start"``, ``"evaluation_end"``,
+        ``"step"``, ``"retry"``, ``"message"`` or ``"end"``.
+    args : tuple
+        Arguments of the observer method.
+    """
+
+    __slots__ = ["name", "args"]
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __repr__(self):
+        return f"Event({self.name!r}, {len(self.args)} args)"
+
+
+class AsyncRun(object):
+    """
+    Optimization running in an executor, for use from an :mod:`asyncio` loop.
+
+    Await it for the :class:`optimix._backend.Result`, and iterate over it with
+    ``async for`` to receive the :class:`Event` objects of the run as they
+    occur. Events are kept until consumed, by at most one iteration; once
+    ``maxsize`` progress events (``"evaluation_start"``, ``"evaluation_end"``
+    and ``"step"``) are waiting, further ones are dropped and counted in
+    ``dropped``, so that runs nobody iterates over hold a bounded number of
+    events.
+
+    Call :meth:`cancel`, or cancel the awaiting task, to stop the run before
+    its next evaluation. Awaiting a cancelled run raises
+    :class:`asyncio.CancelledError`.
+
+    Parameters
+    ----------
+    start : callable
+        Runs the optimization when called with the observer of the run and the
+        cancellation flag, a :class:`threading.Event`.
+    observer : :class:`optimix._observer.Observer`, optional
+        Also receives the events, from the executor thread.
+    executor : :class:`concurrent.futures.Executor`, optional
+        Defaults to the default executor of the loop.
+    maxsize : int
+        Maximum number of waiting progress events. Defaults to ``1024``.
+
+    Attributes
+    ----------
+    dropped : int
+        Number of progress events dropped.
+    """
+
+    def __init__(self, start, observer=None, executor=None, maxsize=1024):
+        import asyncio
+        from threading import Event as Flag
+
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._maxsize = maxsize
+        self._progress = 0
+        self.dropped = 0
+        self._cancel = Flag()
+        self._forward = _Forward(observer, loop, self._post)
+        self._future = loop.run_in_executor(
+            executor, start, self._forward, self._cancel
+        )
+        self._future.add_done_callback(self._finish)
+
+    def _post(self, event):
+        if event.name in _PROGRESS:
+            if self._progress >= self._maxsize:
+                self.dropped += 1
+                return
+            self._progress += 1
+        self._queue.put_nowait(event)
+
+    def _finish(self, future):
+        # Direct calls after the run no longer feed the queue.
+        self._forward.close()
+        self._queue.put_nowait(None)
+        # Retrieved, so that runs whose outcome nobody awaits are not reported.
+        if not future.cancelled():
+            future.exception()
+
+    def cancel(self):
+        """
+        Stop the run before its next evaluation.
+        """
+        self._cancel.set()
+
+    def cancelled(self):
+        """
+        ``True`` if cancellation has been requested; ``False`` otherwise.
+        """
+        return self._cancel.is_set()
+
+    def done(self):
+        """
+        ``True`` if the run has finished; ``False`` otherwise.
+        """
+        return self._future.done()
+
+    def __await__(self):
+        return self._result().__await__()
+
+    async def _result(self):
+        import asyncio
+
+        from ._exception import Cancelled
+
+        try:
+            return await asyncio.shield(self._future)
+        except asyncio.CancelledError:
+            # The run stops before its next evaluation and restores the
+            # starting point; wait for it, without cancelling the future.
+            self._cancel.set()
+            await asyncio.wait([self._future])
+            raise
+        except Cancelled as e:
+            raise asyncio.CancelledError(str(e)) from e
+
+    def __aiter__(self):
+        return self._events()
+
+    async def _events(self):
+        while True:
+            event = await self._queue.get()
+            if event is None:
+                return
+            if event.name in _PROGRESS:
+                self._progress -= 1
+            yield event
+
+
+class _Forward(Observer):
+    """
+    Pass the events to ``observer`` and, as :class:`Event` objects, to ``post``
+    within the loop.
+    """
+
+    def __init__(self, observer, loop, post):
+        self._observer = observer
+        self._loop = loop
+        self._post = post
+
+    def close(self):
+        self._loop = None
+        self._post = None
+
+    def __getstate__(self):
+        return {"_observer": self._observer, "_loop": None, "_post": None}
+
+
+def _forwarder(name):
+    method = "on_" + name
+
+    def forward(self, *args):
+        if self._observer is not None:
+            getattr(self._observer, method)(*args)
+        loop, post = self._loop, self._post
+        if loop is not None:
+            loop.call_soon_threadsafe(post, Event(name, args))
+
+    forward.__name__ = method
+    return forward
+
+
+for _name in _EVENTS:
+    setattr(_Forward, "on_" + _name, _forwarder(_name))
+del _name
@@ -0,0 +1,283 @@
+import abc
+
+__all__ = [
+    "Backend",
+    "LBFGSB",
+    "NewtonCG",
+    "Problem",
+    "Result",
+    "TrustConstr",
+    "get_backend",
+    "register_backend",
+]
+
+
+class Problem(object):
+    """
+    Flat optimization problem handed to a :class:`Backend`.
+
+    Parameters
+    ----------
+    fun : callable
+        ``fun(x)`` returns the value and the flat gradient at ``x``.
+    x0 : :class:`numpy.ndarray`
+        Starting point.
+    lower, upper : :class:`numpy.ndarray`
+        Lower and upper bounds.
+
+    Attributes
+    ----------
+    hess : callable
+        ``hess(x)`` returns the Hessian matrix at ``x``, or ``None`` if the
+        function does not provide it.
+    hessp : callable
+        ``hessp(x, p)`` returns the product of the Hessian at ``x`` with ``p``,
+        or ``None`` if the function does not provide it.
+    """
+
+    def __init__(self, fun, x0, lower, upper):
+        self.fun = fun
+        self.x0 = x0
+        self.lower = lower
+        self.upper = upper
+        self.hess = None
+        self.hessp = None
+
+    @property
+    def bounded(self):
+        """
+        Whether any bound is finite.
+        """
+        from numpy import isfinite
+
+        return bool(isfinite(self.lower).any() or isfinite(self.upper).any())
+
+
+class Result(object):
+    """
+    Outcome of an optimization, common to all backends.
+
+    Attributes
+    ----------
+    x : :class:`numpy.ndarray`
+        Solution.
+    value : float
+        Function value at the solution.
+    status : int
+        ``0`` if converged, ``1`` if an iteration or evaluation limit has been
+        reached, and ``2`` for any other failure.
+    message : str
+        Convergence reason reported by the backend.
+    nfev : int
+        Number of function evaluations.
+    nit : int
+        Number of iterations.
+    time : float
+        Wall time in seconds.
+    profile : :class:`optimix._profile.Profile`
+        Time spent per phase, or ``None`` if not requested.
+    """
+
+    def __init__(self, x, value, status, message, nfev=0, nit=0, time=0.0):
+        self.x = x
+        self.value = value
+        self.status = status
+        self.message = message
+        self.nfev = nfev
+        self.nit = nit
+        self.time = time
+        self.profile = None
+
+    @property
+    def success(self):
+        return self.status == 0
+
+    def __repr__(self):
+        return (
+            f"Result(value={self.value}, status={self.status}, "
+            f"message={self.message!r}, nfev={self.nfev}, nit={self.nit}, "
+            f"time={self.time:.3g})"
+        )
+
+
+class Backend(metaclass=abc.ABCMeta):
+    """
+    Optimization engine selected by ``_minimize(method=...)``.
+    """
+
+    #: Name used in error messages.
+    label = "Backend"
+
+    @abc.abstractmethod
+    def minimize(self, problem, callback, verbose, factr, pgtol):
+        """
+        Minimize a flat problem.
+
+        Parameters
+        ----------
+        problem : :class:`Problem`
+            Problem to solve.
+        callback : callable
+            To be called with the current point after each iteration, or
+            ``None``.
+        verbose : bool
+            ``True`` for verbose output; ``False`` otherwise.
+        factr : float
+            Relative reduction of the function value at which to stop, in units
+            of machine precision.
+        pgtol : float
+            Projected gradient magnitude at which to stop.
+
+        Returns
+        -------
+        :class:`Result`
+            Solution and convergence status.
+        """
+
+
+class LBFGSB(Backend):
+    """
+    SciPy's L-BFGS-B, the default backend.
+    """
+
+    label = "L-BFGS-B"
+
+    def minimize(self, problem, callback, verbose, factr, pgtol):
+        from numpy import finfo
+        from scipy.optimize import Bounds, minimize
+
+        options = dict(ftol=factr * finfo(float).eps, gtol=pgtol)
+        if verbose:
+            options["disp"] = 1
+
+        r = minimize(
+            problem.fun,
+            problem.x0,
+            jac=True,
+            method="L-BFGS-B",
+            bounds=Bounds(problem.lower, problem.upper),
+            options=options,
+            callback=callback,
+        )
+        return Result(r.x, r.fun, r.status, str(r.message), r.nfev, r.nit)
+
+
+class TrustConstr(Backend):
+    """
+    SciPy's trust-region method for bounded problems.
+
+    It uses the Hessian, or Hessian-vector products, provided by the function,
+    and falls back to a BFGS approximation.
+    """
+
+    label = "trust-constr"
+
+    def minimize(self, problem, callback, verbose, factr, pgtol):
+        from scipy.optimize import BFGS, Bounds, minimize
+
+        if problem.hessp is not None:
+            kwargs = dict(hessp=problem.hessp)
+        elif problem.hess is not None:
+            kwargs = dict(hess=problem.hess)
+        else:
+            kwargs = dict(hess=BFGS())
+        if problem.bounded:
+            kwargs["bounds"] = Bounds(problem.lower, problem.upper)
+
+        r = minimize(
+            problem.fun,
+            problem.x0,
+            jac=True,
+            method="trust-constr",
+            options=dict(gtol=pgtol, verbose=2 if verbose else 0),
+            callback=_trust_constr_callback(callback),
+            **kwargs,
+        )
+        # SciPy: 0 iteration limit, 1 gtol, 2 xtol, 3 callback.
+        status = {0: 1, 1: 0, 2: 0}.get(r.status, 2)
+        return Result(r.x, r.fun, status, str(r.message), r.nfev, r.nit)
+
+
+class NewtonCG(Backend):
+    """
+    SciPy's Newton conjugate-gradient method, for unbounded problems.
+
+    It uses Hessian-vector products, or the Hessian, provided by the function,
+    and falls back to finite differences of the gradient. Lacking a gradient
+    tolerance, it stops once the average step entry falls below ``pgtol``.
+    """
+
+    label = "Newton-CG"
+
+    def minimize(self, problem, callback, verbose, factr, pgtol):
+        from scipy.optimize import minimize
+
+        if problem.bounded:
+            raise ValueError("Newton-CG does not support bounds.")
+
+        kwargs = {}
+        if problem.hessp is not None:
+            kwargs["hessp"] = problem.hessp
+        elif problem.hess is not None:
+            kwargs["hess"] = problem.hess
+
+        r = minimize(
+            problem.fun,
+            problem.x0,
+            jac=True,
+            method="Newton-CG",
+            options=dict(xtol=pgtol, disp=verbose),
+            callback=callback,
+            **kwargs,
+        )
+        # SciPy: 0 success, 1 iteration limit, others are failures.
+        status = {0: 0, 1: 1}.get(r.status, 2)
+        return Result(r.x, r.fun, status, str(r.message), r.nfev, r.nit)
+
+
+def _trust_constr_callback(callback):
+    if callback is None:
+        return None
+
+    def wrapper(xk, state):
+        callback(xk)
+        return False
+
+    return wrapper
+
+
+_backends = {
+    "lbfgsb": LBFGSB(),
+    "trust-constr": TrustConstr(),
+    "newton-cg": NewtonCG(),
+}
+
+
+def register_backend(name, backend):
+    """
+    Make a backend selectable as ``_minimize(method=name)``.
+
+    Parameters
+    ----------
+    name : str
+        Backend name.
+    backend : :class:`Backend`
+        Backend instance.
+    """
+    if not isinstance(backend, Backend):
+        raise TypeError("The backend must be an instance of `Backend`.")
+    _backends[name] = backend
+
+
+def get_backend(method):
+    """
+    Return the backend for a name or a :class:`Backend` instance.
+    """
+    if isinstance(method, Backend):
+        return method
+    try:
+        return _backends[method]
+    except KeyError:
+        msg = f"Unknown optimization method: {method}. "
+        msg += "Choose among " + ", ".join(sorted(_backends)) + "."
+        raise ValueError(msg)
@@ -0,0 +1,115 @@
+__all__ = ["blockwise", "closed_form"]
+
+
+def closed_form(*names):
+    """
+    Register a method as the closed-form solver of a group of variables.
+
+    :meth:`optimix.Function._minimize_blockwise` calls it, with no arguments,
+    in place of an inner optimization whenever the group holding exactly the
+    variables ``names`` is to be optimized. It must set them to their optimum
+    given the current values of the other variables::
+
+        class LMM(Function):
+            @closed_form("beta")
+            def _solve_beta(self):
+                self._beta.value = ...
+
+    Parameters
+    ----------
+    names : str
+        Variable names.
+    """
+
+    def register(method):
+        method._closed_form = frozenset(names)
+        return method
+
+    return register
+
+
+def solvers(f):
+    """
+    Map of group, as a frozenset of names, to the bound closed-form solver.
+    """
+    found = {}
+    for cls in reversed(type(f).__mro__):
+        for attr, method in vars(cls).items():
+            group = getattr(method, "_closed_form", None)
+            if group is not None:
+                found[group] = getattr(f, attr)
+    return found
+
+
+def blockwise(f, groups, inner, maxiter, rtol, atol, maximize):
+    from time import perf_counter
+
+    from numpy import empty
+
+    from ._backend import Result
+
+    start = perf_counter()
+    free = list(f._variables.plan().names)
+    groups = [list(g) for g in groups]
+    grouped = [n for g in groups for n in g]
+    unknown = sorted(set(grouped) - set(free))
+    if len(unknown) > 0:
+        raise ValueError(f"Unknown or fixed variables in groups: {unknown}.")
+    if len(grouped) != len(set(grouped)):
+        raise ValueError("A variable belongs to more than one group.")
+
+    sign = -1.0 if maximize else +1.0
+    table = solvers(f)
+    kwargs = dict(verbose=False)
+    kwargs.update(inner or {})
+    optimize = f._maximize if maximize else f._minimize
+
+    values = [_evaluate(f)]
+    nfev = 1
+    status, message = 1, "maximum number of sweeps reached"
+    try:
+        for _ in range(maxiter):
+            for group in groups:
+                if len(group) == 0:
+                    continue
+                _select(f._variables, free, group)
+                solver = table.get(frozenset(group))
+                if solver is None:
+                    nfev += optimize(**kwargs).nfev
+                else:
+                    solver()
+            values.append(_evaluate(f))
+            nfev += 1
+
+            previous, current = values[-2], values[-1]
+            if sign * (previous - current) <= atol + rtol * abs(previous):
+                status, message = 0, "sweep improvement below tolerance"
+                break
+    finally:
+        _select(f._variables, free, free)
+
+    plan = f._variables.plan()
+    x = plan.gather(empty(plan.size))
+    r = Result(x, values[-1], status, message, nfev, len(values) - 1)
+    r.time = perf_counter() - start
+    r.values = values
+    return r
+
+
+def _evaluate(f):
+    with f._variables.lock:
+        value = f.value()
+        f._clean()
+    return value
+
+
+def _select(variables, free, group):
+    """
+    Leave unfixed only the ``group`` variables among the ``free`` ones.
+    """
+    group = set(group)
+    for name in free:
+        if name in group:
+            variables[name].unfix()
+        else:
+            variables[name].fix()
@@ -0,0 +1,191 @@
+__all__ = ["minimize_scalar_batch"]
+
+_eps = 1.4902e-08
+_golden = 0.381966011250105097
+
+
+def minimize_scalar_batch(f, a, b, grid=None, rtol=_eps, atol=_eps, maxiter=500):
+    """
+    Minimize many independent scalar functions in lockstep.
+
+    It runs one Brent's search per problem, all advancing together, so that
+    each step requires a single vectorized evaluation of ``f`` for all of them.
+    Problems that have converged keep being passed their best point but their
+    values are ignored.
+
+    Parameters
+    ----------
+    f : callable
+        ``f(x)`` returns the values of the ``k`` problems at the ``k`` points
+        ``x``, one per problem.
+    a, b : array_like
+        Finite lower and upper limits of each problem.
+    grid : int, optional
+        Number of equally spaced points at which to evaluate each problem
+        first. Brent's search then starts from the best point of the grid,
+        bracketed by its neighbours. Defaults to searching the whole interval.
+    rtol : float
+        Relative tolerance. Defaults to ``1.4902e-08``.
+    atol : float
+        Absolute tolerance. Defaults to ``1.4902e-08``.
+    maxiter : int
+        Maximum number of iterations. Defaults to ``500``.
+
+    Returns
+    -------
+    x : :class:`numpy.ndarray`
+        Solutions.
+    fx : :class:`numpy.ndarray`
+        Function values at the solutions.
+    niters : :class:`numpy.ndarray`
+        Number of steps taken by each problem, one evaluation each.
+    """
+    from numpy import arange, asarray, broadcast_arrays, isfinite, stack
+
+    a, b = broadcast_arrays(asarray(a, float), asarray(b, float))
+    a = a.ravel().copy()
+    b = b.ravel().copy()
+    if not (isfinite(a).all() and isfinite(b).all()):
+        raise ValueError("The limits must be finite.")
+    if (a > b).any():
+        raise ValueError("'a' must be equal or smaller than 'b'")
+
+    if grid is None:
+        return brent_batch(f, a, b, rtol=rtol, atol=atol, maxiter=maxiter)
+
+    if grid < 3:
+        raise ValueError("The grid must have at least three points.")
+
+    t = arange(grid) / (grid - 1)
+    xs = a[None, :] + t[:, None] * (b - a)[None, :]
+    fs = stack([asarray(f(x), float) for x in xs])
+    x0, f0, lo, hi = grid_bracket(xs, fs)
+    return brent_batch(f, lo, hi, x0, f0, rtol, atol, maxiter)
+
+
+def grid_bracket(xs, fs):
+    """
+    Best grid point of each problem and its bracketing neighbours.
+
+    Parameters
+    ----------
+    xs, fs : :class:`numpy.ndarray`
+        Grid points and function values, one row per grid position and one
+        column per problem. Grid points must be increasing along the rows.
+
+    Returns
+    -------
+    x0, f0 : :class:`numpy.ndarray`
+        Best point and its value.
+    lo, hi : :class:`numpy.ndarray`
+        Interval around the best point.
+    """
+    from numpy import arange, inf, isnan, minimum, maximum, where
+
+    fs = where(isnan(fs), inf, fs)
+    cols = arange(xs.shape[1])
+    i = fs.argmin(0)
+    lo = xs[maximum(i - 1, 0), cols]
+    hi = xs[minimum(i + 1, xs.shape[0] - 1), cols]
+    return xs[i, cols], fs[i, cols], lo, hi
+
+
+def brent_batch(f, a, b, x0=None, f0=None, rtol=_eps, atol=_eps, maxiter=500):
+    """
+    Vectorized Brent's method over independent problems.
+
+    It follows :func:`brent_search.brent` step by step, lane by lane.
+
+    Parameters
+    ----------
+    f : callable
+        Vectorized objective, as in :func:`minimize_scalar_batch`.
+    a, b : :class:`numpy.ndarray`
+        Intervals within which the minima lie.
+    x0, f0 : :class:`numpy.ndarray`, optional
+        Initial guesses and their values. Default to ``a + 0.382 * (b - a)``.
+
+    Returns
+    -------
+    x : :class:`numpy.ndarray`
+        Solutions.
+    fx : :class:`numpy.ndarray`
+        Function values at the solutions.
+    niters : :class:`numpy.ndarray`
+        Number of steps taken by each problem, one evaluation each.
+    """
+    from numpy import abs as npabs, asarray, errstate, full, where, zeros
+
+    a = asarray(a, float).copy()
+    b = asarray(b, float).copy()
+    if x0 is None:
+        x0 = a + _golden * (b - a)
+        f0 = asarray(f(x0), float)
+    x0 = asarray(x0, float).copy()
+    f0 = asarray(f0, float).copy()
+
+    x1, x2 = x0.copy(), x0.copy()
+    f1, f2 = f0.copy(), f0.copy()
+    d = zeros(len(a))
+    e = zeros(len(a))
+    niters = zeros(len(a), int)
+    active = full(len(a), True)
+
+    for _ in range(maxiter):
+        m = 0.5 * (a + b)
+        tol = rtol * npabs(x0) + atol
+        tol2 = 2.0 * tol
+
+        active &= ~(npabs(x0 - m) <= tol2 - 0.5 * (b - a))
+        if not active.any():
+            break
+        niters += active
+
+        # Parabolic fit through (x0, f0), (x1, f1), (x2, f2).
+        fit = tol < npabs(e)
+        r = where(fit, (x0 - x1) * (f0 - f2), 0.0)
+        q = where(fit, (x0 - x2) * (f0 - f1), 0.0)
+        p = where(fit, (x0 - x2) * q - (x0 - x1) * r, 0.0)
+        q = where(fit, 2.0 * (q - r), 0.0)
+        p = where(0.0 < q, -p, p)
+        q = npabs(q)
+        r = where(fit, e, 0.0)
+        e = where(fit, d, e)
+
+        parabolic = (npabs(p) < npabs(0.5 * q * r)) & (q * (a - x0) < p)
+        parabolic &= p < q * (b - x0)
+
+        with errstate(divide="ignore", invalid="ignore"):
+            dp = p / q
+        u = x0 + dp
+        edge = ((u - a) < tol2) | ((b - u) < tol2)
+        dp = where(edge, where(x0 < m, tol, -tol), dp)
+
+        eg = where(x0 < m, b - x0, a - x0)
+        d = where(parabolic, dp, _golden * eg)
+        e = where(parabolic, e, eg)
+
+        u = where(tol <= npabs(d), x0 + d, where(0.0 < d, x0 + tol, x0 - tol))
+        u = where(active, u, x0)
+        fu = asarray(f(u), float)
+
+        better = active & (fu <= f0)
+        worse = active & ~better
+        left = u < x0
+
+        b = where(better & left, x0, b)
+        a = where(better & ~left, x0, a)
+        a = where(worse & left, u, a)
+        b = where(worse & ~left, u, b)
+
+        second = worse & ((fu <= f1) | (x1 == x0))
+        third = worse & ~second & ((fu <= f2) | (x2 == x0) | (x2 == x1))
+
+        x2 = where(better | second, x1, where(third, u, x2))
+        f2 = where(better | second, f1, where(third, fu, f2))
+        x1 = where(better, x0, where(second, u, x1))
+        f1 = where(better, f0, where(second, fu, f1))
+        x0 = where(better, u, x0)
+        f0 = where(better, fu, f0)
+
+    return x0, f0, niters
@@ -0,0 +1,133 @@
+from functools import wraps
+
+__all__ = ["cached"]
+
+
+def cached(method=None, maxsize=8):
+    """
+    Memoize a :class:`optimix.Function` method on the values of its variables.
+
+    Results are kept for the ``maxsize`` most recently seen parameter points, so
+    that re-evaluations at an unchanged point or at a point visited again (as in
+    backtracking line searches) are served from the cache. The memoized point is
+    forgotten as soon as a variable notifies a change of value.
+
+    It can decorate :meth:`value`, :meth:`gradient` and any intermediate
+    (e.g., a factorization) whose result only depends on the variables and on
+    hashable positional arguments::
+
+        class LMM(Function):
+            @cached
+            def _factorization(self):
+                ...
+
+            @cached(maxsize=4)
+            def value(self):
+                ...
+
+    Parameters
+    ----------
+    method : callable
+        Method to be memoized.
+    maxsize : int
+        Maximum number of parameter points to remember. Defaults to ``8``.
+    """
+    if method is None:
+        return lambda method: cached(method, maxsize)
+
+    name = method.__qualname__
+
+    @wraps(method)
+    def wrapper(self, *args):
+        return _cache_of(self).get(name, maxsize, method, self, args)
+
+    return wrapper
+
+
+def _cache_of(function):
+    cache = function.__dict__.get("_cached_state")
+    if cache is None:
+        cache = _Cache()
+        function.__dict__["_cached_state"] = cache
+    return cache
+
+
+class _Cache(object):
+    """
+    Per-function memo of recent parameter points.
+    """
+
+    def __init__(self):
+        self._key = None
+        self._version = None
+        self._heard = {}
+        self._entries = {}
+
+    def __reduce__(self):
+        # Copies start empty and listen to their own variables.
+        return (_Cache, ())
+
+    def clear(self):
+        self._key = None
+        self._entries.clear()
+
+    def get(self, name, maxsize, method, function, args):
+        from collections import OrderedDict
+
+        key = (self.key(function._variables), args)
+        entries = self._entries.get(name)
+        if entries is None:
+            entries = OrderedDict()
+            self._entries[name] = entries
+
+        try:
+            entries.move_to_end(key)
+            return entries[key]
+        except KeyError:
+            pass
+
+        result = method(function, *args)
+        entries[key] = result
+        if len(entries) > maxsize:
+            entries.popitem(last=False)
+        return result
+
+    def key(self, variables):
+        stamp = variables._stamp()
+        if self._version != stamp:
+            self._listen(variables)
+            self._version = stamp
+            self._key = None
+        if self._key is None:
+            self._key = _state(variables)
+        return self._key
+
+    def _on_change(self):
+        self._key = None
+
+    def _listen(self, variables):
+        # One listener per listeners list, which the views of a
+        # :class:`optimix.VariableSet` share. The lists are held, so that their
+        # ids are not reused.
+        heard = {}
+        for var in variables.values():
+            raw = var.raw
+            if not hasattr(raw, "talk_to"):
+                continue
+            listeners = raw._listeners
+            key = id(listeners)
+            if key in heard:
+                continue
+            if key not in self._heard:
+                raw.talk_to(self._on_change)
+            heard[key] = listeners
+        self._heard = heard
+
+
+def _state(variables):
+    from numpy import asarray
+
+    layout = variables._flat_layout()
+    if layout is not None and len(layout.offsets) == len(variables):
+        return layout.buffer.tobytes()
+    return b"".join(asarray(variables[n].raw).tobytes() for n in variables.names())
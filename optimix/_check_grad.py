@@ -1,33 +1,210 @@
+from operator import methodcaller
+
 __all__ = ["approx_fprime", "check_grad"]
 
+# Maximum number of entries of a batch of perturbed points.
+BATCH_ENTRIES = 2**22
 
-def approx_fprime(f, step=1.49e-08):
-    from numpy import asarray, atleast_1d, squeeze, stack
 
-    f0 = f.value()
-    grad = {}
-    for name in f.variables().names():
-        value = f.variables().get(name).value
-        ndim = value.ndim
-        value = atleast_1d(value).ravel()
-        grads = []
-        for i in range(len(value)):
-            value[i] += step
-            grads.append(asarray((f.value() - f0) / step))
-            value[i] -= step
-        grad[name] = stack(grads, axis=-1)
-        if ndim == 0:
-            grad[name] = squeeze(grad[name], axis=-1)
-    return grad
+def approx_fprime(
+    f, step=1.49e-08, method="forward", sample=None, seed=None, workers=None
+):
+    """
+    Finite-difference approximation of the gradient of ``f``.
 
+    Parameters
+    ----------
+    f : object
+        Function having ``value`` and ``variables`` methods.
+    step : float
+        Step size.
+    method : str
+        ``"forward"`` or ``"central"`` differences.
+    sample : int, optional
+        Number of coordinates, drawn at random, to differentiate. The remaining
+        ones are set to ``nan``. Defaults to all of them.
+    seed : int, optional
+        Seed for drawing the coordinates.
+    workers : int or :class:`concurrent.futures.Executor`, optional
+        Number of threads, or an executor, evaluating perturbed copies of ``f``
+        concurrently. Defaults to serial evaluation of ``f`` itself.
 
-def check_grad(func, step=1.49e-08):
-    from numpy.linalg import norm
-    from numpy import asarray
+    Returns
+    -------
+    dict
+        Map of variable name to gradient.
+    """
+    getter = methodcaller("variables")
+    names = f.variables().names()
+    f0 = f.value() if method == "forward" else None
+    return _finite_differences(
+        f, getter, names, f0, step, method, sample, seed, workers
+    )
 
+
+def check_grad(func, step=1.49e-08, **kwargs):
     g = func.gradient()
-    g = {n: asarray(gi) for n, gi in iter(g.items())}
-    fg = approx_fprime(func, step)
+    g = _raw_gradient(func.variables(), g)
+    fg = approx_fprime(func, step, **kwargs)
 
     names = set(g.keys()).union(fg.keys())
-    return sum(norm(fg[name] - g[name]) for name in names)
+    return sum(_distance(fg[name], g[name]) for name in names)
+
+
+def _raw_gradient(variables, grad):
+    """
+    Gradient arrays with respect to the ``raw`` arrays of ``variables``.
+
+    Finite differences perturb the parameters of structured matrices, so their
+    gradient blocks are pulled back to them.
+    """
+    from numpy import asarray
+
+    raw = {}
+    for name, g in grad.items():
+        var = variables.get(name)
+        if getattr(var, "parametrization", None) is not None:
+            raw[name] = var._pullback(g)
+        else:
+            raw[name] = asarray(g)
+    return raw
+
+
+def _distance(approx, exact):
+    from numpy import isnan
+    from numpy.linalg import norm
+
+    diff = approx - exact
+    return norm(diff[~isnan(approx)])
+
+
+def _finite_differences(
+    f, getter, names, f0, step, method, sample, seed, workers, batch=False
+):
+    """
+    Finite-difference gradient of ``f`` over the variables ``names``.
+
+    ``getter(f)`` returns the variables of ``f`` (or of a copy of it) and ``f0``
+    is the function value at the current point, needed by forward differences.
+    If ``batch`` is ``True``, the perturbed points are evaluated through
+    ``f.value_batch``, in which case ``names`` must be the unfixed variables.
+    """
+    from numpy import asarray, full, nan, stack
+    from numpy.random import default_rng
+
+    if method not in ("forward", "central"):
+        raise ValueError(f"Unknown finite-difference method: {method}.")
+
+    variables = getter(f)
+    sizes = [variables.get(name).size for name in names]
+    coords = [(name, i) for name, size in zip(names, sizes) for i in range(size)]
+    if sample is not None and sample < len(coords):
+        rng = default_rng(seed)
+        chosen = sorted(rng.choice(len(coords), sample, replace=False))
+        coords = [coords[i] for i in chosen]
+
+    if batch:
+        derivs = _fd_batch(f, coords, step, method, f0)
+    elif workers is None:
+        derivs = _fd_chunk(f, getter, coords, step, method, f0)
+    else:
+        derivs = _fd_parallel(f, getter, coords, step, method, f0, workers)
+
+    if f0 is None:
+        f0 = f.value()
+    empty = full(asarray(f0).shape, nan)
+
+    found = dict(zip(coords, derivs))
+    grad = {}
+    for name, size in zip(names, sizes):
+        grads = [found.get((name, i), empty) for i in range(size)]
+        shape = empty.shape + variables.get(name).raw.shape
+        grad[name] = stack(grads, axis=-1).reshape(shape)
+    return grad
+
+
+def _fd_parallel(f, getter, coords, step, method, f0, workers):
+    from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+    from copy import deepcopy
+
+    if isinstance(workers, Executor):
+        executor = workers
+        nchunks = getattr(executor, "_max_workers", 1)
+        owned = False
+    else:
+        executor = ThreadPoolExecutor(workers)
+        nchunks = workers
+        owned = True
+
+    # Process pools pickle the function, which already amounts to a copy.
+    copy = not isinstance(executor, ProcessPoolExecutor)
+
+    nchunks = max(1, min(nchunks, len(coords)))
+    chunks = [coords[i::nchunks] for i in range(nchunks)]
+    try:
+        futures = []
+        for chunk in chunks:
+            g = deepcopy(f) if copy else f
+            futures.append(
+                executor.submit(_fd_chunk, g, getter, chunk, step, method, f0)
+            )
+        results = [fut.result() for fut in futures]
+    finally:
+        if owned:
+            executor.shutdown()
+
+    derivs = {}
+    for chunk, result in zip(chunks, results):
+        derivs.update(zip(chunk, result))
+    return [derivs[c] for c in coords]
+
+
+def _fd_chunk(f, getter, coords, step, method, f0):
+    from numpy import asarray, atleast_1d
+
+    variables = getter(f)
+    clean = getattr(f, "_clean", _ignore)
+    derivs = []
+    for name, i in coords:
+        value = atleast_1d(variables.get(name).raw).ravel()
+        old = value[i]
+        value[i] = old + step
+        fp = f.value()
+        clean()
+        if method == "forward":
+            derivs.append(asarray((fp - f0) / step))
+        else:
+            value[i] = old - step
+            derivs.append(asarray((fp - f.value()) / (2 * step)))
+            clean()
+        value[i] = old
+    return derivs
+
+
+def _ignore():
+    pass
+
+
+def _fd_batch(f, coords, step, method, f0):
+    from numpy import arange, asarray, empty, tile
+
+    plan = f._variables.plan()
+    start = dict(zip(plan.names, plan.offsets))
+    cols = asarray([start[name] + i for name, i in coords], int)
+    x0 = plan.gather(empty(plan.size))
+
+    nrows = max(1, BATCH_ENTRIES // max(plan.size, 1))
+    derivs = []
+    for lo in range(0, len(cols), nrows):
+        chunk = cols[lo : lo + nrows]
+        rows = arange(len(chunk))
+        X = tile(x0, (len(chunk), 1))
+        X[rows, chunk] = x0[chunk] + step
+        fp = f.value_batch(X)
+        if method == "forward":
+            d = (fp - f0) / step
+        else:
+            X[rows, chunk] = x0[chunk] - step
+            d = (fp - f.value_batch(X)) / (2 * step)
+        derivs.extend(asarray(di) for di in d)
+    return derivs
@@ -0,0 +1,89 @@
+__all__ = ["Checkpoint", "load_checkpoint"]
+
+# Number of recent iterates saved in a checkpoint.
+HISTORY = 10
+
+
+class Checkpoint(object):
+    """
+    Periodic writer of the optimization state, called after each iteration.
+
+    The file is a NumPy ``.npz`` archive holding the current flat solution
+    ``x``, a :meth:`Variables.to_bytes` snapshot, the recent iterates, the
+    iteration count and the optimization options. It is replaced atomically.
+
+    Parameters
+    ----------
+    path : str
+        File path.
+    every : int
+        Write it every ``every`` iterations.
+    variables : :class:`Variables`
+        Variables being optimized.
+    options : dict
+        Optimization options needed to resume it.
+    """
+
+    def __init__(self, path, every, variables, options):
+        from collections import deque
+
+        self._path = path
+        self._every = every
+        self._variables = variables
+        self._options = options
+        self._iteration = 0
+        self._history = deque(maxlen=HISTORY)
+
+    def __call__(self, xk):
+        self._iteration += 1
+        self._history.append(xk.copy())
+        if self._iteration % self._every == 0:
+            self.write(xk)
+
+    def write(self, x, done=False):
+        """
+        Write the state at the flat solution ``x``.
+        """
+        import os
+
+        from numpy import asarray, frombuffer, savez, stack, uint8
+
+        if len(self._history) > 0:
+            history = stack(self._history)
+        else:
+            history = asarray(x, float).reshape(1, -1)
+
+        snapshot = frombuffer(self._variables.to_bytes(), uint8)
+        tmp = self._path + ".tmp"
+        with open(tmp, "wb") as f:
+            savez(
+                f,
+                x=x,
+                variables=snapshot,
+                history=history,
+                iteration=self._iteration,
+                done=done,
+                **self._options,
+            )
+        os.replace(tmp, self._path)
+
+
+def load_checkpoint(path):
+    """
+    Read a checkpoint written by :class:`Checkpoint`.
+
+    Returns
+    -------
+    dict
+        Its arrays, with ``variables`` as bytes and scalars as Python objects.
+    """
+    from numpy import load
+
+    with load(path) as data:
+        state = {k: data[k] for k in data.files}
+
+    state["variables"] = state["variables"].tobytes()
+    for k, v in state.items():
+        if getattr(v, "ndim", None) == 0:
+            state[k] = v.item()
+    return state
@@ -0,0 +1,113 @@
+__all__ = ["tracker_of"]
+
+
+def tracker_of(function):
+    """
+    Change tracker of the variables of ``function``, created on first use.
+    """
+    tracker = function.__dict__.get("_dirty_state")
+    if tracker is None:
+        tracker = _Tracker()
+        function.__dict__["_dirty_state"] = tracker
+    tracker.sync(function._variables)
+    return tracker
+
+
+class _Tracker(object):
+    """
+    Change counters and dirty set, fed by the variable listeners.
+
+    Variables sharing their listeners, as those of a
+    :class:`optimix.VariableSet`, share one listener and counter, and are all
+    marked whenever any of them changes.
+    """
+
+    def __init__(self):
+        self._version = None
+        self._marks = {}
+        self._owners = {}
+        self._prefixes = {}
+        self.dirty = set()
+        self.results = {}
+
+    def __reduce__(self):
+        # Copies start dirty and listen to their own variables.
+        return (_Tracker, ())
+
+    def sync(self, variables):
+        """
+        Listen to variables added or replaced since the last call.
+        """
+        stamp = variables._stamp()
+        if self._version == stamp:
+            return
+        self._version = stamp
+        self._prefixes.clear()
+
+        groups = {}
+        for name in variables.names():
+            raw = variables[name].raw
+            listeners = getattr(raw, "_listeners", None)
+            key = id(listeners) if listeners is not None else name
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = (raw, [])
+            group[1].append(name)
+
+        # Marks hold their variable, so that the ids of live listeners are not
+        # reused.
+        marks = {}
+        owners = {}
+        for key, (raw, names) in groups.items():
+            mark = self._marks.pop(key, None)
+            fresh = mark is None or (isinstance(key, str) and mark.raw is not raw)
+            if fresh:
+                mark = _Mark(self, raw)
+                if hasattr(raw, "talk_to"):
+                    raw.talk_to(mark.notify)
+            mark.names = names
+            marks[key] = mark
+            for name in names:
+                owners[name] = mark
+            if fresh:
+                mark.notify()
+        # Listeners of variables no longer held stay registered, but idle.
+        for mark in self._marks.values():
+            mark.names = ()
+        self._marks = marks
+        self._owners = owners
+
+    def clean(self):
+        self.dirty.clear()
+
+    def version(self, prefix):
+        """
+        Sum of the change counters of the variables under ``prefix``.
+        """
+        marks = self._prefixes.get(prefix)
+        if marks is None:
+            dot = prefix + "." if len(prefix) > 0 else ""
+            owners = self._owners
+            found = {id(owners[n]): owners[n] for n in owners if n.startswith(dot)}
+            marks = list(found.values())
+            self._prefixes[prefix] = marks
+        return sum(m.count for m in marks)
+
+
+class _Mark(object):
+    """
+    Listener of the variables sharing the listeners of ``raw``, kept alive by
+    its tracker.
+    """
+
+    __slots__ = ["tracker", "raw", "names", "count", "__weakref__"]
+
+    def __init__(self, tracker, raw):
+        self.tracker = tracker
+        self.raw = raw
+        self.names = ()
+        self.count = 0
+
+    def notify(self):
+        self.count += 1
+        self.tracker.dirty.update(self.names)
@@ -1,5 +1,11 @@
-__all__ = ["OptimixError"]
+__all__ = ["Cancelled", "OptimixError"]
 
 
 class OptimixError(Exception):
     pass
+
+
+class Cancelled(OptimixError):
+    """
+    The optimization has been cancelled.
+    """
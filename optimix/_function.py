@@ -1,6 +1,6 @@
 import abc
 
-from ._exception import OptimixError
+from ._exception import Cancelled, OptimixError
 from ._variables import Variables, merge_variables
 
 __all__ = ["Function"]
@@ -10,18 +10,44 @@ PGTOL = 1e-7
 
 
 class FuncOpt(metaclass=abc.ABCMeta):
-    def __init__(self, variables):
-        from numpy import zeros, nan
+    # Number of most recent evaluated points kept during an optimization.
+    _history_depth = 2
+    # Receiver of optimization events (see :class:`optimix._observer.Observer`).
+    # When it is ``None``, ``verbose=True`` prints notices and nothing else is
+    # reported.
+    _observer = None
+
+    def __init_subclass__(cls, **kwargs):
+        from inspect import isfunction
+
+        from ._profile import _METHODS, timed
+
+        super(FuncOpt, cls).__init_subclass__(**kwargs)
+        # Model code reports to the profile of the run in progress, if any.
+        for name in _METHODS:
+            method = cls.__dict__.get(name)
+            if isfunction(method) and not getattr(method, "__timed__", False):
+                setattr(cls, name, timed(method))
 
-        self.__solutions = []
-        self.__sign = +1.0
-        self.__verbose = True
-        self.__flat_gradient = zeros(1)
-        self.__flat_solution = nan
+    def __init__(self, variables):
+        from ._session import Session
+
+        # Session of the most recent run, also used by direct calls. Each run
+        # has its own (see :class:`optimix._session.Session`).
+        self.__session = Session(depth=self._history_depth)
+        self._history = self.__session.history
+        # Flat gradient arrays, with their gradient blocks, left by finished
+        # runs for the next ones to reuse.
+        self.__spares = []
         self._variables = variables
 
     def _minimize_scalar(
-        self, desc="Progress", rtol=1.4902e-08, atol=1.4902e-08, verbose=True
+        self,
+        desc="Progress",
+        rtol=1.4902e-08,
+        atol=1.4902e-08,
+        verbose=True,
+        grid=None,
     ):
         """
         Minimize a scalar function using Brent's method.
@@ -30,28 +56,80 @@ class FuncOpt(metaclass=abc.ABCMeta):
         ----------
         verbose : bool
             ``True`` for verbose output; ``False`` otherwise.
+        grid : int, optional
+            Number of equally spaced points, within the variable bounds, at which
+            to evaluate the function first through :meth:`value_batch`. Brent's
+            search then refines the best of them, bracketed by its neighbours.
+            Defaults to bracketing the minimum from the current value.
         """
-        from tqdm import tqdm
-        from numpy import asarray
-        from brent_search import minimize as brent_minimize
+        self.__minimize_scalar(+1.0, desc, rtol, atol, verbose, grid)
+
+    def __minimize_scalar(self, sign, desc, rtol, atol, verbose, grid):
+        from time import perf_counter
 
-        variables = self._variables.select(fixed=False)
-        if len(variables) != 1:
+        from numpy import asarray, full
+        from brent_search import brent, minimize as brent_minimize
+
+        names = self._variables.plan().names
+        if len(names) != 1:
             raise ValueError("The number of variables must be equal to one.")
 
-        var = variables[variables.names()[0]]
-        progress = tqdm(desc=desc, disable=not verbose)
+        var = self._variables[names[0]]
+        lock = self._variables.lock
+        observer = self.__run_observer(verbose, desc)
 
         def func(x):
-            progress.update(1)
-            var.value = x
-            return self.__sign * self.value()
+            if observer is None:
+                with lock:
+                    var.value = x
+                    value = self.value()
+                    self._clean()
+                return sign * value
+            x = full(1, x, float)
+            observer.on_evaluation_start(x)
+            start = perf_counter()
+            with lock:
+                var.value = x
+                value = self.value()
+                self._clean()
+            observer.on_evaluation_end(x, value, None, perf_counter() - start)
+            return sign * value
+
+        if observer is not None:
+            observer.on_start("Brent", 1)
+        a, b = var.bounds
+        if grid is None:
+            r = asarray(brent_minimize(func, a=a, b=b, rtol=rtol, atol=atol))
+        else:
+            x0, f0, a, b = self.__grid_bracket(sign, a, b, grid)
+            r = asarray(brent(func, a, b, x0, f0, rtol=rtol, atol=atol))
+        with lock:
+            var.value = r[0]
+        if observer is not None:
+            observer.on_end(None)
 
-        r = asarray(
-            brent_minimize(func, a=var.bounds[0], b=var.bounds[1], rtol=rtol, atol=atol)
-        )
-        var.value = r[0]
-        progress.close()
+    def __run_observer(self, verbose, desc=None):
+        from ._observer import PrintObserver, TqdmObserver
+
+        if self._observer is not None or not verbose:
+            return self._observer
+        if desc is None:
+            return PrintObserver()
+        return TqdmObserver(desc)
+
+    def __grid_bracket(self, sign, a, b, grid):
+        from numpy import isfinite, linspace
+
+        from ._brent import grid_bracket
+
+        if not (isfinite(a) and isfinite(b)):
+            raise ValueError("A grid search requires finite bounds.")
+        if grid < 3:
+            raise ValueError("The grid must have at least three points.")
+
+        xs = linspace(a, b, grid)[:, None]
+        fs = sign * self.value_batch(xs)[:, None]
+        return [v.item() for v in grid_bracket(xs, fs)]
 
     @abc.abstractmethod
     def value(_):
@@ -63,111 +141,870 @@ class FuncOpt(metaclass=abc.ABCMeta):
 
         return {"zero": zeros(1)}
 
+    def _dirty(self):
+        """
+        Names of the variables whose value changed since the last evaluation.
+
+        Changes are recorded by listeners attached to the variables on first
+        call, and all variables are dirty until the next evaluation ends. The
+        optimizer, :meth:`value_batch`, :meth:`gradient_batch` and finite
+        differences end each evaluation by calling :meth:`_clean`, so that
+        :meth:`value` and :meth:`gradient` can recompute only what depends on
+        the dirty variables.
+
+        Returns
+        -------
+        frozenset
+            Variable names.
+        """
+        from ._dirty import tracker_of
+
+        return frozenset(tracker_of(self).dirty)
+
+    def _clean(self):
+        """
+        Mark all variables as clean, ending an evaluation, here and in the
+        composite children.
+        """
+        seen = set()
+        stack = [self]
+        while len(stack) > 0:
+            f = stack.pop()
+            if id(f) in seen:
+                continue
+            seen.add(id(f))
+            tracker = f.__dict__.get("_dirty_state")
+            if tracker is not None:
+                tracker.clean()
+            stack.extend(f.__dict__.get("_children", {}).values())
+
+    def value_and_gradient(self):
+        """
+        Function value and gradient evaluated at the same point.
+
+        Subclasses whose :meth:`value` and :meth:`gradient` share expensive
+        intermediates should override it so that the optimizer evaluates the
+        model once per step.
+
+        Returns
+        -------
+        value : float
+            Function value.
+        gradient : dict
+            Map of variable name to gradient.
+        """
+        return self.value(), self.gradient()
+
+    def gradient_into(self, out):
+        """
+        Write the gradient into preallocated blocks.
+
+        The optimizer calls it, after :meth:`value`, in place of
+        :meth:`value_and_gradient` when it is overridden. Composite functions
+        override it to write their own blocks and hand ``out.child(prefix)`` to
+        the ``gradient_into`` of each child, so that no gradient dictionary is
+        built nor re-keyed. Blocks are zeroed beforehand.
+
+        Parameters
+        ----------
+        out : :class:`optimix._gradient.GradientBlocks`
+            Blocks by variable name, views into a flat gradient array.
+        """
+        for name, g in self.gradient().items():
+            out[name] = g
+
+    def hessian(self):
+        """
+        Hessian of the function, optionally provided by subclasses.
+
+        Second-order backends use it when overridden. Blocks are keyed by pairs
+        of variable names and shaped as the concatenation of the variable
+        shapes (e.g., ``(n,)`` for a scalar and an ``n``-vector). Missing blocks
+        are taken as zero, or as the transpose of their symmetric counterpart.
+        Structured matrices enter through their parameters: their shape is that
+        of their ``raw`` array.
+
+        Returns
+        -------
+        dict
+            Map of ``(name0, name1)`` to Hessian block.
+        """
+        raise NotImplementedError
+
+    def hessian_vector_product(self, v):
+        """
+        Product of the Hessian with a vector, optionally provided by subclasses.
+
+        Second-order backends prefer it over :meth:`hessian` when overridden.
+
+        Parameters
+        ----------
+        v : dict
+            Map of variable name to the vector entries of that variable, shaped
+            as its ``raw`` array (the parameters of a structured matrix).
+
+        Returns
+        -------
+        dict
+            Map of variable name to product entries, keyed and shaped like
+            ``v``.
+        """
+        raise NotImplementedError
+
+    def _approx_hessian(self, step=1.49e-08):
+        """
+        Hessian over unfixed variables by finite differences of the gradient.
+
+        Returns
+        -------
+        dict
+            Map of ``(name0, name1)`` to Hessian block, as in :meth:`hessian`.
+        """
+        from numpy import empty, eye
+
+        plan = self._variables.plan()
+        x0 = plan.gather(empty(plan.size))
+        g0 = plan.pack(self.gradient(), empty(plan.size))
+        H = (self.gradient_batch(x0 + step * eye(plan.size)) - g0) / step
+        H = (H + H.T) / 2
+
+        blocks = {}
+        for a, a0, a1 in plan.spans:
+            for b, b0, b1 in plan.spans:
+                shape = self._variables[a].raw.shape + self._variables[b].raw.shape
+                blocks[(a, b)] = H[a0:a1, b0:b1].reshape(shape)
+        return blocks
+
+    def _approx_hessian_vector_product(self, v, step=1.49e-08):
+        """
+        Hessian-vector product by finite differences of the gradient.
+
+        Parameters
+        ----------
+        v : dict
+            Map of variable name to the vector entries of that variable, as in
+            :meth:`hessian_vector_product`.
+
+        Returns
+        -------
+        dict
+            Map of variable name to product entries.
+        """
+        from numpy import empty, stack
+
+        plan = self._variables.plan()
+        x0 = plan.gather(empty(plan.size))
+        p = _flatten(plan, v, empty(plan.size))
+        G = self.gradient_batch(stack([x0, x0 + step * p]))
+        return self.__unflatten((G[1] - G[0]) / step)
+
+    def __unflatten(self, flat):
+        plan = self._variables.plan()
+        return {
+            name: flat[start:stop].reshape(self._variables[name].raw.shape)
+            for name, start, stop in plan.spans
+        }
+
+    def __flat_hessian(self, session, x):
+        from numpy import asarray, zeros
+
+        plan = self._variables.plan()
+        with self._variables.lock:
+            plan.scatter(x)
+            blocks = self.hessian()
+        spans = {name: (start, stop) for name, start, stop in plan.spans}
+
+        H = zeros((plan.size, plan.size))
+        for (a, b), block in blocks.items():
+            if a not in spans or b not in spans:
+                continue
+            (a0, a1), (b0, b1) = spans[a], spans[b]
+            block = asarray(block, float).reshape(a1 - a0, b1 - b0)
+            H[a0:a1, b0:b1] = block
+            if (b, a) not in blocks:
+                H[b0:b1, a0:a1] = block.T
+        return session.sign * H
+
+    def __flat_hessian_vector_product(self, session, x, p):
+        from numpy import empty
+
+        plan = self._variables.plan()
+        with self._variables.lock:
+            plan.scatter(x)
+            hv = self.hessian_vector_product(self.__unflatten(p))
+        return session.sign * _flatten(plan, hv, empty(plan.size))
+
+    def value_batch(self, X):
+        """
+        Function values at many points of the unfixed variables.
+
+        The default implementation evaluates :meth:`value` at each point in
+        turn. Subclasses able to evaluate several points at once should
+        override it; optimix then uses it wherever it needs many evaluations.
+        The variables are left at their current values.
+
+        Parameters
+        ----------
+        X : array_like
+            Points as a ``(k, n)`` array whose columns follow the flat order of
+            the unfixed variables, i.e., sorted by name.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Function values, one per point.
+        """
+        from numpy import asarray
+
+        return asarray(self.__batch(X, lambda plan, i: self.value()))
+
+    def gradient_batch(self, X):
+        """
+        Gradients at many points of the unfixed variables.
+
+        Parameters
+        ----------
+        X : array_like
+            Points as a ``(k, n)`` array laid out as in :meth:`value_batch`.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Flat gradients as a ``(k, n)`` array.
+        """
+        from numpy import asarray, empty
+
+        X = asarray(X, float)
+        out = empty(X.shape)
+        self.__batch(X, lambda plan, i: plan.pack(self.gradient(), out[i]))
+        return out
+
+    def __batch(self, X, evaluate):
+        from numpy import asarray, atleast_2d, empty
+
+        X = atleast_2d(asarray(X, float))
+        plan = self._variables.plan()
+        if X.shape[1] != plan.size:
+            raise ValueError("The number of columns must match the free variables.")
+
+        results = []
+        with self._variables.lock:
+            x0 = plan.gather(empty(plan.size))
+            try:
+                for i, x in enumerate(X):
+                    plan.scatter(x)
+                    results.append(evaluate(plan, i))
+                    self._clean()
+            finally:
+                plan.scatter(x0)
+        return results
+
     def _maximize_scalar(
-        self, desc="Progress", rtol=1.4902e-08, atol=1.4902e-08, verbose=True
+        self,
+        desc="Progress",
+        rtol=1.4902e-08,
+        atol=1.4902e-08,
+        verbose=True,
+        grid=None,
+    ):
+        """
+        Maximize a scalar function using Brent's method.
+
+        See :meth:`_minimize_scalar` for the parameters.
+        """
+        self.__minimize_scalar(-1.0, desc, rtol, atol, verbose, grid)
+
+    def _minimize(
+        self,
+        verbose=True,
+        factr=FACTR,
+        pgtol=PGTOL,
+        checkpoint=None,
+        every=10,
+        trace=None,
+        method="lbfgsb",
+        profile=False,
+    ):
+        """
+        Minimize the function, using L-BFGS-B by default.
+
+        Parameters
+        ----------
+        verbose : bool
+            ``True`` for verbose output; ``False`` otherwise.
+        factr : float
+            Relative reduction of the function value at which to stop, in units
+            of machine precision.
+        pgtol : float
+            Projected gradient magnitude at which to stop.
+        checkpoint : str, optional
+            File to which the optimization state is periodically written. Use
+            :meth:`_resume` to continue from it after an interruption.
+        every : int
+            Number of iterations between checkpoints. Defaults to ``10``.
+        trace : str, optional
+            File to which every evaluated point is appended, readable through
+            ``self._history.trace()``. By default, only the last
+            ``_history_depth`` points are kept.
+        method : str or :class:`optimix._backend.Backend`
+            Optimization backend: ``"lbfgsb"``, ``"trust-constr"``,
+            ``"newton-cg"``, the name of a backend registered through
+            :func:`optimix._backend.register_backend`, or a backend instance.
+        profile : bool
+            Whether to record the time spent per phase, for this function and
+            each of its composite children, into the ``profile`` attribute of
+            the result (see :class:`optimix._profile.Profile`).
+
+        Events are sent to the ``_observer`` attribute, if set. Otherwise,
+        ``verbose=True`` prints notices to the standard output.
+
+        Each run keeps its state in its own session, so runs may proceed in
+        several threads; ``self._history`` refers to the most recent one.
+        Writes into the variables happen under ``self._variables.lock``.
+
+        Returns
+        -------
+        :class:`optimix._backend.Result`
+            Solution, evaluation count, wall time and convergence reason.
+        """
+        args = (factr, pgtol, checkpoint, every, trace, method)
+        return self.__optimize(+1.0, verbose, profile, *args)
+
+    def _aminimize(
+        self,
+        verbose=False,
+        factr=FACTR,
+        pgtol=PGTOL,
+        checkpoint=None,
+        every=10,
+        trace=None,
+        method="lbfgsb",
+        profile=False,
+        executor=None,
+    ):
+        """
+        Minimize the function in an executor, without blocking the event loop.
+
+        It must be called from a running :mod:`asyncio` loop::
+
+            run = f._aminimize()
+            async for event in run:
+                ...
+            result = await run
+
+        See :meth:`_minimize` for the parameters. Events are also sent to the
+        ``_observer`` attribute, if set, from the executor thread.
+
+        Parameters
+        ----------
+        executor : :class:`concurrent.futures.Executor`, optional
+            Defaults to the default executor of the loop.
+
+        Returns
+        -------
+        :class:`optimix._async.AsyncRun`
+            Run, awaitable for the result and asynchronously iterable over the
+            events (see :class:`optimix._async.Event`). Cancelling it stops the
+            optimization before its next evaluation and restores the starting
+            point.
+        """
+        args = (factr, pgtol, checkpoint, every, trace, method)
+        return self.__optimize_async(+1.0, verbose, profile, args, executor)
+
+    def _amaximize(
+        self,
+        verbose=False,
+        factr=FACTR,
+        pgtol=PGTOL,
+        checkpoint=None,
+        every=10,
+        trace=None,
+        method="lbfgsb",
+        profile=False,
+        executor=None,
     ):
-        self.__sign = -1.0
+        """
+        Maximize the function in an executor, without blocking the event loop.
+
+        See :meth:`_aminimize`.
+        """
+        args = (factr, pgtol, checkpoint, every, trace, method)
+        return self.__optimize_async(-1.0, verbose, profile, args, executor)
+
+    def __optimize_async(self, sign, verbose, profile, args, executor):
+        from ._async import AsyncRun
+
+        def start(observer, cancel):
+            return self.__optimize(
+                sign, verbose, profile, *args, observer=observer, cancel=cancel
+            )
+
+        return AsyncRun(start, self.__run_observer(verbose), executor)
+
+    def __optimize(self, sign, verbose, profile, *args, observer=None, cancel=None):
+        """
+        Run ``__minimize`` within a new session.
+        """
+        from ._profile import Profile
+        from ._session import Session
+
+        if observer is None:
+            observer = self.__run_observer(verbose)
+        depth = self._history_depth
+        session = Session(sign, verbose, observer, depth, cancel)
         try:
-            self._minimize_scalar(desc, rtol, atol, verbose)
+            session.flat_gradient, session.blocks = self.__spares.pop()
+        except IndexError:
+            pass
+        self.__session = session
+        self._history = session.history
+
+        try:
+            if not profile:
+                return self.__minimize(session, *args)
+
+            prof = Profile(getattr(self, "name", type(self).__name__))
+            session.profile = prof
+            with prof.record(self):
+                r = self.__minimize(session, *args)
         finally:
-            self.__sign = +1.0
+            # Direct calls are neither cancelled nor profiled once the run is
+            # over.
+            session.cancel = None
+            session.profile = None
+            self.__spares.append((session.flat_gradient, session.blocks))
+
+        backend = prof.phases.pop("backend", None)
+        if backend is not None:
+            call = prof.phases["call"]
+            wall = backend.wall - call.wall
+            prof.add("optimizer", wall, backend.cpu - call.cpu, backend.count)
+        r.profile = prof
+        return r
+
+    def __minimize(self, session, factr, pgtol, checkpoint, every, trace, method):
+        from time import perf_counter
 
-    def _minimize(self, verbose=True, factr=FACTR, pgtol=PGTOL):
         from numpy import abs as npabs, max as npmax
-        from numpy import empty, atleast_1d
+        from numpy import clip, empty
+
+        from ._backend import Result, get_backend
+        from ._checkpoint import Checkpoint
+
+        start = perf_counter()
+        backend = get_backend(method)
+        observer = session.observer
+        plan = self._variables.plan()
+        if observer is not None:
+            observer.on_start(backend.label, plan.size)
+
+        # Reused across runs, together with the gradient blocks viewing it.
+        if session.flat_gradient.shape != (plan.size,):
+            session.flat_gradient = empty(plan.size)
+        session.flat_solution = empty(plan.size)
+        flat_gradient = session.flat_gradient
+
+        value = None
+        with self._variables.lock:
+            if _overrides(self, "gradient_into"):
+                self.__write_gradient(session, plan)
+            elif _overrides(self, "value_and_gradient"):
+                value, grad = self.value_and_gradient()
+                plan.pack(grad, flat_gradient)
+            else:
+                plan.pack(self.gradient(), flat_gradient)
+            self._clean()
+
+        ckpt = None
+        if checkpoint is not None:
+            sign = session.sign
+            options = dict(sign=sign, factr=factr, pgtol=pgtol, every=every)
+            if isinstance(method, str):
+                options["method"] = method
+            ckpt = Checkpoint(checkpoint, every, self._variables, options)
+        callback = _chain(ckpt, None if observer is None else observer.on_step)
+
+        if npmax(npabs(flat_gradient)) <= pgtol:
+            msg = "Gradient near zero before the first iteration."
+            x = plan.gather(session.flat_solution).copy()
+            if ckpt is not None:
+                ckpt.write(x, done=True)
+            if value is None:
+                with self._variables.lock:
+                    value = self.value()
+                    self._clean()
+            r = Result(x, value, 0, msg, time=perf_counter() - start)
+            if observer is not None:
+                observer.on_message(msg + " Returning the current value.")
+                observer.on_end(r)
+            return r
+
+        session.history.reset(plan.size, trace)
+        x0 = plan.gather(empty(plan.size))
+        try:
+            r = self.__try_minimize(session, 5, backend, factr, pgtol, callback)
+        except Cancelled:
+            with self._variables.lock:
+                plan.scatter(x0)
+            if observer is not None:
+                observer.on_message("Cancelled. The starting point is restored.")
+            raise
+        finally:
+            session.history.close()
+
+        if r.status == 1:
+            msg = "too many function evaluations or too many iterations"
+            raise OptimixError("{}: {}".format(backend.label, msg))
+        if r.status == 2:
+            raise OptimixError("{}: {}".format(backend.label, r.message))
+
+        # Backends may step slightly outside the bounds.
+        plan = self._variables.plan()
+        r.x = clip(r.x, plan.lower, plan.upper)
+        with self._variables.lock:
+            plan.scatter(r.x)
+        if ckpt is not None:
+            ckpt.write(r.x, done=True)
+
+        r.value = session.sign * r.value
+        r.nfev = session.history.count
+        r.time = perf_counter() - start
+        if observer is not None:
+            observer.on_end(r)
+        return r
+
+    def _resume(self, checkpoint, verbose=True, method=None):
+        """
+        Continue an optimization from its last checkpoint.
 
-        self.__verbose = verbose
-        varnames = self.__varnames()
+        The variables are restored from the checkpoint, and the optimization
+        (a minimization or a maximization) resumes from the saved solution with
+        the same options, still writing to ``checkpoint``.
 
-        grad = self.gradient()
-        sign_grad = {name: self.__sign * atleast_1d(grad[name]) for name in varnames}
+        Parameters
+        ----------
+        checkpoint : str
+            File written by :meth:`_minimize` or :meth:`_maximize`.
+        verbose : bool
+            ``True`` for verbose output; ``False`` otherwise.
+        method : str or :class:`optimix._backend.Backend`, optional
+            Optimization backend. Defaults to the one named in the checkpoint.
+
+        Returns
+        -------
+        :class:`optimix._backend.Result`
+            Outcome of the resumed optimization, or ``None`` if it had already
+            finished.
+        """
+        from ._checkpoint import load_checkpoint
+
+        state = load_checkpoint(checkpoint)
+        self._variables.load_bytes(state["variables"])
+        self._variables.plan().scatter(state["x"])
+        if state["done"]:
+            return None
+
+        if method is None:
+            method = state.get("method", "lbfgsb")
+
+        kwargs = dict(
+            verbose=verbose,
+            factr=state["factr"],
+            pgtol=state["pgtol"],
+            checkpoint=checkpoint,
+            every=state["every"],
+            method=method,
+        )
+        if state["sign"] < 0:
+            return self._maximize(**kwargs)
+        return self._minimize(**kwargs)
+
+    def _maximize(
+        self,
+        verbose=True,
+        factr=FACTR,
+        pgtol=PGTOL,
+        checkpoint=None,
+        every=10,
+        trace=None,
+        method="lbfgsb",
+        profile=False,
+    ):
+        """
+        Maximize the function, using L-BFGS-B by default.
 
-        self.__flat_gradient = empty(sum(s.size for s in sign_grad.values()))
-        self.__flat_solution = empty(sum(self._variables[n].size for n in varnames))
+        See :meth:`_minimize` for the parameters.
+        """
+        args = (factr, pgtol, checkpoint, every, trace, method)
+        return self.__optimize(-1.0, verbose, profile, *args)
 
-        _set_flat_arr(sign_grad, varnames, self.__flat_gradient)
-        if npmax(npabs(self.__flat_gradient)) <= pgtol:
-            if verbose:
-                print(
-                    "Gradient near zero before the first iteration. "
-                    "Returning the current value."
-                )
-            return
+    def _minimize_blockwise(
+        self, groups, inner=None, maxiter=100, rtol=1e-10, atol=1e-12
+    ):
+        """
+        Minimize the function by block-coordinate descent.
 
-        r = self.__try_minimize(5, factr=factr, pgtol=pgtol)
+        Each outer sweep optimizes the groups of variables in turn, the other
+        variables being held fixed. A group is solved by the method registered
+        for it through :func:`optimix.closed_form` if any, and by
+        :meth:`_minimize` otherwise. Sweeps stop once the function value
+        decreases by no more than ``atol + rtol * |value|``. Unfixed variables
+        left out of ``groups`` keep their values, and the fixed flags are
+        restored at the end.
 
-        if r[2]["warnflag"] == 1:
-            msg = "L-BFGS-B: too many function evaluations or too many iterations"
-            raise OptimixError(msg)
-        if r[2]["warnflag"] == 2:
-            raise OptimixError("L-BFGS-B: {}".format(r[2]["task"]))
+        Parameters
+        ----------
+        groups : list
+            Lists of unfixed variable names.
+        inner : dict, optional
+            Keyword arguments passed to :meth:`_minimize` for each group without
+            a closed-form solver, which is quiet by default.
+        maxiter : int
+            Maximum number of sweeps. Defaults to ``100``.
+        rtol, atol : float
+            Relative and absolute tolerances on the improvement of a sweep.
+
+        Returns
+        -------
+        :class:`optimix._backend.Result`
+            Solution over the unfixed variables, with ``nit`` the number of
+            sweeps, ``nfev`` the number of evaluations outside closed-form
+            solvers, ``status`` ``1`` if ``maxiter`` is reached, and ``values``
+            the function value before the first sweep and after each of them.
+        """
+        from ._blockwise import blockwise
 
-        _set_var_arr(r[0], self.__varnames(), self._variables)
+        return blockwise(self, groups, inner, maxiter, rtol, atol, False)
 
-    def _maximize(self, verbose=True, factr=FACTR, pgtol=PGTOL):
-        self.__sign = -1.0
-        try:
-            self._minimize(verbose=verbose, factr=factr, pgtol=pgtol)
-        finally:
-            self.__sign = +1.0
+    def _maximize_blockwise(
+        self, groups, inner=None, maxiter=100, rtol=1e-10, atol=1e-12
+    ):
+        """
+        Maximize the function by block-coordinate ascent.
+
+        See :meth:`_minimize_blockwise`. Groups without a closed-form solver are
+        optimized by :meth:`_maximize`.
+        """
+        from ._blockwise import blockwise
+
+        return blockwise(self, groups, inner, maxiter, rtol, atol, True)
+
+    def _minimize_multistart(
+        self,
+        n_starts,
+        sampler=None,
+        workers=None,
+        seed=None,
+        target=None,
+        factr=FACTR,
+        pgtol=PGTOL,
+    ):
+        """
+        Minimize the function from several starting points.
+
+        The best solution found is written back into the variables.
+
+        Parameters
+        ----------
+        n_starts : int
+            Number of starting points.
+        sampler : callable, optional
+            ``sampler(rng, x, lower, upper, n)`` returning ``n`` starting points
+            as rows of an array laid out as in :meth:`value_batch`, given the
+            current point ``x`` and the bounds. Defaults to
+            :func:`optimix._multistart.uniform_sampler`.
+        workers : int or :class:`concurrent.futures.Executor`, optional
+            Number of worker processes, or an executor, running the starts in
+            parallel. The function must then be picklable, and executors other
+            than process pools run each start on a deep copy. Defaults to
+            running them in turn in this process.
+        seed : int, optional
+            Seed for drawing the starting points.
+        target : float, optional
+            Stop as soon as a start reaches a value as good as ``target``,
+            cancelling the pending ones.
+
+        Returns
+        -------
+        list
+            One dictionary per starting point, having keys ``start``, ``x``,
+            ``value``, ``status`` (``"converged"``, ``"failed"`` or
+            ``"cancelled"``) and ``message``.
+        """
+        from ._multistart import multistart
+
+        kwargs = dict(factr=factr, pgtol=pgtol)
+        return multistart(
+            self, n_starts, sampler, workers, seed, target, False, kwargs
+        )
 
-    def __varnames(self):
-        return sorted(self._variables.select(fixed=False).names())
+    def _maximize_multistart(
+        self,
+        n_starts,
+        sampler=None,
+        workers=None,
+        seed=None,
+        target=None,
+        factr=FACTR,
+        pgtol=PGTOL,
+    ):
+        """
+        Maximize the function from several starting points.
+
+        See :meth:`_minimize_multistart`.
+        """
+        from ._multistart import multistart
+
+        kwargs = dict(factr=factr, pgtol=pgtol)
+        return multistart(self, n_starts, sampler, workers, seed, target, True, kwargs)
 
     def __call__(self, x):
+        """
+        Function value and flat gradient at ``x``, signed as in the most
+        recent run.
+
+        It raises :class:`optimix._exception.Cancelled`, without evaluating,
+        while that run is being cancelled.
+        """
+        return self.__evaluate_at(self.__session, x)
+
+    def __evaluate_at(self, session, x):
+        from time import perf_counter
+
         from numpy import atleast_1d
+        from numpy.linalg import norm
 
+        session.check()
         x = atleast_1d(x).ravel()
-        self.__solutions.append(x.copy())
-        _set_var_arr(x, self.__varnames(), self._variables)
-        _set_flat_arr(self.gradient(), self.__varnames(), self.__flat_gradient)
+        if session.profile is not None:
+            with session.profile.measure("call"):
+                return self.__profiled_call(session, x)
+
+        session.history.append(x)
+        plan = self._variables.plan()
+        observer = session.observer
+        with self._variables.lock:
+            plan.scatter(x)
+            if observer is None:
+                value = self.__evaluate(session, plan)
+            else:
+                observer.on_evaluation_start(x)
+                start = perf_counter()
+                value = self.__evaluate(session, plan)
+                elapsed = perf_counter() - start
+                gnorm = norm(session.flat_gradient)
+                observer.on_evaluation_end(x, value, gnorm, elapsed)
 
-        return self.__sign * self.value(), self.__sign * self.__flat_gradient
+        return session.sign * value, session.sign * session.flat_gradient
 
-    def __try_minimize(self, n, factr, pgtol):
-        from scipy.optimize import fmin_l_bfgs_b
+    def __profiled_call(self, session, x):
+        from time import perf_counter
 
-        disp = 1 if self.__verbose else 0
+        from numpy.linalg import norm
+
+        profile = session.profile
+        with profile.measure("history"):
+            session.history.append(x)
+        with self._variables.lock:
+            with profile.measure("scatter"):
+                plan = self._variables.plan()
+                plan.scatter(x)
+
+            observer = session.observer
+            if observer is not None:
+                observer.on_evaluation_start(x)
+            start = perf_counter()
+            value = self.__evaluate(session, plan)
+            if observer is not None:
+                gnorm = norm(session.flat_gradient)
+                observer.on_evaluation_end(x, value, gnorm, perf_counter() - start)
+
+        return session.sign * value, session.sign * session.flat_gradient
+
+    def __evaluate(self, session, plan):
+        """
+        Function value, with its gradient written into the flat gradient array.
+        """
+        if _overrides(self, "gradient_into"):
+            value = self.value()
+            self.__write_gradient(session, plan)
+            self._clean()
+            return value
+
+        value, grad = self.value_and_gradient()
+        self._clean()
+        if session.profile is None:
+            plan.pack(grad, session.flat_gradient)
+        else:
+            with session.profile.measure("pack"):
+                plan.pack(grad, session.flat_gradient)
+        return value
+
+    def __write_gradient(self, session, plan):
+        from ._gradient import gradient_blocks
+
+        flat = session.flat_gradient
+        cached = session.blocks
+        if cached is None or cached[0] is not plan or cached[1] is not flat:
+            cached = (plan, flat, gradient_blocks(self, plan, flat))
+            session.blocks = cached
+        flat.fill(0.0)
+        self.gradient_into(cached[2])
+
+    def __try_minimize(self, session, n, backend, factr, pgtol, callback):
+        from functools import partial
+
+        from ._backend import Problem
 
         if n == 0:
             raise OptimixError("Too many bad solutions")
 
         warn = False
-        res = []
+        res = None
         try:
-            _set_flat_arr(self._variables, self.__varnames(), self.__flat_solution)
-
-            bounds = []
-
-            for name in self.__varnames():
-                if self._variables[name].ndim == 0:
-                    bounds.append(self._variables[name].bounds)
-                else:
-                    bounds += self._variables[name].bounds
-
-            x0 = self.__flat_solution
-            res = fmin_l_bfgs_b(
-                self, x0, bounds=bounds, factr=factr, pgtol=pgtol, disp=disp
-            )
+            plan = self._variables.plan()
+            x0 = plan.gather(session.flat_solution)
+            fun = partial(self.__evaluate_at, session)
+            problem = Problem(fun, x0, plan.lower, plan.upper)
+            if _overrides(self, "hessian"):
+                problem.hess = partial(self.__flat_hessian, session)
+            if _overrides(self, "hessian_vector_product"):
+                problem.hessp = partial(self.__flat_hessian_vector_product, session)
+            args = (problem, callback, session.verbose, factr, pgtol)
+            if session.profile is None:
+                res = backend.minimize(*args)
+            else:
+                with session.profile.measure("backend"):
+                    res = backend.minimize(*args)
 
+        except Cancelled:
+            raise
         except OptimixError:
             warn = True
         else:
-            warn = res[2]["warnflag"] > 0
+            warn = res.status > 0
 
         if warn:
-            xs = self.__solutions
+            xs = session.history
             if len(xs) < 2:
                 raise OptimixError("Bad solution at the first iteration.")
 
-            _set_var_arr(xs[-2] / 2 + xs[-1] / 2, self.__varnames(), self._variables)
-            res = self.__try_minimize(n - 1, factr, pgtol)
+            x = xs[-2] / 2 + xs[-1] / 2
+            if session.observer is not None:
+                session.observer.on_retry(n - 1, x)
+            with self._variables.lock:
+                self._variables.plan().scatter(x)
+            res = self.__try_minimize(session, n - 1, backend, factr, pgtol, callback)
 
         return res
 
 
 class Function(FuncOpt):
-    def __init__(self, name, composite=[], **kwargs):
+    # Set it to ``True`` in a subclass to back all of its variables by a single
+    # contiguous buffer (see :meth:`Variables.pack`).
+    _contiguous = False
+
+    def __init__(self, name, composite=[], variables=None, **kwargs):
         """
         Base-class for object representing functions.
 
@@ -177,19 +1014,34 @@ class Function(FuncOpt):
             Function name.
         composite : list
             List of functions whose variables will be inherited.
+        variables : :class:`optimix.VariableSet`, optional
+            Compact set of variables. It is used as is if there are neither
+            composite functions nor ``kwargs``, and merged with them otherwise.
         kwargs : dict
             Map of variable name to variable value.
         """
         self._name = name
 
-        named_vars = {"": Variables(kwargs)}
+        # Composite functions by the name prefixed to their variables.
+        self._children = {}
         for (i, f) in enumerate(composite):
             if isinstance(f, tuple):
-                named_vars[f[0]] = f[1]._variables
+                self._children[f[0]] = f[1]
             else:
-                named_vars[f"{self._name}[{i}]"] = f._variables
+                self._children[f"{self._name}[{i}]"] = f
+
+        if variables is not None and len(composite) == 0 and len(kwargs) == 0:
+            super(Function, self).__init__(variables)
+            return
 
-        super(Function, self).__init__(merge_variables(named_vars))
+        if variables is not None:
+            kwargs = dict(variables.items(), **kwargs)
+        named_vars = {"": Variables(kwargs)}
+        for prefix, f in self._children.items():
+            named_vars[prefix] = f._variables
+
+        variables = merge_variables(named_vars, contiguous=self._contiguous)
+        super(Function, self).__init__(variables)
 
     @property
     def name(self):
@@ -202,6 +1054,37 @@ class Function(FuncOpt):
     def name(self, name):
         self._name = name
 
+    def _child_result(self, prefix, method="value", *args):
+        """
+        Result of a method of a composite child, reused while none of the
+        child's variables changed.
+
+        Parameters
+        ----------
+        prefix : str
+            Prefix of the child variables (see ``composite``).
+        method : str
+            Method name. Defaults to ``"value"``.
+        args : tuple
+            Hashable positional arguments of the method.
+
+        Returns
+        -------
+        object
+            The (possibly reused) result, which must not be modified.
+        """
+        from ._dirty import tracker_of
+
+        tracker = tracker_of(self)
+        version = tracker.version(prefix)
+        key = (prefix, method, args)
+        cached = tracker.results.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        result = getattr(self._children[prefix], method)(*args)
+        tracker.results[key] = (version, result)
+        return result
+
     def _fix(self, var_name):
         r"""Set a variable fixed.
 
@@ -233,54 +1116,98 @@ class Function(FuncOpt):
         return self._variables[var_name].isfixed
 
     def _unfixed_names(self):
-        return sorted(self._variables.select(fixed=False).names())
+        return list(self._variables.plan().names)
 
-    def _check_grad(self, step=1.49e-08):
-        from numpy import asarray
-        from numpy.linalg import norm
+    def _check_grad(self, step=1.49e-08, **kwargs):
+        """
+        Distance between the gradient and its finite-difference approximation.
+
+        Keyword arguments are passed to :meth:`_approx_fprime`. Coordinates
+        left out by ``sample`` are not compared.
+        """
+        from ._check_grad import _distance, _raw_gradient
 
-        g = self.gradient()
-        g = {n: asarray(gi) for n, gi in g.items()}
-        fg = self._approx_fprime(step)
+        f0, g = self.value_and_gradient()
+        self._clean()
+        g = _raw_gradient(self._variables, g)
+        fg = self.__approx_fprime(f0, step, **kwargs)
 
         names = set(g.keys()).intersection(fg.keys())
-        return sum(norm(fg[name] - g[name]) for name in names)
-
-    def _approx_fprime(self, step=1.49e-08):
-        from numpy import atleast_1d, asarray, squeeze, stack
-
-        f0 = self.value()
-        grad = {}
-        for name in self._variables.select(fixed=False).names():
-            value = self._variables.get(name).value
-            ndim = value.ndim
-            value = atleast_1d(value).ravel()
-            grads = []
-            for i in range(len(value)):
-                value[i] += step
-                grads.append(asarray((self.value() - f0) / step))
-                value[i] -= step
-            grad[name] = stack(grads, axis=-1)
-            if ndim == 0:
-                grad[name] = squeeze(grad[name], axis=-1)
-        return grad
-
-
-def _set_flat_arr(arrs, names, out):
+        return sum(_distance(fg[name], g[name]) for name in names)
+
+    def _approx_fprime(
+        self, step=1.49e-08, method="forward", sample=None, seed=None, workers=None
+    ):
+        """
+        Finite-difference approximation of the gradient over unfixed variables.
+
+        Parameters
+        ----------
+        step : float
+            Step size.
+        method : str
+            ``"forward"`` or ``"central"`` differences.
+        sample : int, optional
+            Number of coordinates, drawn at random, to differentiate. The
+            remaining ones are set to ``nan``. Defaults to all of them.
+        seed : int, optional
+            Seed for drawing the coordinates.
+        workers : int or :class:`concurrent.futures.Executor`, optional
+            Number of threads, or an executor, evaluating perturbed copies of
+            this function concurrently. Defaults to serial evaluation, through
+            :meth:`value_batch` if overridden.
+
+        Returns
+        -------
+        dict
+            Map of variable name to gradient.
+        """
+        f0 = None
+        if method == "forward":
+            f0 = self.value()
+            self._clean()
+        return self.__approx_fprime(f0, step, method, sample, seed, workers)
+
+    def __approx_fprime(
+        self, f0, step, method="forward", sample=None, seed=None, workers=None
+    ):
+        from operator import attrgetter
+
+        from ._check_grad import _finite_differences
+
+        getter = attrgetter("_variables")
+        names = self._variables.plan().names
+        batch = workers is None and _overrides(self, "value_batch")
+        return _finite_differences(
+            self, getter, names, f0, step, method, sample, seed, workers, batch
+        )
+
+
+def _chain(*callbacks):
+    callbacks = [c for c in callbacks if c is not None]
+    if len(callbacks) == 0:
+        return None
+    if len(callbacks) == 1:
+        return callbacks[0]
+
+    def chained(xk):
+        for c in callbacks:
+            c(xk)
+
+    return chained
+
+
+def _flatten(plan, arrs, out):
+    """
+    Pack arrays already in the flat layout, so unlike ``plan.pack`` without
+    pulling back the blocks of structured matrices.
+    """
     from numpy import asarray
 
-    offset = 0
-    for name in names:
-        arr = asarray(arrs[name])
-        size = arr.size
-        out[offset : offset + size] = arr
-        offset += size
+    for name, start, stop in plan.spans:
+        out[start:stop] = asarray(arrs[name]).ravel()
     return out
 
 
-def _set_var_arr(flat_arr, names, dict_arr):
-    offset = 0
-    for name in names:
-        size = dict_arr[name].size
-        dict_arr[name].value = flat_arr[offset : offset + size]
-        offset += size
+def _overrides(func, name):
+    return getattr(type(func), name) is not getattr(FuncOpt, name)
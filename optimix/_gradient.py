@@ -0,0 +1,81 @@
+__all__ = ["GradientBlocks", "gradient_blocks"]
+
+
+class GradientBlocks(object):
+    """
+    Writable gradient blocks, by variable name, of a function.
+
+    Each block is a view into a flat gradient array shared by a whole
+    composite tree, shaped as the ``raw`` array of its variable. Blocks of
+    fixed variables are absent, and assigning to them does nothing.
+
+    It is passed to :meth:`optimix.Function.gradient_into`. A composite
+    function writes its own blocks and passes :meth:`child` to the
+    ``gradient_into`` of each of its children, which then write directly into
+    the right slices of the flat array.
+    """
+
+    __slots__ = ["_views", "_pullbacks", "_children"]
+
+    def __init__(self, views, pullbacks, children):
+        self._views = views
+        self._pullbacks = pullbacks
+        self._children = children
+
+    def __contains__(self, name):
+        return name in self._views
+
+    def __getitem__(self, name):
+        """
+        Block of an unfixed variable, to be written in place.
+        """
+        return self._views[name]
+
+    def __setitem__(self, name, value):
+        """
+        Write the gradient block of a variable.
+
+        Blocks of structured matrices are given with respect to the dense
+        matrix and pulled back to its parameters.
+        """
+        view = self._views.get(name)
+        if view is None:
+            return
+        pullback = self._pullbacks.get(name)
+        if pullback is not None:
+            value = pullback(value)
+        try:
+            view[...] = value
+        except ValueError:
+            from numpy import asarray
+
+            view.reshape(-1)[:] = asarray(value).ravel()
+
+    def child(self, prefix):
+        """
+        Blocks of the composite child whose variables are prefixed by
+        ``prefix``.
+        """
+        return self._children[prefix]
+
+
+def gradient_blocks(func, plan, flat):
+    """
+    Gradient blocks of ``func`` over the unfixed variables of ``plan``, as
+    views into ``flat``.
+    """
+    views = {}
+    for var, (name, start, stop) in zip(plan.variables, plan.spans):
+        views[name] = flat[start:stop].reshape(var.raw.shape)
+    return _tree(func, views, getattr(plan, "pullbacks", {}))
+
+
+def _tree(func, views, pullbacks):
+    children = {}
+    for prefix, child in getattr(func, "_children", {}).items():
+        dot = prefix + "." if len(prefix) > 0 else ""
+        n = len(dot)
+        sub = {k[n:]: v for k, v in views.items() if k.startswith(dot)}
+        subp = {k[n:]: p for k, p in pullbacks.items() if k.startswith(dot)}
+        children[prefix] = _tree(child, sub, subp)
+    return GradientBlocks(views, pullbacks, children)
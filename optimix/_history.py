@@ -0,0 +1,117 @@
+__all__ = ["History"]
+
+
+class History(object):
+    """
+    Fixed-size ring buffer of the points evaluated by an optimization.
+
+    Only the ``depth`` most recent points are kept in memory, in a preallocated
+    two-dimensional array. Optionally, every point is also appended to a file
+    that can be read back as a memory-mapped array for diagnostics.
+
+    Parameters
+    ----------
+    depth : int
+        Number of points kept in memory.
+    """
+
+    def __init__(self, depth):
+        from numpy import empty
+
+        if depth < 1:
+            raise ValueError("The history depth must be positive.")
+        self._depth = depth
+        self._points = empty((depth, 0))
+        self._count = 0
+        self._path = None
+        self._file = None
+
+    @property
+    def depth(self):
+        """
+        Number of points kept in memory.
+        """
+        return self._depth
+
+    @property
+    def count(self):
+        """
+        Number of points appended since the last reset.
+        """
+        return self._count
+
+    def reset(self, size, trace=None):
+        """
+        Forget all points and prepare for points of the given size.
+
+        Parameters
+        ----------
+        size : int
+            Number of entries of each point.
+        trace : str, optional
+            File to which every point is appended. Defaults to keeping only the
+            in-memory ring buffer.
+        """
+        from numpy import empty
+
+        self.close()
+        if self._points.shape[1] != size:
+            self._points = empty((self._depth, size))
+        self._count = 0
+        self._path = trace
+        if trace is not None:
+            self._file = open(trace, "wb")
+
+    def append(self, x):
+        """
+        Append a point.
+        """
+        self._points[self._count % self._depth] = x
+        self._count += 1
+        if self._file is not None:
+            self._file.write(x.tobytes())
+
+    def close(self):
+        """
+        Flush and close the trace file, if any.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def trace(self):
+        """
+        Every point appended since the last reset, read from the trace file.
+
+        Returns
+        -------
+        :class:`numpy.memmap`
+            Read-only ``(count, size)`` array.
+        """
+        from numpy import empty, memmap
+
+        if self._path is None:
+            raise ValueError("The full trace has not been kept.")
+        if self._file is not None:
+            self._file.flush()
+        shape = (self._count, self._points.shape[1])
+        if self._count == 0:
+            return empty(shape)
+        return memmap(self._path, float, "r", shape=shape)
+
+    def __len__(self):
+        return min(self._count, self._depth)
+
+    def __getitem__(self, i):
+        n = len(self)
+        if not -n <= i < n:
+            raise IndexError("history index out of range")
+        if i < 0:
+            i += n
+        return self._points[(self._count - n + i) % self._depth]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_file"] = None
+        state["_path"] = None
+        return state
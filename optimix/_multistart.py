@@ -0,0 +1,137 @@
+from ._exception import OptimixError
+
+__all__ = ["multistart", "uniform_sampler"]
+
+# Function held by each worker process of a pool owned by `multistart`.
+_worker_function = None
+
+
+def uniform_sampler(rng, x, lower, upper, n):
+    """
+    Draw starting points within the bounds.
+
+    Coordinates with finite bounds are drawn uniformly between them. The others
+    are drawn from a normal distribution centred at the current point, with
+    scale ``max(1, |x|)``, and clipped into their bounds.
+
+    Parameters
+    ----------
+    rng : :class:`numpy.random.Generator`
+        Random number generator.
+    x : :class:`numpy.ndarray`
+        Current point.
+    lower, upper : :class:`numpy.ndarray`
+        Lower and upper bounds.
+    n : int
+        Number of points.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Points as a ``(n, len(x))`` array.
+    """
+    from numpy import abs as npabs, clip, isfinite, maximum, where
+
+    finite = isfinite(lower) & isfinite(upper)
+    lo = where(finite, lower, 0.0)
+    hi = where(finite, upper, 1.0)
+    uniform = rng.uniform(lo, hi, size=(n, len(x)))
+    normal = rng.normal(x, maximum(1.0, npabs(x)), size=(n, len(x)))
+    return where(finite, uniform, clip(normal, lower, upper))
+
+
+def multistart(f, n_starts, sampler, workers, seed, target, maximize, kwargs):
+    from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+    from copy import deepcopy
+
+    from numpy import argsort, asarray, empty, isnan
+    from numpy.random import default_rng
+
+    sign = -1.0 if maximize else +1.0
+    plan = f._variables.plan()
+    x = plan.gather(empty(plan.size))
+    if sampler is None:
+        sampler = uniform_sampler
+    starts = asarray(sampler(default_rng(seed), x, plan.lower, plan.upper, n_starts))
+
+    # Most promising starting points first, so that `target` is met early.
+    order = argsort(sign * f.value_batch(starts), kind="stable")
+
+    table = [
+        {"start": s, "x": None, "value": None, "status": "cancelled", "message": ""}
+        for s in starts
+    ]
+
+    def record(i, result):
+        xi, value, message = result
+        table[i].update(x=xi, value=value, message=message)
+        table[i]["status"] = "failed" if xi is None else "converged"
+        return xi is not None and target is not None and sign * value <= sign * target
+
+    if workers is None:
+        for i in order:
+            if record(i, _run(f, starts[i], maximize, kwargs)):
+                break
+    else:
+        owned = not isinstance(workers, Executor)
+        if owned:
+            executor = ProcessPoolExecutor(
+                workers, initializer=_set_worker_function, initargs=(f,)
+            )
+            g = None
+        else:
+            executor = workers
+            g = f
+        # Starts share no state: threads run on copies, as process pools pickle
+        # the function anyway.
+        copy = not isinstance(executor, ProcessPoolExecutor)
+
+        try:
+            futures = {}
+            for i in order:
+                gi = deepcopy(g) if copy else g
+                futures[executor.submit(_run, gi, starts[i], maximize, kwargs)] = i
+            for fut in as_completed(futures):
+                if record(futures[fut], fut.result()):
+                    for pending in futures:
+                        pending.cancel()
+                    break
+        finally:
+            if owned:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    done = [r for r in table if r["status"] == "converged" and not isnan(r["value"])]
+    if len(done) == 0:
+        raise OptimixError("No starting point has converged.")
+
+    best = min(done, key=lambda r: sign * r["value"])
+    f._variables.plan().scatter(best["x"])
+    return table
+
+
+def _set_worker_function(f):
+    global _worker_function
+    _worker_function = f
+
+
+def _run(f, x, maximize, kwargs):
+    from numpy import empty, nan
+
+    if f is None:
+        f = _worker_function
+
+    plan = f._variables.plan()
+    plan.scatter(x)
+    try:
+        if maximize:
+            f._maximize(verbose=False, **kwargs)
+        else:
+            f._minimize(verbose=False, **kwargs)
+    except OptimixError as e:
+        return None, nan, str(e)
+    except Exception as e:
+        # A start failing in the user's code does not abort the others.
+        return None, nan, f"{type(e).__name__}: {e}"
+
+    plan = f._variables.plan()
+    return plan.gather(empty(plan.size)), f.value(), ""
@@ -0,0 +1,230 @@
+__all__ = [
+    "LoggingObserver",
+    "MetricsObserver",
+    "Observer",
+    "PrintObserver",
+    "TqdmObserver",
+]
+
+
+class Observer(object):
+    """
+    Receiver of optimization events.
+
+    Every method does nothing; subclasses override the events they need. Set an
+    instance as the ``_observer`` attribute of a function to receive the events
+    of its optimizations. No event is produced while ``_observer`` is ``None``.
+    """
+
+    def on_start(self, method, size):
+        """
+        An optimization starts.
+
+        Parameters
+        ----------
+        method : str
+            Backend label, or ``"Brent"`` for a scalar optimization.
+        size : int
+            Number of unfixed variable entries.
+        """
+
+    def on_evaluation_start(self, x):
+        """
+        The function is about to be evaluated at the flat point ``x``.
+        """
+
+    def on_evaluation_end(self, x, value, gradient_norm, elapsed):
+        """
+        The function has been evaluated.
+
+        Parameters
+        ----------
+        x : :class:`numpy.ndarray`
+            Flat point.
+        value : float
+            Function value.
+        gradient_norm : float
+            Euclidean norm of the flat gradient, or ``None`` if it has not been
+            computed.
+        elapsed : float
+            Evaluation time in seconds.
+        """
+
+    def on_step(self, x):
+        """
+        The backend has accepted the step to the flat point ``x``.
+        """
+
+    def on_retry(self, remaining, x):
+        """
+        The backend has failed and is restarted from the flat point ``x``, with
+        ``remaining`` attempts left.
+        """
+
+    def on_message(self, text):
+        """
+        Human-readable notice.
+        """
+
+    def on_end(self, result):
+        """
+        The optimization has finished with a :class:`optimix._backend.Result`,
+        or ``None`` for a scalar optimization.
+        """
+
+
+class PrintObserver(Observer):
+    """
+    Print notices to the standard output.
+
+    It is used by ``verbose=True`` when no observer has been set.
+    """
+
+    def on_message(self, text):
+        print(text)
+
+
+class TqdmObserver(PrintObserver):
+    """
+    Show the number of evaluations in a tqdm progress bar.
+
+    Parameters
+    ----------
+    desc : str
+        Progress bar description.
+    """
+
+    def __init__(self, desc="Progress"):
+        self._desc = desc
+        self._progress = None
+
+    def on_start(self, method, size):
+        from tqdm import tqdm
+
+        self.on_end(None)
+        self._progress = tqdm(desc=self._desc)
+
+    def on_evaluation_end(self, x, value, gradient_norm, elapsed):
+        if self._progress is not None:
+            self._progress.update(1)
+
+    def on_end(self, result):
+        if self._progress is not None:
+            self._progress.close()
+            self._progress = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_progress"] = None
+        return state
+
+
+class LoggingObserver(Observer):
+    """
+    Send events to a :mod:`logging` logger.
+
+    Evaluations are logged at ``DEBUG`` level and the other events at ``level``.
+
+    Parameters
+    ----------
+    logger : :class:`logging.Logger`, optional
+        Defaults to the ``"optimix"`` logger.
+    level : int
+        Defaults to ``logging.INFO``.
+    """
+
+    def __init__(self, logger=None, level=None):
+        import logging
+
+        self._logger = logging.getLogger("optimix") if logger is None else logger
+        self._level = logging.INFO if level is None else level
+
+    def on_start(self, method, size):
+        self._logger.log(self._level, "%s started on %d entries.", method, size)
+
+    def on_evaluation_end(self, x, value, gradient_norm, elapsed):
+        import logging
+
+        self._logger.log(
+            logging.DEBUG,
+            "Evaluation: value=%g, gradient norm=%s, %.3g s.",
+            value,
+            gradient_norm,
+            elapsed,
+        )
+
+    def on_retry(self, remaining, x):
+        self._logger.log(self._level, "Retrying, %d attempts left.", remaining)
+
+    def on_message(self, text):
+        self._logger.log(self._level, text)
+
+    def on_end(self, result):
+        self._logger.log(self._level, "Finished: %r", result)
+
+
+class MetricsObserver(Observer):
+    """
+    Collect evaluation metrics in memory.
+
+    Attributes
+    ----------
+    runs : int
+        Number of optimizations started.
+    evaluations : int
+        Number of function evaluations.
+    steps : int
+        Number of accepted steps.
+    retries : int
+        Number of backend restarts.
+    time : float
+        Total evaluation time in seconds.
+    values : list
+        Function value of each evaluation.
+    gradient_norms : list
+        Gradient norm of each evaluation.
+    messages : list
+        Notices received.
+    """
+
+    def __init__(self):
+        self.runs = 0
+        self.evaluations = 0
+        self.steps = 0
+        self.retries = 0
+        self.time = 0.0
+        self.values = []
+        self.gradient_norms = []
+        self.messages = []
+
+    def on_start(self, method, size):
+        self.runs += 1
+
+    def on_evaluation_end(self, x, value, gradient_norm, elapsed):
+        self.evaluations += 1
+        self.time += elapsed
+        self.values.append(value)
+        self.gradient_norms.append(gradient_norm)
+
+    def on_step(self, x):
+        self.steps += 1
+
+    def on_retry(self, remaining, x):
+        self.retries += 1
+
+    def on_message(self, text):
+        self.messages.append(text)
+
+    def summary(self):
+        """
+        Counters as a dictionary.
+        """
+        mean = self.time / self.evaluations if self.evaluations > 0 else 0.0
+        return dict(
+            runs=self.runs,
+            evaluations=self.evaluations,
+            steps=self.steps,
+            retries=self.retries,
+            time=self.time,
+            mean_time=mean,
+        )
@@ -0,0 +1,135 @@
+__all__ = ["Cholesky", "Symmetric", "LowRank"]
+
+
+class Cholesky(object):
+    """
+    Positive semi-definite ``n``-by-``n`` matrix ``L Lᵀ``, parametrized by the
+    ``n (n + 1) / 2`` entries of its lower-triangular factor ``L``.
+    """
+
+    name = "cholesky"
+
+    def __init__(self, n):
+        from numpy import tril_indices
+
+        self.n = n
+        self.index = tril_indices(n)
+
+    @classmethod
+    def from_raw_shape(cls, shape):
+        return cls(_triangle_order(shape[0]))
+
+    @property
+    def shape(self):
+        return (self.n, self.n)
+
+    def factor(self, params):
+        from numpy import zeros
+
+        L = zeros(self.shape)
+        L[self.index] = params
+        return L
+
+    def from_factor(self, L):
+        return L[self.index]
+
+    def dense(self, params):
+        L = self.factor(params)
+        return L @ L.T
+
+    def params(self, value):
+        from numpy.linalg import cholesky
+
+        return self.from_factor(cholesky(value))
+
+    def pullback(self, params, G):
+        L = self.factor(params)
+        return ((G + G.T) @ L)[self.index]
+
+
+class Symmetric(object):
+    """
+    Symmetric ``n``-by-``n`` matrix, parametrized by the ``n (n + 1) / 2``
+    entries of its lower triangle.
+    """
+
+    name = "symmetric"
+
+    def __init__(self, n):
+        from numpy import tril_indices
+
+        self.n = n
+        self.index = tril_indices(n)
+
+    @classmethod
+    def from_raw_shape(cls, shape):
+        return cls(_triangle_order(shape[0]))
+
+    @property
+    def shape(self):
+        return (self.n, self.n)
+
+    def dense(self, params):
+        from numpy import diag, zeros
+
+        M = zeros(self.shape)
+        M[self.index] = params
+        return M + M.T - diag(diag(M))
+
+    def params(self, value):
+        return ((value + value.T) / 2)[self.index]
+
+    def pullback(self, params, G):
+        from numpy import diag
+
+        return (G + G.T - diag(diag(G)))[self.index]
+
+
+class LowRank(object):
+    """
+    Positive semi-definite ``n``-by-``n`` matrix ``W Wᵀ`` of rank at most
+    ``rank``, parametrized by the ``n``-by-``rank`` factor ``W``.
+    """
+
+    name = "lowrank"
+
+    def __init__(self, n, rank):
+        self.n = n
+        self.rank = rank
+
+    @classmethod
+    def from_raw_shape(cls, shape):
+        return cls(*shape)
+
+    @property
+    def shape(self):
+        return (self.n, self.n)
+
+    def factor(self, params):
+        return params
+
+    def from_factor(self, W):
+        return W
+
+    def dense(self, params):
+        return params @ params.T
+
+    def params(self, value):
+        from numpy import maximum, sqrt
+        from numpy.linalg import eigh
+
+        s, U = eigh((value + value.T) / 2)
+        s, U = s[::-1][: self.rank], U[:, ::-1][:, : self.rank]
+        return U * sqrt(maximum(s, 0))
+
+    def pullback(self, params, G):
+        return (G + G.T) @ params
+
+
+def _triangle_order(m):
+    from math import isqrt
+
+    n = (isqrt(8 * m + 1) - 1) // 2
+    if n * (n + 1) // 2 != m:
+        raise ValueError(f"{m} is not the size of a triangular matrix.")
+    return n
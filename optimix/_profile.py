@@ -0,0 +1,219 @@
+from contextvars import ContextVar
+from functools import wraps
+
+__all__ = ["Phase", "Profile", "timed"]
+
+# Methods timed on the function being optimized and on its composite children.
+_METHODS = ("value", "gradient", "value_and_gradient", "gradient_into")
+
+# Recorder of the profiled run in progress in this context, if any.
+_active = ContextVar("optimix_profile", default=None)
+
+
+class Phase(object):
+    """
+    Number of calls and cumulative times of an optimization phase.
+
+    Attributes
+    ----------
+    count : int
+        Number of calls.
+    wall : float
+        Wall time in seconds.
+    cpu : float
+        CPU time of this process in seconds.
+    """
+
+    def __init__(self, count=0, wall=0.0, cpu=0.0):
+        self.count = count
+        self.wall = wall
+        self.cpu = cpu
+
+    def to_dict(self):
+        return dict(count=self.count, wall=self.wall, cpu=self.cpu)
+
+    def __repr__(self):
+        return f"Phase(count={self.count}, wall={self.wall:.3g}, cpu={self.cpu:.3g})"
+
+
+class Profile(object):
+    """
+    Time spent per phase of an optimization.
+
+    It is the ``profile`` attribute of the result of ``_minimize(profile=True)``.
+
+    Phases are ``"value"`` and ``"gradient"``, plus ``"value_and_gradient"``
+    and ``"gradient_into"`` if overridden, for the model code; ``"call"`` for
+    each evaluation requested by the backend, which includes ``"history"``,
+    ``"scatter"`` (writing the point into the variables), the model code and
+    ``"pack"`` (flattening the gradient); and ``"optimizer"`` for the backend
+    itself, excluding evaluations.
+
+    Attributes
+    ----------
+    name : str
+        Function name.
+    phases : dict
+        Map of phase name to :class:`Phase`.
+    children : dict
+        Map of composite child name to its own :class:`Profile`, holding the
+        model code phases only.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.phases = {}
+        self.children = {}
+
+    def add(self, phase, wall, cpu, count=1):
+        """
+        Account for a call to ``phase``.
+        """
+        p = self.phases.get(phase)
+        if p is None:
+            p = self.phases[phase] = Phase()
+        p.count += count
+        p.wall += wall
+        p.cpu += cpu
+
+    def measure(self, phase):
+        """
+        Context manager accounting for the time spent within it.
+        """
+        from contextlib import contextmanager
+        from time import perf_counter, process_time
+
+        @contextmanager
+        def timer():
+            wall, cpu = perf_counter(), process_time()
+            try:
+                yield
+            finally:
+                self.add(phase, perf_counter() - wall, process_time() - cpu)
+
+        return timer()
+
+    def record(self, func):
+        """
+        Context manager timing the model code of ``func`` and of its composite
+        children, when called from the current context.
+
+        The functions are left untouched: the methods of ``_METHODS`` defined
+        by their classes look up the profile of the active run, so that calls
+        from other threads or after the run are not accounted for.
+        """
+        from contextlib import contextmanager
+
+        @contextmanager
+        def recording():
+            token = _active.set(_Recorder(self, func))
+            try:
+                yield
+            finally:
+                _active.reset(token)
+
+        return recording()
+
+    def to_dict(self):
+        """
+        Profile as nested dictionaries.
+        """
+        return dict(
+            name=self.name,
+            phases={k: v.to_dict() for k, v in self.phases.items()},
+            children={k: v.to_dict() for k, v in self.children.items()},
+        )
+
+    def to_json(self, path=None, **kwargs):
+        """
+        Profile as a JSON string, also written to ``path`` if given.
+
+        Keyword arguments are passed to :func:`json.dumps`.
+        """
+        import json
+
+        text = json.dumps(self.to_dict(), **kwargs)
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+    def __str__(self):
+        lines = []
+        _format(self, "", lines)
+        return "\n".join(lines)
+
+
+def timed(method):
+    """
+    Time ``method`` into the profile of the active run, if any.
+
+    :class:`optimix.Function` applies it to the methods of ``_METHODS`` that
+    its subclasses define.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        recorder = _active.get()
+        if recorder is None:
+            return method(self, *args, **kwargs)
+        return recorder.call(self, name, method, args, kwargs)
+
+    wrapper.__timed__ = True
+    return wrapper
+
+
+class _Recorder(object):
+    """
+    Profiles of a function and of its composite children, by function id.
+    """
+
+    def __init__(self, profile, func):
+        from ._function import _overrides
+
+        # Functions are held along with their profile, so that ids are not
+        # reused during the run.
+        self._profiles = {}
+        self._running = set()
+        stack = [(profile, func)]
+        while len(stack) > 0:
+            prof, f = stack.pop()
+            if id(f) in self._profiles:
+                continue
+            names = set(_METHODS[:2])
+            names.update(n for n in _METHODS[2:] if _overrides(f, n))
+            self._profiles[id(f)] = (prof, f, names)
+            for child_name, child in getattr(f, "_children", {}).items():
+                child_prof = prof.children.get(child_name)
+                if child_prof is None:
+                    child_prof = prof.children[child_name] = Profile(child_name)
+                stack.append((child_prof, child))
+
+    def call(self, func, name, method, args, kwargs):
+        from time import perf_counter, process_time
+
+        entry = self._profiles.get(id(func))
+        key = (id(func), name)
+        # Overrides calling the method they override are timed once.
+        if entry is None or name not in entry[2] or key in self._running:
+            return method(func, *args, **kwargs)
+
+        self._running.add(key)
+        wall, cpu = perf_counter(), process_time()
+        try:
+            return method(func, *args, **kwargs)
+        finally:
+            entry[0].add(name, perf_counter() - wall, process_time() - cpu)
+            self._running.discard(key)
+
+
+def _format(profile, indent, lines):
+    lines.append(f"{indent}{profile.name}")
+    for k, p in profile.phases.items():
+        lines.append(
+            f"{indent}  {k:<20} {p.count:>8} calls "
+            f"{p.wall:>10.4f} s wall {p.cpu:>10.4f} s cpu"
+        )
+    for child in profile.children.values():
+        _format(child, indent + "  ", lines)
@@ -0,0 +1,65 @@
+__all__ = ["Session"]
+
+
+class Session(object):
+    """
+    State of a single optimization run of a function.
+
+    Every run of ``_minimize``, ``_maximize`` and their asynchronous
+    counterparts works within its own session, so that the function itself
+    holds no per-run state: maximizing does not alter it, and runs of a
+    function in several threads do not share buffers. Scalar runs keep their
+    state locally.
+
+    Parameters
+    ----------
+    sign : float
+        ``+1`` to minimize and ``-1`` to maximize.
+    verbose : bool
+        ``True`` for verbose output; ``False`` otherwise.
+    observer : :class:`optimix._observer.Observer`, optional
+        Receiver of the optimization events.
+    depth : int
+        Number of most recent evaluated points kept in ``history``.
+    cancel : :class:`threading.Event`, optional
+        Set it to stop the run before its next evaluation.
+
+    Attributes
+    ----------
+    profile : :class:`optimix._profile.Profile`
+        Time spent per phase, or ``None`` if not requested.
+    history : :class:`optimix._history.History`
+        Points evaluated by the run.
+    flat_gradient : :class:`numpy.ndarray`
+        Gradient at the last evaluated point, unsigned.
+    flat_solution : :class:`numpy.ndarray`
+        Starting point handed to the backend.
+    blocks : tuple
+        Plan, flat gradient array and gradient blocks built upon them, or
+        ``None``.
+    """
+
+    def __init__(self, sign=+1.0, verbose=True, observer=None, depth=2, cancel=None):
+        from numpy import zeros
+
+        from ._history import History
+
+        self.sign = sign
+        self.verbose = verbose
+        self.observer = observer
+        self.cancel = cancel
+        self.profile = None
+        self.history = History(depth)
+        self.flat_gradient = zeros(1)
+        self.flat_solution = None
+        self.blocks = None
+
+    def check(self):
+        """
+        Raise :class:`optimix._exception.Cancelled` if the run has been
+        cancelled.
+        """
+        from ._exception import Cancelled
+
+        if self.cancel is not None and self.cancel.is_set():
+            raise Cancelled("The optimization has been cancelled.")
@@ -1,5 +1,182 @@
+from itertools import count as _count
+from weakref import ref as _ref
+
+from numpy import clip as _clip
+from numpy import ndarray
+from numpy import not_equal as _not_equal
+
 __all__ = ["Scalar", "Vector", "Matrix"]
 
+# Unlike ``ndl.__setitem__``, it does not call the listeners. Imported once, at
+# module level, as value assignment is on the hot path of model code.
+_setitem = ndarray.__setitem__
+
+# Source of version stamps. Drawing from it is atomic, so that concurrent
+# changes never share a stamp.
+_stamps = _count(1)
+
+
+class _Version(object):
+    """
+    Version of the layout of a set of variables.
+
+    Its stamp is replaced whenever one of the variables is fixed, unfixed, has
+    its bounds set or its storage replaced, or the set itself changes. Cached
+    optimization plans compare against it.
+    """
+
+    __slots__ = ["stamp", "__weakref__"]
+
+    def __init__(self):
+        self.stamp = next(_stamps)
+
+    def bump(self):
+        self.stamp = next(_stamps)
+
+
+def _own(owners, version):
+    """
+    Make ``version`` follow the changes recorded in the ``owners`` of a variable,
+    for as long as it is alive.
+    """
+    key = id(version)
+    if key not in owners:
+        owners[key] = _ref(version, lambda _: owners.pop(key, None))
+
+
+def _touch(var):
+    """
+    Record a change of the layout of ``var`` in the sets of variables holding it.
+    """
+    for r in list(var._owners.values()):
+        version = r()
+        if version is not None:
+            version.bump()
+
+
+def _notify(raw):
+    """
+    Call the listeners of an ``ndl`` array written to behind its back.
+    """
+    for k in raw._listeners:
+        cb = k()
+        if cb is not None:
+            cb()
+
+
+def _bound_listeners(raw):
+    """
+    Listeners of an ``ndl`` array that are bound methods.
+
+    Pickling and copying a variable carry them along, so that objects copied
+    together with it keep listening. Other kinds of listener are not kept.
+    """
+    from weakref import WeakMethod
+
+    listeners = []
+    for k in getattr(raw, "_listeners", []):
+        if isinstance(k, WeakMethod):
+            you = k()
+            if you is not None:
+                listeners.append(you)
+    return listeners
+
+
+def _assign(var, flat):
+    """
+    Write the flat float64 array ``flat``, of the right size, into ``var``.
+
+    It is the trusted path used by optimix internals: no conversion nor
+    validation takes place, and listeners are called once.
+    """
+    raw = var.raw
+    if raw.ndim == 0:
+        # Faster than broadcasting a ``(1,)`` array into a 0-d one, and Python
+        # floats are written faster than NumPy ones.
+        _setitem(raw, (), flat.item())
+    else:
+        if raw.ndim > 1:
+            flat = flat.reshape(raw.shape)
+        _setitem(raw, Ellipsis, flat)
+    if raw._listeners:
+        _notify(raw)
+
+
+def _differs(raw, flat):
+    """
+    Whether the flat float64 array ``flat`` differs from the values of ``raw``.
+    """
+    if raw.ndim == 0:
+        return raw.item() != flat[0]
+    return bool(_not_equal(raw.view(ndarray).reshape(-1), flat).any())
+
+
+def _scalar_bounds(lower, upper):
+    """
+    Validated scalar bounds, and whether any of them is finite.
+    """
+    lower, upper = float(lower), float(upper)
+    if lower > upper:
+        raise ValueError("The lower bound must not exceed the upper bound.")
+    return lower, upper, lower > -float("inf") or upper < float("inf")
+
+
+def _vector_bounds(lower, upper, shape):
+    """
+    Validated read-only bound arrays of the given shape, broadcast from scalars
+    or arrays, and whether any of them is finite.
+    """
+    from numpy import asarray, broadcast_to, isfinite
+
+    lower = broadcast_to(asarray(lower, float), shape).copy()
+    upper = broadcast_to(asarray(upper, float), shape).copy()
+    if (lower > upper).any():
+        raise ValueError("The lower bound must not exceed the upper bound.")
+    lower.flags.writeable = False
+    upper.flags.writeable = False
+    return lower, upper, bool(isfinite(lower).any() or isfinite(upper).any())
+
+
+def _split_bounds(v, size):
+    """
+    Lower and upper bounds of a vector of ``size`` entries from a sequence of
+    per-entry ``(lower, upper)`` pairs or from a ``(lower, upper)`` pair.
+
+    A ``(size, 2)`` input is read as per-entry pairs.
+    """
+    from numpy import asarray
+
+    try:
+        pairs = asarray(v, float)
+    except ValueError:
+        # Ragged, as a scalar bound paired with an array.
+        pairs = None
+    if pairs is not None and pairs.shape == (size, 2):
+        return pairs[:, 0], pairs[:, 1]
+    if len(v) == 2:
+        return v[0], v[1]
+    raise ValueError(
+        "Bounds must be per-entry (lower, upper) pairs or a (lower, upper) pair."
+    )
+
+
+def _rebind(var, raw):
+    """
+    Make ``raw`` the storage of ``var``, keeping its value and listeners.
+    """
+    from ndarray_listener import ndl
+    from numpy import asarray
+
+    raw = raw.reshape(var.raw.shape)
+    raw[...] = asarray(var.raw)
+    value = ndl(raw)
+    value._listeners = var.raw._listeners
+    var.raw = value
+    if not isinstance(var, Matrix):
+        var.__array_interface__ = value.__array_interface__
+        var.__array_struct__ = value.__array_struct__
+    _touch(var)
+
 
 class Scalar(object):
     """
@@ -17,17 +194,21 @@ class Scalar(object):
     __slots__ = [
         "raw",
         "_fixed",
-        "value",
         "__array_interface__",
         "__array_struct__",
         "_bounds",
+        "_bounded",
+        "_owners",
     ]
 
     def __init__(self, value):
         from ndarray_listener import ndl
         from numpy import float64, inf
 
+        # Versions of the sets of variables holding it, by identity.
+        self._owners = {}
         self._bounds = (-inf, +inf)
+        self._bounded = False
         self._fixed = False
         value = ndl(float64(value))
         self.raw = value
@@ -36,16 +217,66 @@ class Scalar(object):
 
     @property
     def bounds(self):
-        return self._bounds
+        """
+        Lower and upper bounds, as a tuple. Values assigned through ``value``
+        are clipped into them.
+        """
+        return (self.lower, self.upper)
 
     @bounds.setter
     def bounds(self, v):
-        self._bounds = v
+        lower, upper = v
+        self._set_bounds(lower, upper)
+
+    @property
+    def lower(self):
+        """
+        Lower bound.
+        """
+        return self._bounds[0]
+
+    @lower.setter
+    def lower(self, v):
+        self._set_bounds(v, self.upper)
+
+    @property
+    def upper(self):
+        """
+        Upper bound.
+        """
+        return self._bounds[1]
+
+    @upper.setter
+    def upper(self, v):
+        self._set_bounds(self.lower, v)
+
+    def _set_bounds(self, lower, upper):
+        lower, upper, self._bounded = _scalar_bounds(lower, upper)
+        self._bounds = (lower, upper)
+        _touch(self)
 
     def copy(self):
         """Return a copy."""
         return Scalar(self.raw)
 
+    def __getstate__(self):
+        from numpy import array
+
+        return {
+            "value": array(self.raw),
+            "bounds": self.bounds,
+            "fixed": self.isfixed,
+            "listeners": _bound_listeners(self.raw),
+        }
+
+    def __setstate__(self, state):
+        Scalar.__init__(self, state["value"])
+        self._set_bounds(*state["bounds"])
+        self._fixed = state["fixed"]
+        for you in state.get("listeners", []):
+            self.raw.talk_to(you)
+        _touch(self)
+
     @property
     def shape(self):
         """
@@ -87,12 +318,14 @@ class Scalar(object):
         Set it fixed.
         """
         self._fixed = True
+        _touch(self)
 
     def unfix(self):
         """
         Set it unfixed.
         """
         self._fixed = False
+        _touch(self)
 
     def listen(self, you):
         """
@@ -105,22 +338,26 @@ class Scalar(object):
         """
         self.raw.talk_to(you)
 
-    def __setattr__(self, name, value):
-        from numpy import float64, ndarray
+    @property
+    def value(self):
+        """
+        Value, as a zero-dimensional ``ndl``.
+        """
+        return self.raw
 
-        if name == "value":
-            if isinstance(value, ndarray):
-                value = value.flat[0]
-            else:
-                value = float64(value)
-            self.raw[()] = value
-        else:
-            Scalar.__dict__[name].__set__(self, value)
+    @value.setter
+    def value(self, value):
+        raw = self.raw
+        try:
+            _setitem(raw, (), value)
+        except (TypeError, ValueError):
+            from numpy import asarray
 
-    def __getattr__(self, name):
-        if name == "value":
-            name = "raw"
-        return Scalar.__dict__[name].__get__(self)
+            _setitem(raw, (), asarray(value, float).flat[0])
+        if self._bounded:
+            _clip(raw, self.lower, self.upper, out=raw)
+        if raw._listeners:
+            _notify(raw)
 
     def __str__(self):
         return "Scalar(" + str(self.raw) + ")"
@@ -165,29 +402,72 @@ class Vector(object):
         "_fixed",
         "__array_interface__",
         "__array_struct__",
-        "value",
-        "_bounds",
+        "_lower",
+        "_upper",
+        "_bounded",
+        "_owners",
     ]
 
     def __init__(self, value):
         from numpy import asarray, atleast_1d, inf
         from ndarray_listener import ndl
 
-        self._bounds = [(-inf, +inf)] * len(value)
+        # Versions of the sets of variables holding it, by identity.
+        self._owners = {}
         self._fixed = False
         value = asarray(value, float)
         value = ndl(atleast_1d(value).ravel())
         self.raw = value
         self.__array_interface__ = value.__array_interface__
         self.__array_struct__ = value.__array_struct__
+        self._lower, self._upper, self._bounded = _vector_bounds(
+            -inf, +inf, value.size
+        )
 
     @property
     def bounds(self):
-        return self._bounds
+        """
+        Per-entry ``(lower, upper)`` pairs, as a list.
+
+        It can be set to such a sequence of pairs or to a ``(lower, upper)``
+        pair of scalars or arrays, which are broadcast. Inputs shaped
+        ``(size, 2)`` are read as per-entry pairs; set ``lower`` and ``upper``
+        to give two-entry bound arrays instead. Values assigned through
+        ``value`` are clipped into the bounds.
+        """
+        return list(zip(self.lower.tolist(), self.upper.tolist()))
 
     @bounds.setter
     def bounds(self, v):
-        self._bounds = v
+        lower, upper = _split_bounds(v, self.raw.size)
+        self._set_bounds(lower, upper)
+
+    @property
+    def lower(self):
+        """
+        Lower bounds, as a read-only array.
+        """
+        return self._lower
+
+    @lower.setter
+    def lower(self, v):
+        self._set_bounds(v, self.upper)
+
+    @property
+    def upper(self):
+        """
+        Upper bounds, as a read-only array.
+        """
+        return self._upper
+
+    @upper.setter
+    def upper(self, v):
+        self._set_bounds(self.lower, v)
+
+    def _set_bounds(self, lower, upper):
+        bounds = _vector_bounds(lower, upper, self.raw.size)
+        self._lower, self._upper, self._bounded = bounds
+        _touch(self)
 
     def copy(self):
         """
@@ -195,6 +475,28 @@ class Vector(object):
         """
         return Vector(self.raw)
 
+    def __getstate__(self):
+        from numpy import array
+
+        return {
+            "value": array(self.raw),
+            "lower": array(self.lower),
+            "upper": array(self.upper),
+            "fixed": self.isfixed,
+            "listeners": _bound_listeners(self.raw),
+        }
+
+    def __setstate__(self, state):
+        Vector.__init__(self, state["value"])
+        if "lower" in state:
+            self._set_bounds(state["lower"], state["upper"])
+        else:
+            self.bounds = state["bounds"]
+        self._fixed = state["fixed"]
+        for you in state.get("listeners", []):
+            self.raw.talk_to(you)
+        _touch(self)
+
     @property
     def shape(self):
         """
@@ -236,12 +538,14 @@ class Vector(object):
         Set it fixed.
         """
         self._fixed = True
+        _touch(self)
 
     def unfix(self):
         """
         Set it unfixed.
         """
         self._fixed = False
+        _touch(self)
 
     def listen(self, you):
         """
@@ -254,20 +558,26 @@ class Vector(object):
         """
         self.raw.talk_to(you)
 
-    def __setattr__(self, name, value):
-        from numpy import asarray, atleast_1d
+    @property
+    def value(self):
+        """
+        Values, as a one-dimensional ``ndl``.
+        """
+        return self.raw
 
-        if name == "value":
-            value = asarray(value)
-            value = atleast_1d(value).ravel()
-            self.raw[:] = value
-        else:
-            Vector.__dict__[name].__set__(self, value)
+    @value.setter
+    def value(self, value):
+        raw = self.raw
+        try:
+            _setitem(raw, Ellipsis, value)
+        except ValueError:
+            from numpy import asarray
 
-    def __getattr__(self, name):
-        if name == "value":
-            name = "raw"
-        return Vector.__dict__[name].__get__(self)
+            _setitem(raw, Ellipsis, asarray(value).ravel())
+        if self._bounded:
+            _clip(raw, self.lower, self.upper, out=raw)
+        if raw._listeners:
+            _notify(raw)
 
     def __str__(self):
         return "Vector(" + str(self.raw) + ")"
@@ -295,47 +605,306 @@ class Vector(object):
 
 
 class Matrix(object):
-    __slots__ = ["raw", "_fixed"]
+    """
+    Matrix variable type.
+
+    It holds a two-dimensional array of 64-bits floating point values, stored
+    via an ``ndl``, with per-entry bounds. Gradients with respect to it are
+    given as blocks of its shape.
+
+    Structured matrices, created by :meth:`cholesky`, :meth:`symmetric` and
+    :meth:`lowrank`, store only their free parameters in ``raw``; the
+    optimizer moves and bounds those parameters, while ``value`` assembles the
+    dense (read-only) matrix and gradient blocks with respect to it are pulled
+    back to the parameters.
+
+    Parameters
+    ----------
+    value : array_like
+        Initial value, of two dimensions.
+    """
+
+    __slots__ = [
+        "raw",
+        "_fixed",
+        "_lower",
+        "_upper",
+        "_bounded",
+        "_param",
+        "_cache",
+        "_owners",
+    ]
 
     def __init__(self, value):
+        from numpy import asarray
+
+        value_ = asarray(value, float)
+        if value_.ndim != 2:
+            raise ValueError("A matrix must have two dimensions.")
+        self._init(value_, None)
+        if hasattr(value, "_listeners"):
+            self.raw._listeners = value._listeners
+
+    def _init(self, raw, param):
+        from ndarray_listener import ndl
+        from numpy import inf
+
+        self._owners = {}
         self._fixed = False
-        self.raw = value
+        self._param = param
+        self._cache = None
+        self.raw = ndl(raw)
+        self._lower, self._upper, self._bounded = _vector_bounds(
+            -inf, +inf, raw.shape
+        )
+
+    @classmethod
+    def cholesky(cls, factor):
+        """
+        Positive semi-definite matrix ``L Lᵀ`` parametrized by the lower
+        triangle of ``factor``.
+        """
+        from numpy import asarray
+
+        from ._parametrization import Cholesky
+
+        factor = asarray(factor, float)
+        param = Cholesky(factor.shape[0])
+        return cls._structured(param.from_factor(factor), param)
+
+    @classmethod
+    def symmetric(cls, value):
+        """
+        Symmetric matrix parametrized by the lower triangle of ``value``.
+        """
+        from numpy import asarray
+
+        from ._parametrization import Symmetric
+
+        value = asarray(value, float)
+        param = Symmetric(value.shape[0])
+        return cls._structured(param.params(value), param)
+
+    @classmethod
+    def lowrank(cls, factor):
+        """
+        Positive semi-definite matrix ``W Wᵀ`` parametrized by the ``n``-by-rank
+        ``factor`` ``W``.
+        """
+        from numpy import array
+
+        from ._parametrization import LowRank
+
+        factor = array(factor, float)
+        param = LowRank(*factor.shape)
+        return cls._structured(factor, param)
+
+    @classmethod
+    def _structured(cls, params, param):
+        var = cls.__new__(cls)
+        var._init(params, param)
+        return var
+
+    @property
+    def parametrization(self):
+        """
+        Parametrization of a structured matrix, ``None`` for a dense one.
+        """
+        return self._param
+
+    @property
+    def factor(self):
+        """
+        Factor of a Cholesky or low-rank matrix.
+        """
+        from numpy import asarray
+
+        return self._param.factor(asarray(self.raw))
+
+    @property
+    def bounds(self):
+        """
+        Lower and upper bounds, as a tuple of read-only arrays shaped as ``raw``.
+
+        It can be set to a ``(lower, upper)`` tuple of scalars or arrays, which
+        are broadcast. Values assigned through ``value`` are clipped into them.
+        """
+        return (self.lower, self.upper)
+
+    @bounds.setter
+    def bounds(self, v):
+        lower, upper = v
+        self._set_bounds(lower, upper)
+
+    @property
+    def lower(self):
+        """
+        Lower bounds, as a read-only array.
+        """
+        return self._lower
+
+    @lower.setter
+    def lower(self, v):
+        self._set_bounds(v, self.upper)
+
+    @property
+    def upper(self):
+        """
+        Upper bounds, as a read-only array.
+        """
+        return self._upper
+
+    @upper.setter
+    def upper(self, v):
+        self._set_bounds(self.lower, v)
+
+    def _set_bounds(self, lower, upper):
+        bounds = _vector_bounds(lower, upper, self.raw.shape)
+        self._lower, self._upper, self._bounded = bounds
+        _touch(self)
+
+    @property
+    def shape(self):
+        """
+        Shape of the matrix.
+        """
+        if self._param is None:
+            return self.raw.shape
+        return self._param.shape
+
+    @property
+    def ndim(self):
+        """
+        Number of dimensions.
+        """
+        return 2
 
     @property
     def size(self):
+        """
+        Number of free parameters.
+        """
         return self.raw.size
 
     def asarray(self):
-        from numpy import asarray
+        """
+        Return a :class:`numpy.ndarray` representation.
+        """
+        from numpy import array
+
+        return array(self.value)
+
+    def copy(self):
+        """
+        Return a copy.
+        """
+        from numpy import array
 
-        return asarray([self.raw])
+        return Matrix._structured(array(self.raw), self._param)
 
     @property
     def isfixed(self):
+        """
+        Return whether it is fixed or not.
+        """
         return self._fixed
 
     def fix(self):
+        """
+        Set it fixed.
+        """
         self._fixed = True
+        _touch(self)
 
     def unfix(self):
+        """
+        Set it unfixed.
+        """
         self._fixed = False
+        _touch(self)
+
+    @property
+    def value(self):
+        """
+        Matrix, as a two-dimensional array.
+
+        It is ``raw`` itself for a dense matrix and a read-only array,
+        recomputed when the parameters change, for a structured one.
+        """
+        param = self._param
+        if param is None:
+            return self.raw
+
+        from numpy import array, array_equal, asarray
 
-    def __setattr__(self, name, value):
-        if name == "value":
-            Matrix.__dict__["raw"].__set__(self, value)
+        cache = self._cache
+        if cache is None or not array_equal(cache[0], self.raw):
+            dense = param.dense(asarray(self.raw))
+            dense.flags.writeable = False
+            cache = (array(self.raw), dense)
+            self._cache = cache
+        return cache[1]
+
+    @value.setter
+    def value(self, value):
+        raw = self.raw
+        if self._param is None:
+            _setitem(raw, Ellipsis, value)
         else:
-            Matrix.__dict__[name].__set__(self, value)
+            from numpy import asarray
+
+            _setitem(raw, Ellipsis, self._param.params(asarray(value, float)))
+        if self._bounded:
+            _clip(raw, self.lower, self.upper, out=raw)
+        if raw._listeners:
+            _notify(raw)
 
-    def __getattr__(self, name):
-        if name == "value":
-            name = "raw"
-        return Matrix.__dict__[name].__get__(self)
+    def _pullback(self, grad):
+        """
+        Gradient with respect to ``raw`` from a gradient block with respect to
+        the matrix.
+        """
+        from numpy import asarray
+
+        grad = asarray(grad, float)
+        if self._param is None:
+            return grad
+        return self._param.pullback(asarray(self.raw), grad)
 
     def listen(self, you):
+        """
+        Request a callback for value modification.
+
+        Parameters
+        ----------
+        you : object
+            An instance having ``__call__`` attribute.
+        """
         self.raw.talk_to(you)
 
+    def __getstate__(self):
+        from numpy import array
+
+        return {
+            "value": array(self.raw),
+            "param": self._param,
+            "lower": array(self.lower),
+            "upper": array(self.upper),
+            "fixed": self._fixed,
+            "listeners": _bound_listeners(self.raw),
+        }
+
+    def __setstate__(self, state):
+        self._init(state["value"], state.get("param"))
+        if "lower" in state:
+            self._set_bounds(state["lower"], state["upper"])
+        self._fixed = state["fixed"]
+        for you in state["listeners"]:
+            self.raw.talk_to(you)
+        _touch(self)
+
     def __str__(self):
-        return "Matrix(" + str(self.raw) + ")"
+        return "Matrix(" + str(self.value) + ")"
 
     def __repr__(self):
-        return repr(self.raw)
+        return repr(self.value)
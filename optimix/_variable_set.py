@@ -0,0 +1,484 @@
+from . import _types
+from ._types import Scalar, Vector, _Version, _notify, _own, _scalar_bounds
+from ._types import _setitem, _touch, _vector_bounds
+from ._variables import Variables, _Layout, _LockCell, _lock_of
+
+__all__ = ["VariableSet"]
+
+
+class VariableSet(object):
+    """
+    Compact set of scalar and vector variables.
+
+    Values are stored in a single ``float64`` array, ordered by variable name,
+    together with lower and upper bound arrays of the same size, a boolean
+    array flagging the fixed variables, and the start and stop offsets of each
+    variable. No Python object is kept per variable: indexing the set by name
+    returns a :class:`Scalar` or :class:`Vector` view of its entries, created on
+    demand, which supports the usual API (``value``, ``bounds``, ``fix``,
+    ``listen``, ...).
+
+    It can be used wherever :class:`optimix._variables.Variables` is, and its
+    optimization plans are built with array operations only. Listeners are
+    shared by the whole set: a listener is called whenever any value changes.
+    Variables cannot be added nor removed after construction.
+
+    Parameters
+    ----------
+    variables : dict, optional
+        Map of variable name to its initial value: a float for a scalar, an
+        array-like for a vector, or an existing :class:`Scalar` or
+        :class:`Vector` whose value, bounds and fixed flag are copied.
+    """
+
+    def __init__(self, variables=None):
+        from ndarray_listener import ndl
+        from numpy import asarray, concatenate, empty, flatnonzero, full, inf
+        from numpy import int64, zeros
+
+        variables = {} if variables is None else variables
+        names = sorted(variables)
+        given = [variables[name] for name in names]
+        typed = [isinstance(v, (Scalar, Vector)) for v in given]
+        arrays = [asarray(v.raw if t else v, float) for v, t in zip(given, typed)]
+
+        ndims = asarray([a.ndim for a in arrays], int64)
+        sizes = asarray([a.size for a in arrays], int64)
+        stops = sizes.cumsum()
+
+        store = _Store()
+        store.names = empty(len(names), object)
+        store.names[:] = names
+        store.starts = stops - sizes
+        store.stops = stops
+        store.ndims = ndims
+        store.fixed = zeros(len(names), bool)
+        store.position = {name: i for i, name in enumerate(names)}
+        if len(arrays) > 0:
+            store.values = ndl(concatenate([a.ravel() for a in arrays]))
+        else:
+            store.values = ndl(empty(0))
+        store.lower = full(len(store.values), -inf)
+        store.upper = full(len(store.values), +inf)
+        store.bounded = zeros(len(names), bool)
+
+        for i in flatnonzero(typed).tolist():
+            start, stop = store.starts[i], store.stops[i]
+            store.lower[start:stop] = given[i].lower
+            store.upper[start:stop] = given[i].upper
+            store.bounded[i] = given[i]._bounded
+            store.fixed[i] = given[i].isfixed
+
+        self._bind(store, None)
+
+    def _bind(self, store, vars):
+        """
+        Make it the subset ``vars`` (all variables if ``None``) of ``store``.
+        """
+        from numpy import zeros
+
+        self._store = store
+        self._vars = vars
+        self._member = None
+        if vars is not None:
+            self._member = zeros(len(store.names), bool)
+            self._member[vars] = True
+        self._plan = None
+        self._layout = None
+
+    def _positions(self):
+        from numpy import arange
+
+        if self._vars is None:
+            return arange(len(self._store.names))
+        return self._vars
+
+    def names(self):
+        """
+        Return the variable names.
+        """
+        return self._store.names[self._positions()].tolist()
+
+    def __len__(self):
+        return len(self._positions())
+
+    def __contains__(self, name):
+        i = self._store.position.get(name)
+        if i is None:
+            return False
+        return self._vars is None or bool(self._member[i])
+
+    def __iter__(self):
+        return iter(self.names())
+
+    def __getitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        return self._store.view(self._store.position[name])
+
+    def __setitem__(self, name, value):
+        raise TypeError("Variables cannot be added to a 'VariableSet'.")
+
+    def get(self, name, default=None):
+        if name not in self:
+            return default
+        return self[name]
+
+    def values(self):
+        """
+        Return views of the variables.
+        """
+        return [self._store.view(i) for i in self._positions().tolist()]
+
+    def items(self):
+        """
+        Return ``(name, view)`` pairs.
+        """
+        return list(zip(self.names(), self.values()))
+
+    @staticmethod
+    def keys():
+        msg = "'VariableSet' object has no attribute 'keys'. "
+        msg += "You might want to use attribute 'names' instead."
+        raise AttributeError(msg)
+
+    def select(self, fixed):
+        """
+        Return the subset of variables according to ``fixed``.
+
+        The subset shares the storage of this set.
+        """
+        pos = self._positions()
+        subset = VariableSet.__new__(VariableSet)
+        subset._bind(self._store, pos[self._store.fixed[pos] == fixed])
+        return subset
+
+    @property
+    def lock(self):
+        """
+        Re-entrant lock guarding writes to the variable values, shared by the
+        subsets of this set.
+
+        See :attr:`optimix._variables.Variables.lock`.
+        """
+        return _lock_of(self)
+
+    @property
+    def _lock(self):
+        cell = getattr(self._store, "lock", None)
+        if cell is None:
+            cell = self._store.lock = _LockCell()
+        return cell
+
+    @property
+    def buffer(self):
+        """
+        Array holding the values of all the variables of the set.
+        """
+        return self._store.values
+
+    def pack(self):
+        """
+        Do nothing: the variables are already stored contiguously.
+        """
+
+    def _flat_layout(self):
+        if self._layout is None:
+            s = self._store
+            pos = self._positions().tolist()
+            offsets = {s.names[i]: (int(s.starts[i]), int(s.stops[i])) for i in pos}
+            self._layout = _Layout(s.values, offsets, s.version.stamp)
+        return self._layout
+
+    def _stamp(self):
+        """
+        Stamp of the current layout of the store, shared with the subsets.
+
+        See :meth:`optimix._variables.Variables._stamp`.
+        """
+        return self._store.version.stamp
+
+    def plan(self):
+        """
+        Return the cached optimization plan of the unfixed variables.
+
+        See :meth:`optimix._variables.Variables.plan`.
+        """
+        plan = self._plan
+        if plan is None or plan.version != self._stamp():
+            plan = _SetPlan(self)
+            self._plan = plan
+        return plan
+
+    def __getstate__(self):
+        from numpy import asarray
+
+        s = self._store
+        return {
+            "names": s.names.tolist(),
+            "starts": s.starts,
+            "stops": s.stops,
+            "ndims": s.ndims,
+            "fixed": s.fixed,
+            "values": asarray(s.values).copy(),
+            "lower": s.lower,
+            "upper": s.upper,
+            "bounded": s.bounded,
+            "vars": self._vars,
+            "listeners": _types._bound_listeners(s.values),
+            "lock": self._lock,
+        }
+
+    def __setstate__(self, state):
+        from ndarray_listener import ndl
+        from numpy import empty
+
+        store = _Store()
+        store.names = empty(len(state["names"]), object)
+        store.names[:] = state["names"]
+        store.starts = state["starts"]
+        store.stops = state["stops"]
+        store.ndims = state["ndims"]
+        store.fixed = state["fixed"]
+        store.position = {name: i for i, name in enumerate(state["names"])}
+        store.values = ndl(state["values"])
+        store.lower = state["lower"]
+        store.upper = state["upper"]
+        store.bounded = state["bounded"]
+        store.lock = state.get("lock")
+        for you in state["listeners"]:
+            store.values.talk_to(you)
+
+        self._bind(store, state["vars"])
+
+    to_bytes = Variables.to_bytes
+    load_bytes = Variables.load_bytes
+    set = Variables.set
+
+    def __str__(self):
+        return Variables.__str__(self).replace("Variables(", "VariableSet(", 1)
+
+    def __repr__(self):
+        return str(self)
+
+
+class _Store(object):
+    """
+    Arrays shared by a :class:`VariableSet` and its subsets and views.
+    """
+
+    def __init__(self):
+        # Versions following the changes of any view: that of the store and
+        # those of the sets of variables holding views.
+        self.owners = {}
+        self.version = _Version()
+        _own(self.owners, self.version)
+
+    def view(self, i):
+        if self.ndims[i] == 0:
+            return _ScalarView(self, i)
+        return _VectorView(self, i)
+
+
+class _View(object):
+    __slots__ = ()
+
+    def _init(self, store, i):
+        self._store = store
+        self._i = i
+        raw = store.values[store.starts[i] : store.stops[i]]
+        if store.ndims[i] == 0:
+            raw = raw.reshape(())
+        self.raw = raw
+        self.__array_interface__ = raw.__array_interface__
+        self.__array_struct__ = raw.__array_struct__
+
+    @property
+    def isfixed(self):
+        """
+        Return whether it is fixed or not.
+        """
+        return bool(self._store.fixed[self._i])
+
+    @property
+    def _owners(self):
+        return self._store.owners
+
+    def fix(self):
+        """
+        Set it fixed.
+        """
+        self._store.fixed[self._i] = True
+        _touch(self)
+
+    def unfix(self):
+        """
+        Set it unfixed.
+        """
+        self._store.fixed[self._i] = False
+        _touch(self)
+
+    @property
+    def _bounded(self):
+        return bool(self._store.bounded[self._i])
+
+    def __reduce__(self):
+        # Copies are standalone variables.
+        return (_detached, (self._base, self.__getstate__()))
+
+
+class _ScalarView(_View, Scalar):
+    """
+    :class:`Scalar` whose value, bounds and fixed flag live in a
+    :class:`VariableSet`.
+    """
+
+    __slots__ = ["_store", "_i"]
+    _base = Scalar
+
+    def __init__(self, store, i):
+        self._init(store, i)
+
+    @property
+    def lower(self):
+        return float(self._store.lower[self._store.starts[self._i]])
+
+    @lower.setter
+    def lower(self, v):
+        self._set_bounds(v, self.upper)
+
+    @property
+    def upper(self):
+        return float(self._store.upper[self._store.starts[self._i]])
+
+    @upper.setter
+    def upper(self, v):
+        self._set_bounds(self.lower, v)
+
+    def _set_bounds(self, lower, upper):
+        s, i = self._store, self._i
+        s.lower[s.starts[i]], s.upper[s.starts[i]], s.bounded[i] = _scalar_bounds(
+            lower, upper
+        )
+        _touch(self)
+
+
+class _VectorView(_View, Vector):
+    """
+    :class:`Vector` whose values, bounds and fixed flag live in a
+    :class:`VariableSet`.
+    """
+
+    __slots__ = ["_store", "_i"]
+    _base = Vector
+
+    def __init__(self, store, i):
+        self._init(store, i)
+
+    def _span(self, arr):
+        s, i = self._store, self._i
+        span = arr[s.starts[i] : s.stops[i]]
+        span.flags.writeable = False
+        return span
+
+    @property
+    def lower(self):
+        return self._span(self._store.lower)
+
+    @lower.setter
+    def lower(self, v):
+        self._set_bounds(v, self.upper)
+
+    @property
+    def upper(self):
+        return self._span(self._store.upper)
+
+    @upper.setter
+    def upper(self, v):
+        self._set_bounds(self.lower, v)
+
+    def _set_bounds(self, lower, upper):
+        s, i = self._store, self._i
+        lower, upper, s.bounded[i] = _vector_bounds(lower, upper, self.raw.size)
+        s.lower[s.starts[i] : s.stops[i]] = lower
+        s.upper[s.starts[i] : s.stops[i]] = upper
+        _touch(self)
+
+
+def _detached(cls, state):
+    var = cls.__new__(cls)
+    var.__setstate__(state)
+    return var
+
+
+class _SetPlan(object):
+    """
+    Optimization plan of a :class:`VariableSet`, built with array operations.
+
+    It has the attributes and methods of :class:`optimix._variables._Plan`.
+    """
+
+    def __init__(self, variables):
+        from numpy import arange, asarray, concatenate, int64, repeat
+
+        s = variables._store
+        self.version = s.version.stamp
+        pos = variables._positions()
+        pos = pos[~s.fixed[pos]]
+        self._store = s
+        self._pos = pos
+
+        self.names = tuple(s.names[pos].tolist())
+        self.sizes = (s.stops[pos] - s.starts[pos]).astype(int64)
+        self.offsets = concatenate([[0], self.sizes.cumsum()]).astype(int64)
+        self.size = int(self.offsets[-1])
+
+        starts = s.starts[pos]
+        index = repeat(starts - self.offsets[:-1], self.sizes) + arange(self.size)
+        if self.size > 0 and (index == index[0] + arange(self.size)).all():
+            index = slice(int(index[0]), int(index[0]) + self.size)
+        elif self.size == 0:
+            index = slice(0, 0)
+        self.index = index
+        self.buffer = s.values
+        self.lower = asarray(s.lower[index], float).copy()
+        self.upper = asarray(s.upper[index], float).copy()
+        self._spans = None
+
+    @property
+    def spans(self):
+        if self._spans is None:
+            offsets = self.offsets.tolist()
+            self._spans = [
+                (n, offsets[i], offsets[i + 1]) for i, n in enumerate(self.names)
+            ]
+        return self._spans
+
+    @property
+    def variables(self):
+        return [self._store.view(i) for i in self._pos.tolist()]
+
+    def gather(self, out):
+        """
+        Copy the values of the unfixed variables into the flat array ``out``.
+        """
+        out[:] = self.buffer[self.index]
+        return out
+
+    def scatter(self, flat_arr):
+        """
+        Write the flat array into the values of the unfixed variables.
+        """
+        _setitem(self.buffer, self.index, flat_arr)
+        if self.buffer._listeners:
+            _notify(self.buffer)
+
+    def pack(self, arrs, out):
+        """
+        Pack the arrays mapped by variable name into ``out``.
+        """
+        from numpy import asarray
+
+        for name, start, stop in self.spans:
+            out[start:stop] = asarray(arrs[name]).ravel()
+        return out
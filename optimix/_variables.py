@@ -1,11 +1,294 @@
+from threading import Lock
+
+from ._types import _Version, _assign, _differs, _notify, _own, _rebind
+
 __all__ = ["Variables"]
 
+# Held while creating or linking the locks of sets of variables, and while
+# creating their versions.
+_creating = Lock()
+
+# Binary snapshot header and variable kinds (see `Variables.to_bytes`).
+_MAGIC = b"OPTX"
+_FORMAT = 2
+_SCALAR = 0
+_VECTOR = 1
+_MATRIX = 2
+# Structured matrices, by parametrization name.
+_STRUCTURED = {"cholesky": 3, "symmetric": 4, "lowrank": 5}
+
 
 class Variables(dict):
     """
     Set of variables.
     """
 
+    def __init__(self, *args, **kwargs):
+        super(Variables, self).__init__(*args, **kwargs)
+        self._layout = None
+        self._plan = None
+        self._lock = _LockCell()
+        # Created on first use, so that short-lived sets of variables are not
+        # registered with their variables.
+        self._version = None
+
+    def __setitem__(self, name, value):
+        super(Variables, self).__setitem__(name, value)
+        version = self._version
+        if version is not None:
+            owners = getattr(value, "_owners", None)
+            if owners is not None:
+                _own(owners, version)
+            version.bump()
+
+    def __delitem__(self, name):
+        super(Variables, self).__delitem__(name)
+        if self._version is not None:
+            self._version.bump()
+
+    def _stamp(self):
+        """
+        Stamp of the current layout of the variables.
+
+        It changes whenever one of them is fixed, unfixed, has its bounds set or
+        its storage replaced, or a variable is added or removed; changes to
+        unrelated variables leave it alone.
+        """
+        version = self._version
+        if version is None:
+            with _creating:
+                if self._version is None:
+                    version = _Version()
+                    for var in self.values():
+                        owners = getattr(var, "_owners", None)
+                        if owners is not None:
+                            _own(owners, version)
+                    self._version = version
+                version = self._version
+        return version.stamp
+
+    def __reduce__(self):
+        packed = self._flat_layout() is not None
+        state = {"packed": packed, "lock": self._lock}
+        return (Variables, (dict(self),), state)
+
+    def __setstate__(self, state):
+        # Copies of merged sets share a lock again, but not with the originals.
+        self._lock = state.get("lock", self._lock)
+        if state["packed"]:
+            self.pack()
+
+    def to_bytes(self):
+        """
+        Compact binary snapshot of names, values, bounds and fixed flags.
+
+        Returns
+        -------
+        bytes
+            Snapshot to be loaded by :meth:`from_bytes`.
+        """
+        from struct import pack
+
+        from numpy import asarray
+
+        from ._types import Matrix, Scalar
+
+        names = self.names()
+        chunks = [pack("<4sBI", _MAGIC, _FORMAT, len(names))]
+        for name in names:
+            var = self[name]
+            value = asarray(var.raw, "<f8")
+            kind = _SCALAR if isinstance(var, Scalar) else _VECTOR
+            if isinstance(var, Matrix):
+                kind = _MATRIX
+                if var.parametrization is not None:
+                    kind = _STRUCTURED[var.parametrization.name]
+            encoded = name.encode()
+            chunks.append(pack("<H", len(encoded)))
+            chunks.append(encoded)
+            chunks.append(pack("<BBB", kind, var.isfixed, value.ndim))
+            chunks.append(pack(f"<{value.ndim}Q", *value.shape))
+            chunks.append(value.tobytes())
+            chunks.append(asarray(var.lower, "<f8").tobytes())
+            chunks.append(asarray(var.upper, "<f8").tobytes())
+        return b"".join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Create variables from a snapshot made by :meth:`to_bytes`.
+
+        Parameters
+        ----------
+        data : bytes
+            Binary snapshot.
+
+        Returns
+        -------
+        :class:`Variables`
+            New set of variables.
+        """
+        from struct import calcsize, unpack_from
+
+        from numpy import frombuffer
+
+        from ._parametrization import Cholesky, LowRank, Symmetric
+        from ._types import Matrix, Scalar, Vector
+
+        structures = {
+            _STRUCTURED[p.name]: p for p in [Cholesky, LowRank, Symmetric]
+        }
+        magic, version, count = unpack_from("<4sBI", data)
+        # Matrices of the first format version carry no bounds.
+        if magic != _MAGIC or version not in (1, _FORMAT):
+            raise ValueError("Unrecognized variables snapshot.")
+
+        offset = calcsize("<4sBI")
+        variables = cls()
+        for _ in range(count):
+            (size,) = unpack_from("<H", data, offset)
+            offset += 2
+            name = bytes(data[offset : offset + size]).decode()
+            offset += size
+            kind, fixed, ndim = unpack_from("<BBB", data, offset)
+            offset += 3
+            shape = unpack_from(f"<{ndim}Q", data, offset)
+            offset += 8 * ndim
+
+            n = 1
+            for s in shape:
+                n *= s
+            value = frombuffer(data, "<f8", n, offset).reshape(shape)
+            offset += 8 * n
+
+            if kind == _MATRIX:
+                var = Matrix(value.copy())
+            elif kind in structures:
+                param = structures[kind].from_raw_shape(shape)
+                var = Matrix._structured(value.copy(), param)
+            elif kind == _SCALAR:
+                var = Scalar(value)
+            else:
+                var = Vector(value)
+
+            if kind != _MATRIX or version > 1:
+                lower = frombuffer(data, "<f8", n, offset).reshape(shape)
+                upper = frombuffer(data, "<f8", n, offset + 8 * n).reshape(shape)
+                offset += 16 * n
+                var._set_bounds(lower, upper)
+
+            if fixed:
+                var.fix()
+            dict.__setitem__(variables, name, var)
+
+        return variables
+
+    def load_bytes(self, data):
+        """
+        Restore values, bounds and fixed flags from a :meth:`to_bytes` snapshot.
+
+        Variables are matched by name and keep their identity and listeners.
+
+        Parameters
+        ----------
+        data : bytes
+            Binary snapshot.
+        """
+        snapshot = Variables.from_bytes(data)
+        for name in snapshot.names():
+            var = self[name]
+            saved = snapshot[name]
+            var.raw[...] = saved.raw
+            var._set_bounds(saved.lower, saved.upper)
+            if saved.isfixed:
+                var.fix()
+            else:
+                var.unfix()
+
+    def pack(self):
+        """
+        Store the values of all variables in one contiguous ``float64`` buffer,
+        ordered by variable name.
+
+        Each variable keeps its identity and listeners but its ``raw`` array
+        becomes a view into the buffer, so the optimizer can move the whole
+        parameter vector with a single assignment.
+        """
+        from numpy import empty
+
+        from ._types import Matrix, Scalar, Vector
+        from ._variable_set import _View
+
+        # Views already live in the storage of a `VariableSet`.
+        kinds = (Scalar, Vector, Matrix)
+        names = [
+            n
+            for n in self.names()
+            if isinstance(self[n], kinds) and not isinstance(self[n], _View)
+        ]
+        offsets = {}
+        size = 0
+        for name in names:
+            offsets[name] = (size, size + self[name].size)
+            size += self[name].size
+
+        buffer = empty(size)
+        for name in names:
+            start, stop = offsets[name]
+            _rebind(self[name], buffer[start:stop])
+
+        self._layout = _Layout(buffer, offsets, self._stamp())
+
+    @property
+    def buffer(self):
+        """
+        Contiguous buffer backing the variables, or ``None`` if not packed.
+        """
+        layout = self._flat_layout()
+        if layout is None:
+            return None
+        return layout.buffer
+
+    def _flat_layout(self):
+        layout = self._layout
+        if layout is None:
+            return layout
+        stamp = self._stamp()
+        if layout.version == stamp:
+            return layout
+        if layout.isvalid(self):
+            layout.version = stamp
+            return layout
+        self._layout = None
+        return None
+
+    @property
+    def lock(self):
+        """
+        Re-entrant lock guarding writes to the variable values.
+
+        Optimizations hold it while they write a point into the variables and
+        evaluate the function there, so that threads sharing the variables do
+        not interleave. Hold it to write values, or to read a consistent set of
+        them, while an optimization may run in another thread. Sets merged by
+        :func:`merge_variables` share it with their parts.
+        """
+        return _lock_of(self)
+
+    def plan(self):
+        """
+        Return the cached optimization plan of the unfixed variables.
+
+        The plan holds their names, flat offsets, sizes and lower/upper bound
+        arrays. It is rebuilt only after a variable is fixed, unfixed, has its
+        bounds reassigned or is replaced.
+        """
+        plan = self._plan
+        if plan is None or plan.version != self._stamp():
+            plan = _Plan(self)
+            self._plan = plan
+        return plan
+
     def set(self, x):
         """
         Set variable values via a dictionary mapping name to value.
@@ -57,9 +340,22 @@ class Variables(dict):
         return str(self)
 
 
-def merge_variables(variables_dict):
+def merge_variables(variables_dict, contiguous=False):
+    """
+    Merge sets of variables, prefixing their names with the dictionary keys.
+
+    Parameters
+    ----------
+    variables_dict : dict
+        Map of prefix to :class:`Variables`.
+    contiguous : bool
+        ``True`` to back the merged variables by a single contiguous buffer
+        (see :meth:`Variables.pack`); ``False`` otherwise.
+    """
     variables = Variables()
 
+    _share_lock([variables] + list(variables_dict.values()))
+
     for (prefix, vs) in iter(variables_dict.items()):
         for (name, value) in iter(vs.items()):
             if len(prefix) == 0:
@@ -68,4 +364,207 @@ def merge_variables(variables_dict):
                 dot = "."
             variables[prefix + dot + name] = value
 
+    if contiguous:
+        variables.pack()
+
     return variables
+
+
+class _LockCell(object):
+    """
+    Holder of the lock of a set of variables, possibly forwarding to the cell
+    of a set it has been merged into.
+    """
+
+    __slots__ = ["parent", "lock"]
+
+    def __init__(self):
+        self.parent = None
+        self.lock = None
+
+    def __getstate__(self):
+        # Locks are not copied.
+        return (self.parent,)
+
+    def __setstate__(self, state):
+        self.parent = state[0]
+        self.lock = None
+
+    def root(self):
+        cell = self
+        while cell.parent is not None:
+            # Path halving, so that deep compositions stay shallow.
+            if cell.parent.parent is not None:
+                cell.parent = cell.parent.parent
+            cell = cell.parent
+        return cell
+
+
+def _lock_of(variables):
+    """
+    Lock of a set of variables, created on first use.
+    """
+    from threading import RLock
+
+    with _creating:
+        cell = variables._lock.root()
+        if cell.lock is None:
+            cell.lock = RLock()
+        return cell.lock
+
+
+def _share_lock(parts):
+    """
+    Make the sets of variables ``parts`` use the same lock.
+
+    Sets whose lock is already in use keep it, unless it is the only one.
+    """
+    with _creating:
+        roots = {}
+        for vs in parts:
+            cell = vs._lock.root()
+            roots.setdefault(id(cell), cell)
+        roots = list(roots.values())
+        used = [cell for cell in roots if cell.lock is not None]
+        target = used[0] if len(used) > 0 else roots[0]
+        for cell in roots:
+            if cell.lock is None and cell is not target:
+                cell.parent = target
+
+
+class _Layout(object):
+    """
+    Offsets of packed variables into their shared buffer.
+    """
+
+    def __init__(self, buffer, offsets, version):
+        self.buffer = buffer
+        self.offsets = offsets
+        self.version = version
+
+    def isvalid(self, variables):
+        start = self.buffer.__array_interface__["data"][0]
+        itemsize = self.buffer.itemsize
+        for name, (offset, _) in self.offsets.items():
+            var = variables.get(name)
+            if var is None:
+                return False
+            addr = var.raw.__array_interface__["data"][0]
+            if addr != start + offset * itemsize:
+                return False
+        return True
+
+    def index(self, names):
+        """
+        Buffer index of ``names``: a slice if contiguous, an array otherwise.
+        """
+        from numpy import arange, concatenate
+
+        ranges = [self.offsets[n] for n in names]
+        if len(ranges) == 0:
+            return slice(0, 0)
+        if all(ranges[i][1] == ranges[i + 1][0] for i in range(len(ranges) - 1)):
+            return slice(ranges[0][0], ranges[-1][1])
+        return concatenate([arange(*r) for r in ranges])
+
+
+class _Plan(object):
+    """
+    Optimization plan: flat layout and bounds of the unfixed variables.
+
+    It is built by :meth:`Variables.plan` and remains valid until a variable
+    is fixed, unfixed, has its bounds or storage replaced, or the set of
+    variables changes.
+    """
+
+    def __init__(self, variables):
+        from numpy import asarray, concatenate, cumsum, empty, int64, ravel
+
+        self.version = variables._stamp()
+        self.names = tuple(variables.select(fixed=False).names())
+        self.sizes = asarray([variables[n].size for n in self.names], int64)
+        self.offsets = concatenate([[0], cumsum(self.sizes)]).astype(int64)
+        self.size = int(self.offsets[-1])
+        self.spans = [
+            (n, int(self.offsets[i]), int(self.offsets[i + 1]))
+            for i, n in enumerate(self.names)
+        ]
+
+        self.lower = empty(self.size)
+        self.upper = empty(self.size)
+        for name, start, stop in self.spans:
+            self.lower[start:stop] = ravel(variables[name].lower)
+            self.upper[start:stop] = ravel(variables[name].upper)
+
+        self.variables = [variables[n] for n in self.names]
+        # Structured matrices, whose gradient blocks are pulled back to their
+        # parameters.
+        self.pullbacks = {
+            n: var._pullback
+            for n, var in zip(self.names, self.variables)
+            if getattr(var, "parametrization", None) is not None
+        }
+        layout = variables._flat_layout()
+        if layout is not None and all(n in layout.offsets for n in self.names):
+            self.buffer = layout.buffer
+            self.index = layout.index(self.names)
+        else:
+            self.buffer = None
+            self.index = None
+
+    def gather(self, out):
+        """
+        Copy the values of the unfixed variables into the flat array ``out``.
+        """
+        from numpy import asarray
+
+        if self.buffer is not None:
+            out[:] = self.buffer[self.index]
+            return out
+
+        for var, (_, start, stop) in zip(self.variables, self.spans):
+            out[start:stop] = asarray(var.raw).ravel()
+        return out
+
+    def scatter(self, flat_arr):
+        """
+        Write the flat array into the values of the unfixed variables.
+
+        Listeners are called only for the variables whose value changed.
+        """
+        from numpy import asarray
+
+        flat_arr = asarray(flat_arr, float)
+        if self.buffer is not None:
+            listened = [
+                (var.raw, start, stop)
+                for var, (_, start, stop) in zip(self.variables, self.spans)
+                if var.raw._listeners
+            ]
+            if len(listened) > 0:
+                changed = self.buffer[self.index] != flat_arr
+            self.buffer[self.index] = flat_arr
+            for raw, start, stop in listened:
+                if changed[start:stop].any():
+                    _notify(raw)
+            return
+
+        for var, (_, start, stop) in zip(self.variables, self.spans):
+            flat = flat_arr[start:stop]
+            if var.raw._listeners and not _differs(var.raw, flat):
+                continue
+            _assign(var, flat)
+
+    def pack(self, arrs, out):
+        """
+        Pack the arrays mapped by variable name into ``out``.
+        """
+        from numpy import asarray
+
+        if self.pullbacks:
+            arrs = dict(arrs)
+            for name, pullback in self.pullbacks.items():
+                arrs[name] = pullback(arrs[name])
+        for name, start, stop in self.spans:
+            out[start:stop] = asarray(arrs[name]).ravel()
+        return out
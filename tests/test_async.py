@@ -0,0 +1,152 @@
+import asyncio
+import gc
+import pickle
+import threading
+
+import pytest
+from numpy import array, zeros
+from numpy.testing import assert_, assert_allclose, assert_equal
+
+from optimix import Function, Vector
+from optimix._async import AsyncRun
+from optimix._observer import MetricsObserver
+
+
+class Quadratic(Function):
+    """
+    ``‖v - t‖²``, optionally waiting on ``gate`` in every evaluation.
+    """
+
+    def __init__(self, t, gate=None):
+        self._v = Vector(zeros(len(t)))
+        self._t = array(t, float)
+        self.gate = gate
+        self.nvalues = 0
+        super(Quadratic, self).__init__("Quadratic", v=self._v)
+
+    def value(self):
+        self.nvalues += 1
+        if self.gate is not None:
+            self.gate.wait()
+        d = self._v.value - self._t
+        return d @ d
+
+    def gradient(self):
+        return {"v": 2 * (self._v.value - self._t)}
+
+
+def test_aminimize_events():
+    f = Quadratic([1.0, -2.0])
+    f._observer = MetricsObserver()
+
+    async def main():
+        run = f._aminimize()
+        events = [e async for e in run]
+        return events, await run
+
+    events, r = asyncio.run(main())
+    assert_(r.success)
+    assert_allclose(f._v.value, [1.0, -2.0], atol=1e-6)
+    assert_equal(events[0].name, "start")
+    assert_equal(events[0].args, ("L-BFGS-B", 2))
+    assert_equal(events[-1].name, "end")
+    assert_(events[-1].args[0] is r)
+    ends = [e for e in events if e.name == "evaluation_end"]
+    assert_equal(len(ends), r.nfev)
+    assert_equal(f._observer.evaluations, r.nfev)
+
+    # The run observer is dropped from copies.
+    g = pickle.loads(pickle.dumps(f))
+    assert_allclose(g.value(), 0.0, atol=1e-10)
+
+
+def test_amaximize_concurrent():
+    functions = [Quadratic([float(i)]) for i in range(1, 5)]
+    for f in functions:
+        f._v.bounds = (-10.0, 10.0)
+
+    async def main():
+        runs = [f._amaximize() for f in functions]
+        return await asyncio.gather(*runs)
+
+    results = asyncio.run(main())
+    for i, (f, r) in enumerate(zip(functions, results), 1):
+        assert_allclose(f._v.value, [-10.0])
+        assert_allclose(r.value, (10.0 + i) ** 2)
+
+
+def test_cancel():
+    gate = threading.Event()
+    f = Quadratic([3.0, 4.0], gate)
+    f._v.value = [1.0, 1.0]
+
+    async def main():
+        run = f._aminimize()
+        async for event in run:
+            if event.name == "evaluation_start":
+                run.cancel()
+                gate.set()
+        assert_(run.cancelled() and run.done())
+        with pytest.raises(asyncio.CancelledError):
+            await run
+
+    asyncio.run(main())
+    assert_allclose(f._v.value, [1.0, 1.0])
+    assert_equal(f._history.count, 1)
+
+    # Direct calls still evaluate.
+    value, _ = f(array([3.0, 4.0]))
+    assert_allclose(value, 0.0)
+
+
+def test_cancel_task():
+    gate = threading.Event()
+    f = Quadratic([3.0, 4.0], gate)
+    errors = []
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda _, context: errors.append(context))
+        run = f._aminimize()
+        task = asyncio.ensure_future(run)
+        await asyncio.sleep(0.05)
+        task.cancel()
+        gate.set()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The run has finished and restored the starting point.
+        assert_(run.cancelled() and run.done())
+        assert_allclose(f._v.value, [0.0, 0.0])
+        events = [e.name async for e in run]
+        assert_("end" not in events)
+
+        del run, task
+        gc.collect()
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert_equal(errors, [])
+
+
+def test_bounded_events():
+    def start(observer, cancel):
+        observer.on_start("Test", 1)
+        for i in range(100):
+            observer.on_evaluation_start(array([float(i)]))
+            observer.on_step(i)
+        observer.on_message("done")
+        observer.on_end(None)
+        return 3
+
+    async def main():
+        run = AsyncRun(start, maxsize=10)
+        assert_equal(await run, 3)
+        return run, [e async for e in run]
+
+    run, events = asyncio.run(main())
+    names = [e.name for e in events]
+    assert_equal(names[0], "start")
+    assert_equal(names[-2:], ["message", "end"])
+    assert_equal(len(names), 13)
+    assert_equal(run.dropped, 190)
+    assert_equal(events[1].args[0], [0.0])
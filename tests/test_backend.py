@@ -0,0 +1,139 @@
+import pytest
+from numpy.testing import assert_, assert_allclose
+
+from optimix import Function, OptimixError, Vector
+from optimix._backend import Backend, Result, register_backend
+from test_function import Foo1, Foo8, Rosenbrock
+
+
+class GradientDescent(Backend):
+    label = "GD"
+
+    def minimize(self, problem, callback, verbose, factr, pgtol):
+        from numpy import abs as npabs, clip
+
+        x = problem.x0.copy()
+        for i in range(10000):
+            value, grad = problem.fun(x)
+            if npabs(grad).max() <= pgtol:
+                return Result(x, value, 0, "converged", nit=i)
+            x = clip(x - 0.01 * grad, problem.lower, problem.upper)
+        return Result(x, value, 1, "too many iterations", nit=i)
+
+
+def test_backend_builtin():
+    for method in ["lbfgsb", "trust-constr", "newton-cg"]:
+        f = Foo1()
+        r = f._minimize(verbose=False, method=method)
+        assert_allclose(f.value(), 0, atol=1e-6)
+        assert_(r.success)
+        assert_(r.nfev > 0)
+        assert_(r.time > 0)
+        assert_allclose(r.value, f.value(), atol=1e-6)
+
+    f = Foo8()
+    with pytest.raises(ValueError):
+        f._minimize(verbose=False, method="newton-cg")
+    with pytest.raises(ValueError):
+        f._minimize(verbose=False, method="unknown")
+
+
+def test_backend_custom():
+    register_backend("gd", GradientDescent())
+
+    f = Foo8()
+    r = f._minimize(verbose=False, method="gd")
+    assert_allclose(f._x.value, 0.960_149_56, rtol=1e-5)
+    assert_(r.message == "converged")
+
+    f._x.value = -0.5
+    r = f._minimize(verbose=False, method=GradientDescent())
+    assert_allclose(f._x.value, -1.035_578_71, rtol=1e-5)
+    assert_allclose(r.value, f.value())
+
+    with pytest.raises(TypeError):
+        register_backend("bad", object())
+
+
+def test_backend_failure():
+    class Failing(GradientDescent):
+        def minimize(self, problem, callback, verbose, factr, pgtol):
+            problem.fun(problem.x0)
+            problem.fun(problem.x0 + 1)
+            return Result(problem.x0, 0.0, 2, "diverged")
+
+    f = Foo1()
+    with pytest.raises(OptimixError, match="Too many bad solutions"):
+        f._minimize(verbose=False, method=Failing())
+
+
+class RosenbrockHessian(Rosenbrock):
+    def hessian(self):
+        from numpy import diag
+
+        x = self._x.value
+        d = 0 * x
+        d[:-1] = 1200 * x[:-1] ** 2 - 400 * x[1:] + 2
+        d[1:] += 200
+        H = diag(d) + diag(-400 * x[:-1], 1) + diag(-400 * x[:-1], -1)
+        return {("x", "x"): H}
+
+
+class RosenbrockHessp(Rosenbrock):
+    def hessian_vector_product(self, v):
+        H = RosenbrockHessian.hessian(self)[("x", "x")]
+        return {"x": H @ v["x"]}
+
+
+def test_hessian_approx():
+    from numpy import array
+
+    f = RosenbrockHessian()
+    H = f.hessian()[("x", "x")]
+    assert_allclose(f._approx_hessian(step=1e-6)[("x", "x")], H, rtol=1e-4)
+
+    v = {"x": array([1.0, -1.0, 0.5, 2.0])}
+    hv = f._approx_hessian_vector_product(v, step=1e-6)
+    assert_allclose(hv["x"], H @ v["x"], rtol=1e-4)
+    assert_allclose(f._x.value, [-1.2, 1.0, -1.2, 1.0])
+
+
+def test_second_order_backends():
+    for cls in [RosenbrockHessian, RosenbrockHessp]:
+        for method in ["newton-cg", "trust-constr"]:
+            f = cls()
+            r = f._minimize(verbose=False, method=method)
+            assert_(r.success)
+            assert_allclose(f._x.value, [1, 1, 1, 1], rtol=1e-4)
+
+
+class IllConditioned(Function):
+    def __init__(self):
+        from numpy import logspace, zeros
+
+        self._x = Vector(zeros(30))
+        self._d = logspace(0, 4, 30)
+        self.nevals = 0
+        super(IllConditioned, self).__init__("IllConditioned", x=self._x)
+
+    def value(self):
+        self.nevals += 1
+        x = self._x.value
+        return (self._d * (x - 1) ** 2).sum() / 2
+
+    def gradient(self):
+        return {"x": self._d * (self._x.value - 1)}
+
+    def hessian_vector_product(self, v):
+        return {"x": self._d * v["x"]}
+
+
+def test_second_order_evaluations():
+    f = IllConditioned()
+    f._minimize(verbose=False)
+    first_order = f.nevals
+
+    f = IllConditioned()
+    f._minimize(verbose=False, method="newton-cg")
+    assert_allclose(f._x.value, 1, rtol=1e-6)
+    assert_(f.nevals < first_order)
@@ -0,0 +1,91 @@
+import pytest
+from numpy import log, ones, zeros
+from numpy.linalg import lstsq
+from numpy.random import default_rng
+from numpy.testing import assert_, assert_allclose, assert_equal
+
+from optimix import Function, Scalar, Vector, closed_form
+
+
+class Regression(Function):
+    """
+    Negative log-likelihood of a linear regression with noise variance ``s``.
+    """
+
+    def __init__(self, X, y):
+        self._X = X
+        self._y = y
+        self._beta = Vector(zeros(X.shape[1]))
+        self._s = Scalar(1.0)
+        self._s.bounds = (1e-4, 1e4)
+        self.nsolves = 0
+        super(Regression, self).__init__("Regression", beta=self._beta, s=self._s)
+
+    def _residual(self):
+        return self._y - self._X @ self._beta.value
+
+    def value(self):
+        r = self._residual()
+        s = float(self._s.value)
+        return len(r) * log(s) / 2 + r @ r / (2 * s)
+
+    def gradient(self):
+        r = self._residual()
+        s = float(self._s.value)
+        return {
+            "beta": -self._X.T @ r / s,
+            "s": len(r) / (2 * s) - r @ r / (2 * s**2),
+        }
+
+    @closed_form("beta")
+    def _solve_beta(self):
+        self.nsolves += 1
+        self._beta.value = lstsq(self._X, self._y, rcond=None)[0]
+
+
+def _problem():
+    rng = default_rng(0)
+    X = rng.normal(size=(50, 3))
+    y = X @ [1.0, -2.0, 0.5] + rng.normal(scale=0.5, size=50)
+    return X, y
+
+
+def test_minimize_blockwise():
+    X, y = _problem()
+    f = Regression(X, y)
+    f._s.fix()
+    with pytest.raises(ValueError):
+        f._minimize_blockwise([["beta"], ["s"]])
+    f._s.unfix()
+    with pytest.raises(ValueError):
+        f._minimize_blockwise([["beta", "s"], ["s"]])
+
+    r = f._minimize_blockwise([["beta"], ["s"]])
+    assert_(r.success)
+    assert_(f.nsolves == r.nit)
+    assert_(all(a >= b - 1e-12 for a, b in zip(r.values, r.values[1:])))
+
+    beta = lstsq(X, y, rcond=None)[0]
+    rss = ((y - X @ beta) ** 2).sum()
+    assert_allclose(f._beta.value, beta)
+    assert_allclose(f._s.value, rss / len(y), rtol=1e-5)
+    assert_allclose(r.x, list(beta) + [rss / len(y)], rtol=1e-5)
+    assert_(not f._beta.isfixed and not f._s.isfixed)
+
+    joint = Regression(X, y)
+    assert_(joint._minimize(verbose=False).nfev > r.nfev)
+    assert_allclose(joint.value(), f.value(), rtol=1e-6)
+
+
+def test_minimize_blockwise_inner_only():
+    X, y = _problem()
+    f = Regression(X, y)
+    f._beta.value = ones(3)
+    r = f._minimize_blockwise([["s"]], inner=dict(factr=10.0), maxiter=1)
+    assert_equal(r.nit, 1)
+    assert_equal(f.nsolves, 0)
+    assert_allclose(f._beta.value, ones(3))
+
+    g = Regression(X, y)
+    r = g._maximize_blockwise([["s"]], maxiter=0)
+    assert_equal((r.status, r.nit, r.nfev), (1, 0, 1))
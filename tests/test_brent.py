@@ -0,0 +1,42 @@
+import pytest
+from brent_search import brent
+from numpy import array, linspace
+from numpy.testing import assert_, assert_allclose, assert_equal
+
+from optimix import minimize_scalar_batch
+
+
+def _quartic(c):
+    return lambda x: (x**2 - 1) ** 2 + c * x
+
+
+def test_minimize_scalar_batch():
+    c = linspace(-0.4, 0.4, 7)
+    a = -2.0
+    b = array([2.0, 2.0, 1.5, 1.5, 1.0, 1.0, 0.5])
+    nevals = [0]
+
+    def f(x):
+        assert_(x.shape == (7,))
+        nevals[0] += 1
+        return _quartic(c)(x)
+
+    x, fx, niters = minimize_scalar_batch(f, a, b)
+    assert_equal(nevals[0], niters.max() + 1)
+    for i in range(7):
+        xi, fi, _ = brent(_quartic(c[i]), a, b[i])
+        assert_allclose(x[i], xi)
+        assert_allclose(fx[i], fi)
+
+
+def test_minimize_scalar_batch_grid():
+    c = array([-0.3, 0.3])
+    x, fx, _ = minimize_scalar_batch(_quartic(c), -2.0, 2.0, grid=9)
+    assert_allclose(x, [1.035_578_71, -1.035_578_71], rtol=1e-6)
+    assert_allclose(fx, _quartic(c)(x))
+
+    with pytest.raises(ValueError):
+        minimize_scalar_batch(_quartic(c), -2.0, 2.0, grid=2)
+
+    with pytest.raises(ValueError):
+        minimize_scalar_batch(_quartic(c), -2.0, float("inf"))
@@ -0,0 +1,88 @@
+from numpy import array
+from numpy.testing import assert_, assert_allclose, assert_equal
+
+from optimix import Function, Scalar, Vector, cached
+
+
+class Quad(Function):
+    def __init__(self):
+        self._a = Vector([1.0, 2.0])
+        self._b = Scalar(0.5)
+        self.nfactor = 0
+        super(Quad, self).__init__("Quad", a=self._a, b=self._b)
+
+    @cached(maxsize=2)
+    def _factor(self):
+        self.nfactor += 1
+        a = self._a.value
+        return (a - self._b.value) @ (a - self._b.value)
+
+    @cached
+    def value(self):
+        return self._factor()
+
+    @cached
+    def gradient(self):
+        a = self._a.value
+        b = self._b.value
+        return {"a": 2 * (a - b), "b": -2 * (a - b).sum()}
+
+
+def test_cache_hit_and_invalidation():
+    f = Quad()
+
+    assert_allclose(f.value(), 0.25 + 2.25)
+    assert_allclose(f.value(), 0.25 + 2.25)
+    f.gradient()
+    assert_equal(f.nfactor, 1)
+
+    f._b.value = 1.0
+    assert_allclose(f.value(), 1.0)
+    assert_equal(f.nfactor, 2)
+
+    f._a.value[0] = 2.0
+    assert_allclose(f.value(), 2.0)
+    assert_equal(f.nfactor, 3)
+
+
+def test_cache_lru():
+    f = Quad()
+    f.value()
+    f._b.value = 1.0
+    f.value()
+    f._b.value = 0.5
+    f.value()
+    assert_equal(f.nfactor, 2)
+
+    f._b.value = 2.0
+    f.value()
+    f._b.value = 3.0
+    f.value()
+    assert_equal(f.nfactor, 4)
+
+    f._b.value = 0.5
+    f.value()
+    assert_equal(f.nfactor, 4)
+    f._factor()
+    assert_equal(f.nfactor, 5)
+
+
+def test_cache_optimization():
+    f = Quad()
+    assert_(f._check_grad() < 1e-5)
+    f._minimize(verbose=False)
+    assert_allclose(f.value(), 0, atol=1e-6)
+    assert_allclose(f._a.value, array([f._b.value] * 2), atol=1e-4)
+
+
+def test_cache_pickle():
+    import pickle
+
+    f = Quad()
+    f.value()
+    g = pickle.loads(pickle.dumps(f))
+    g._b.value = 1.0
+    assert_allclose(g.value(), 1.0)
+    assert_allclose(f.value(), 2.5)
+    g._b.value = 0.0
+    assert_allclose(g.value(), 5.0)
@@ -0,0 +1,154 @@
+import pickle
+
+from numpy import zeros
+from numpy.testing import assert_, assert_allclose, assert_equal
+
+from optimix import Function, Scalar, VariableSet, Vector
+from optimix._dirty import _Tracker
+
+
+class Part(Function):
+    """
+    ``‖v - t‖²``, counting its evaluations.
+    """
+
+    def __init__(self, t):
+        self._v = Vector(zeros(len(t)))
+        self._t = t
+        self.nvalues = 0
+        super(Part, self).__init__("Part", v=self._v)
+
+    def value(self):
+        self.nvalues += 1
+        d = self._v.value - self._t
+        return d @ d
+
+    def gradient(self):
+        return {"v": 2 * (self._v.value - self._t)}
+
+
+class Whole(Function):
+    """
+    ``(s - 1)²`` plus two :class:`Part` children, reusing clean children.
+    """
+
+    def __init__(self):
+        self._s = Scalar(0.0)
+        self._p = Part([1.0, 2.0])
+        self._q = Part([3.0])
+        composite = [("p", self._p), ("q", self._q)]
+        super(Whole, self).__init__("Whole", composite, s=self._s)
+        self.dirty = []
+
+    def value(self):
+        self.dirty.append(self._dirty())
+        v = (float(self._s.value) - 1) ** 2
+        return v + self._child_result("p") + self._child_result("q")
+
+    def gradient(self):
+        g = {"s": 2 * (float(self._s.value) - 1)}
+        for prefix in ["p", "q"]:
+            for name, gi in self._child_result(prefix, "gradient").items():
+                g[prefix + "." + name] = gi
+        return g
+
+
+def test_dirty_tracking():
+    f = Whole()
+    assert_equal(f._dirty(), {"s", "p.v", "q.v"})
+    f.value()
+    f._clean()
+    assert_equal(f._dirty(), set())
+
+    f._q._v.value = [0.5]
+    assert_equal(f._dirty(), {"q.v"})
+    f._s.value[()] = 2.0
+    assert_equal(f._dirty(), {"s", "q.v"})
+    f._clean()
+
+    # Rewriting the same values leaves them clean.
+    plan = f._variables.plan()
+    x = plan.gather(zeros(plan.size))
+    plan.scatter(x)
+    assert_equal(f._dirty(), set())
+    x[0] += 1.0
+    plan.scatter(x)
+    assert_equal(f._dirty(), {"p.v"})
+
+
+def test_dirty_variable_set():
+    vs = VariableSet({"a": 0.0, "b": [1.0, 2.0], "c": 3.0})
+    tracker = _Tracker()
+    tracker.sync(vs)
+    # The views share a single listener.
+    assert_equal(len(vs["a"].raw._listeners), 1)
+    assert_equal(tracker.dirty, {"a", "b", "c"})
+    tracker.clean()
+
+    version = tracker.version("")
+    vs["b"].value = [0.0, 0.0]
+    assert_equal(tracker.dirty, {"a", "b", "c"})
+    assert_equal(tracker.version(""), version + 1)
+
+
+def test_dirty_child_reuse():
+    f = Whole()
+    f._q._v.fix()
+    f.value()
+    assert_equal((f._p.nvalues, f._q.nvalues), (1, 1))
+    f.value()
+    assert_equal((f._p.nvalues, f._q.nvalues), (1, 1))
+
+    f._p._v.value = [0.5, 0.5]
+    f.value()
+    assert_equal((f._p.nvalues, f._q.nvalues), (2, 1))
+
+    del f.dirty[:]
+    f._approx_fprime()
+    # The value at the current point, then one per coordinate.
+    assert_equal(f.dirty[1:], [{"p.v"}, {"p.v"}, {"p.v", "s"}])
+    assert_equal(f._q.nvalues, 1)
+
+    f._minimize(verbose=False)
+    assert_allclose(f._p._v.value, [1.0, 2.0], atol=1e-5)
+    assert_equal(f._q.nvalues, 1)
+
+    g = pickle.loads(pickle.dumps(f))
+    assert_equal(g._dirty(), {"s", "p.v", "q.v"})
+    g._p._v.value = [0.0, 0.0]
+    assert_allclose(g.value(), 5.0 + f._q.value())
+
+
+def test_dirty_clean_children():
+    f = Whole()
+    f.value()
+    assert_equal(f._p._dirty(), {"v"})
+    assert_equal(f._q._dirty(), {"v"})
+    f._clean()
+    assert_equal(f._p._dirty(), set())
+    assert_equal(f._q._dirty(), set())
+
+    # Every kind of run ends its evaluations clean.
+    f._q._v.fix()
+    f._p._v.fix()
+    f._p._v.value = [0.5, 0.5]
+    del f.dirty[:]
+    f._minimize_scalar(verbose=False)
+    assert_allclose(f._s.value, 1.0, atol=1e-5)
+    assert_equal(f.dirty[0], {"s", "p.v"})
+    assert_(all(d == {"s"} for d in f.dirty[1:]))
+
+    f._q._v.unfix()
+    f._p._v.unfix()
+    del f.dirty[:]
+    f._minimize_blockwise([["s"], ["p.v", "q.v"]])
+    assert_equal(f.dirty[-1], set())
+    assert_equal(f._dirty(), set())
+
+    # Gradient near zero before the first iteration.
+    f._s.value = 0.5
+    f._minimize(verbose=False)
+    del f.dirty[:]
+    f._minimize(verbose=False)
+    assert_equal(f.dirty, [set()])
+    assert_equal(f._dirty(), set())
@@ -214,3 +214,308 @@ def test_foo4func():
 
     with pytest.raises(OptimixError):
         f._maximize(verbose=False)
+
+
+class Foo5(Foo1):
+    def __init__(self):
+        self.nvalue = 0
+        self.ngradient = 0
+        self.nvalue_and_gradient = 0
+        super(Foo5, self).__init__()
+
+    def value(self):
+        self.nvalue += 1
+        return super(Foo5, self).value()
+
+    def gradient(self):
+        self.ngradient += 1
+        return super(Foo5, self).gradient()
+
+    def value_and_gradient(self):
+        self.nvalue_and_gradient += 1
+        return Foo1.value(self), Foo1.gradient(self)
+
+
+def test_value_and_gradient():
+    f = Foo5()
+
+    assert_allclose(f.check_grad(), 0, atol=1e-6)
+    assert_(f.nvalue_and_gradient == 1)
+    assert_(f.ngradient == 0)
+
+    f.nvalue = 0
+    f._minimize(verbose=False)
+    assert_allclose(f.value(), 0, atol=1e-6)
+    assert_allclose(f.a, [0.296_404_030_827_721_43, 0.320_073_722_957_560_3])
+    assert_(f.nvalue == 1)
+    assert_(f.ngradient == 0)
+    assert_(f.nvalue_and_gradient > 1)
+
+
+class Foo6(Foo1):
+    _contiguous = True
+
+
+def test_contiguous():
+    f = Foo6()
+    assert_allclose(f._variables.buffer, [0, 0, 0, 0, 1])
+
+    f._minimize(verbose=False)
+    assert_allclose(f.value(), 0, atol=1e-6)
+    assert_allclose(f.a, [0.296_404_030_827_721_43, 0.320_073_722_957_560_3])
+    assert_allclose(f.c, 0.820_436_694_621_109_5)
+
+    f.c = 1.0
+    f.fix_c()
+    f._minimize(verbose=False)
+    assert_allclose(f.a, [0.335_604_171_088_476_3, 0.344_148_411_173_441_14])
+    assert_allclose(f.c, 1)
+
+    f1 = Foo6()
+    f2 = Foo2()
+    f = Foo3([f1, f2])
+    f._minimize(verbose=False)
+    assert_allclose(f.value(), 0, atol=1e-6)
+
+
+def test_approx_fprime_engine():
+    from concurrent.futures import ProcessPoolExecutor
+
+    from numpy import isnan
+
+    f = Foo1()
+    f._variables.set({"a": array([0.5, -0.3]), "b": array([1.0, 2.0])})
+    g = f.gradient()
+    fg = f._approx_fprime()
+
+    assert_(fg["c"].ndim == 0)
+    for name in g:
+        assert_allclose(fg[name], g[name], rtol=1e-5)
+
+    with ProcessPoolExecutor(2) as executor:
+        for workers in [2, executor]:
+            pg = f._approx_fprime(workers=workers)
+            for name in fg:
+                assert_(pg[name].shape == fg[name].shape)
+                assert_allclose(pg[name], fg[name], rtol=0, atol=0)
+    assert_allclose(f.a, [0.5, -0.3])
+
+    cg = f._approx_fprime(method="central")
+    for name in g:
+        assert_allclose(cg[name], g[name], rtol=1e-6)
+
+    sg = f._approx_fprime(sample=2, seed=0)
+    assert_(sum((~isnan(sg[n])).sum() for n in sg) == 2)
+    assert_(f._check_grad(sample=2, seed=0) < 1e-5)
+
+
+class Foo7(Foo1):
+    def __init__(self):
+        self.nbatch = 0
+        super(Foo7, self).__init__()
+
+    def value_batch(self, X):
+        from numpy import asarray
+
+        X = asarray(X)
+        self.nbatch += 1
+        a, b, c = X[:, 0:2], X[:, 2:4], X[:, 4]
+        v = (a * b).sum(1) - 3 + a.sum(1) - b @ [1, 2] + 1 / c
+        return v**2
+
+
+def test_value_batch():
+    from numpy import stack
+
+    f = Foo1()
+    X = array([[0.0, 0.0, 0.0, 0.0, 1.0], [0.5, -0.3, 1.0, 2.0, 2.0]])
+    assert_allclose(f.value_batch(X), [4.0, 54.76])
+    assert_allclose(f.a, [0, 0])
+
+    G = f.gradient_batch(X)
+    g = f.gradient()
+    assert_allclose(G[0], stack([*g["a"], *g["b"], g["c"]]))
+    assert_allclose(f.a, [0, 0])
+
+    with pytest.raises(ValueError):
+        f.value_batch(X[:, :2])
+
+    f7 = Foo7()
+    assert_allclose(f7.value_batch(X), f.value_batch(X))
+    f._variables.set({"a": array([0.5, -0.3])})
+    f7._variables.set({"a": array([0.5, -0.3])})
+    f7.nbatch = 0
+    fg = f._approx_fprime()
+    fg7 = f7._approx_fprime(method="central")
+    assert_(f7.nbatch == 2)
+    for name in fg:
+        assert_allclose(fg7[name], fg[name], rtol=1e-5)
+
+
+class Foo8(Function):
+    def __init__(self):
+        self._x = Scalar(1.0)
+        self._x.bounds = (-2.0, 2.0)
+        super(Foo8, self).__init__("Foo8", x=self._x)
+
+    @property
+    def x(self):
+        return float(self._x.value)
+
+    def value(self):
+        x = self.x
+        return (x**2 - 1) ** 2 + 0.3 * x
+
+    def gradient(self):
+        x = self.x
+        return {"x": 4 * x * (x**2 - 1) + 0.3}
+
+
+def test_minimize_multistart():
+    f = Foo8()
+    f._minimize(verbose=False)
+    assert_allclose(f.x, 0.960_149_56, rtol=1e-5)
+
+    table = f._minimize_multistart(6, seed=0)
+    assert_(len(table) == 6)
+    assert_allclose(f.x, -1.035_578_71, rtol=1e-5)
+    assert_allclose(f.value(), min(r["value"] for r in table))
+
+    f._x.value = 1.0
+    table = f._minimize_multistart(6, workers=2, seed=0)
+    assert_allclose(f.x, -1.035_578_71, rtol=1e-5)
+    assert_(all(r["status"] == "converged" for r in table))
+
+    f._x.value = 1.0
+    table = f._minimize_multistart(6, seed=0, target=-0.2)
+    assert_allclose(f.x, -1.035_578_71, rtol=1e-5)
+    assert_(sum(r["status"] == "converged" for r in table) == 1)
+
+    f._x.value = -1.0
+    f._maximize_multistart(4, seed=0)
+    assert_allclose(abs(f.x), 2.0)
+
+
+class Foo8Fragile(Foo8):
+    def gradient(self):
+        if self.x > 1.5:
+            raise FloatingPointError("overflow")
+        return super(Foo8Fragile, self).gradient()
+
+
+def test_minimize_multistart_user_error():
+    f = Foo8Fragile()
+    table = f._minimize_multistart(8, seed=0)
+    failed = [r for r in table if r["status"] == "failed"]
+    assert_(len(failed) > 0)
+    assert_(all(r["message"] == "FloatingPointError: overflow" for r in failed))
+    assert_allclose(f.x, -1.035_578_71, rtol=1e-5)
+
+
+class Foo9(Function):
+    def __init__(self):
+        self._a = Vector([1.0, 1.0])
+        self._a.bounds = (-2.0, 2.0)
+        self.threads = set()
+        super(Foo9, self).__init__("Foo9", a=self._a)
+
+    def value(self):
+        from threading import get_ident
+
+        self.threads.add(get_ident())
+        a = self._a.value
+        return ((a**2 - 1) ** 2).sum() + 0.3 * a[0] - 0.2 * a[1]
+
+    def gradient(self):
+        a = self._a.value
+        return {"a": 4 * a * (a**2 - 1) + array([0.3, -0.2])}
+
+
+def test_minimize_multistart_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    from threading import get_ident
+
+    f = Foo9()
+    with ThreadPoolExecutor(4) as executor:
+        table = f._minimize_multistart(8, seed=1, workers=executor)
+    # Each start runs on its own copy.
+    assert_(f.threads == {get_ident()})
+
+    g = Foo9()
+    for row in table:
+        assert_(row["status"] == "converged")
+        g._a.value = row["x"]
+        assert_allclose(g.value(), row["value"])
+        assert_(abs(g.gradient()["a"]).max() < 1e-4)
+    assert_allclose(f.value(), min(r["value"] for r in table))
+
+
+class Interrupted(Exception):
+    pass
+
+
+class Rosenbrock(Function):
+    def __init__(self, limit=None):
+        self._x = Vector([-1.2, 1.0, -1.2, 1.0])
+        self.limit = limit
+        self.nevals = 0
+        super(Rosenbrock, self).__init__("Rosenbrock", x=self._x)
+
+    def value(self):
+        x = self._x.value
+        return (100 * (x[1:] - x[:-1] ** 2) ** 2 + (1 - x[:-1]) ** 2).sum()
+
+    def gradient(self):
+        x = self._x.value
+        g = 0 * x
+        g[:-1] = -400 * x[:-1] * (x[1:] - x[:-1] ** 2) - 2 * (1 - x[:-1])
+        g[1:] += 200 * (x[1:] - x[:-1] ** 2)
+        return {"x": g}
+
+    def value_and_gradient(self):
+        if self.limit is not None and self.nevals >= self.limit:
+            raise Interrupted()
+        self.nevals += 1
+        return self.value(), self.gradient()
+
+
+def test_checkpoint_resume(tmp_path):
+    path = str(tmp_path / "fit.npz")
+
+    cold = Rosenbrock()
+    cold._minimize(verbose=False)
+    assert_allclose(cold._x.value, [1, 1, 1, 1], rtol=1e-4)
+
+    f = Rosenbrock(limit=cold.nevals // 2)
+    with pytest.raises(Interrupted):
+        f._minimize(verbose=False, checkpoint=path, every=5)
+
+    g = Rosenbrock()
+    g._resume(path, verbose=False)
+    assert_allclose(g._x.value, [1, 1, 1, 1], rtol=1e-4)
+    assert_(g.nevals < cold.nevals)
+
+    h = Rosenbrock()
+    h._resume(path, verbose=False)
+    assert_(h.nevals == 0)
+    assert_allclose(h._x.value, g._x.value)
+
+    f = Foo2()
+    f._maximize(verbose=False, checkpoint=path)
+    f.c = 1.0
+    f._resume(path, verbose=False)
+    assert_allclose(f.c, 0, atol=1e-6)
+
+
+def test_minimize_scalar_grid():
+    f = Foo8()
+    f._minimize_scalar(verbose=False, grid=9)
+    assert_allclose(f.x, -1.035_578_71, rtol=1e-6)
+
+    f._x.value = 0.0
+    f._maximize_scalar(verbose=False, grid=9)
+    assert_allclose(f.x, 2.0, rtol=1e-6)
+
+    f._x.bounds = (-2.0, float("inf"))
+    with pytest.raises(ValueError):
+        f._minimize_scalar(verbose=False, grid=9)
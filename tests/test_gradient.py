@@ -0,0 +1,85 @@
+from numpy import array, eye, zeros
+from numpy.testing import assert_, assert_allclose, assert_equal
+
+from optimix import Function, Matrix, Scalar, Vector
+
+
+class Leaf(Function):
+    """
+    ``(a - 1)² + ‖b - t‖²``.
+    """
+
+    def __init__(self, t):
+        self._a = Scalar(0.0)
+        self._b = Vector(zeros(len(t)))
+        self._t = array(t, float)
+        super(Leaf, self).__init__("Leaf", a=self._a, b=self._b)
+
+    def value(self):
+        d = self._b.value - self._t
+        return (float(self._a.value) - 1) ** 2 + d @ d
+
+    def gradient(self):
+        return {"a": 2 * (float(self._a.value) - 1), "b": 2 * (self._b.value - self._t)}
+
+
+class Sum(Function):
+    """
+    ``(s + 2)² + ‖M - I‖²`` plus two :class:`Leaf` children, through
+    ``gradient_into``.
+    """
+
+    calls = 0
+
+    def __init__(self):
+        self._s = Scalar(0.0)
+        self._M = Matrix.cholesky(2 * eye(2))
+        self._left = Leaf([1.0, 2.0])
+        self._right = Leaf([3.0])
+        composite = [("left", self._left), ("right", self._right)]
+        super(Sum, self).__init__("Sum", composite, s=self._s, M=self._M)
+
+    def value(self):
+        d = self._M.value - eye(2)
+        v = (float(self._s.value) + 2) ** 2 + (d * d).sum()
+        return v + self._left.value() + self._right.value()
+
+    def gradient(self):
+        g = {"s": 2 * (float(self._s.value) + 2), "M": 2 * (self._M.value - eye(2))}
+        for prefix, child in [("left", self._left), ("right", self._right)]:
+            for name, gi in child.gradient().items():
+                g[prefix + "." + name] = gi
+        return g
+
+    def gradient_into(self, out):
+        Sum.calls += 1
+        out["s"] = 2 * (float(self._s.value) + 2)
+        out["M"] = 2 * (self._M.value - eye(2))
+        self._left.gradient_into(out.child("left"))
+        self._right.gradient_into(out.child("right"))
+
+
+def test_gradient_into_composite():
+    from optimix._gradient import gradient_blocks
+
+    f = Sum()
+    f._right._a.fix()
+    plan = f._variables.plan()
+    expected = plan.pack(f.gradient(), zeros(plan.size))
+
+    flat = zeros(plan.size)
+    blocks = gradient_blocks(f, plan, flat)
+    assert_("right.a" not in blocks)
+    assert_("a" not in blocks.child("right"))
+    assert_equal(blocks.child("left")["b"].shape, (2,))
+    f.gradient_into(blocks)
+    assert_allclose(flat, expected)
+
+    Sum.calls = 0
+    f._minimize(verbose=False)
+    assert_(Sum.calls > 0)
+    assert_allclose(f._s.value, -2.0, atol=1e-5)
+    assert_allclose(f._M.value, eye(2), atol=1e-5)
+    assert_allclose(f._left._b.value, [1.0, 2.0], atol=1e-5)
+    assert_allclose(f._right._b.value, [3.0], atol=1e-5)
+    assert_allclose(f._right._a.value, 0.0)
@@ -0,0 +1,52 @@
+import pytest
+from numpy import array
+from numpy.testing import assert_, assert_allclose, assert_equal
+
+from optimix._history import History
+
+
+def test_history_ring():
+    h = History(3)
+    h.reset(2)
+    assert_equal(len(h), 0)
+
+    for i in range(5):
+        h.append(array([i, -i], float))
+
+    assert_equal(len(h), 3)
+    assert_equal(h.count, 5)
+    assert_allclose(h[-1], [4, -4])
+    assert_allclose(h[-2], [3, -3])
+    assert_allclose(h[0], [2, -2])
+    with pytest.raises(IndexError):
+        h[3]
+    with pytest.raises(ValueError):
+        h.trace()
+
+    h.reset(2)
+    assert_equal(len(h), 0)
+
+
+def test_history_trace(tmp_path):
+    path = str(tmp_path / "trace.bin")
+    h = History(2)
+    h.reset(3, trace=path)
+    for i in range(4):
+        h.append(array([i, i, i], float))
+    h.close()
+
+    trace = h.trace()
+    assert_equal(trace.shape, (4, 3))
+    assert_allclose(trace[:, 0], [0, 1, 2, 3])
+
+
+def test_history_optimization(tmp_path):
+    from test_function import Foo1
+
+    path = str(tmp_path / "trace.bin")
+    f = Foo1()
+    f._minimize(verbose=False, trace=path)
+    trace = f._history.trace()
+    assert_(trace.shape[0] == f._history.count)
+    assert_(len(f._history) == 2)
+    assert_allclose(trace[-1], f._history[-1])
@@ -0,0 +1,125 @@
+import pickle
+
+import pytest
+from numpy import array, eye, outer, zeros
+from numpy.testing import assert_, assert_allclose, assert_equal
+
+from optimix import Function, Matrix
+from optimix._variables import Variables
+
+T = array([[4.0, 2.0, 0.5], [2.0, 3.0, 1.0], [0.5, 1.0, 2.0]])
+
+
+class MatrixFit(Function):
+    """
+    Squared Frobenius distance between a matrix and a target.
+    """
+
+    def __init__(self, M, target):
+        self._M = M
+        self._target = target
+        super(MatrixFit, self).__init__("MatrixFit", M=M)
+
+    def value(self):
+        d = self._M.value - self._target
+        return (d * d).sum()
+
+    def gradient(self):
+        return {"M": 2 * (self._M.value - self._target)}
+
+
+def test_matrix_dense():
+    M = Matrix(zeros((2, 3)))
+    assert_equal(M.shape, (2, 3))
+    assert_equal(M.ndim, 2)
+    assert_equal(M.size, 6)
+    with pytest.raises(ValueError):
+        Matrix(zeros(3))
+
+    M.bounds = (-1.0, [1.0, 2.0, 3.0])
+    assert_equal(M.upper, [[1, 2, 3], [1, 2, 3]])
+    M.value = [[5.0, 5.0, 5.0], [-5.0, 0.0, 0.0]]
+    assert_allclose(M.value, [[1, 2, 3], [-1, 0, 0]])
+
+    target = array([[0.5, 3.0, 1.0], [-2.0, 0.0, 1.5]])
+    M.value = zeros((2, 3))
+    f = MatrixFit(M, target)
+    assert_(f._check_grad() < 1e-5)
+    f._minimize(verbose=False)
+    assert_allclose(M.value, [[0.5, 2.0, 1.0], [-1.0, 0.0, 1.5]], atol=1e-5)
+
+
+@pytest.mark.parametrize("kind", ["cholesky", "symmetric", "lowrank"])
+def test_matrix_structured(kind):
+    if kind == "cholesky":
+        M = Matrix.cholesky(eye(3))
+        target, size = T, 6
+    elif kind == "symmetric":
+        M = Matrix.symmetric(zeros((3, 3)))
+        target, size = T, 6
+    else:
+        M = Matrix.lowrank(array([[1.0], [0.0], [0.0]]))
+        target, size = outer([1.0, 2.0, 3.0], [1.0, 2.0, 3.0]), 3
+
+    assert_equal(M.parametrization.name, kind)
+    assert_equal(M.shape, (3, 3))
+    assert_equal(M.size, size)
+
+    f = MatrixFit(M, target)
+    assert_(f._check_grad() < 1e-5)
+    f._minimize(verbose=False)
+    assert_allclose(M.value, target, atol=1e-4)
+    assert_(not M.value.flags.writeable)
+
+    M.value = target
+    assert_allclose(M.value, target, atol=1e-10)
+
+    M1 = pickle.loads(pickle.dumps(M))
+    assert_allclose(M1.value, M.value)
+    v = Variables(M=M)
+    assert_allclose(Variables.from_bytes(v.to_bytes())["M"].value, M.value)
+
+
+def test_matrix_pack():
+    A = Matrix(array([[1.0, 2.0], [3.0, 4.0]]))
+    L = Matrix.cholesky(eye(2))
+    v = Variables(A=A, L=L)
+    v.pack()
+    assert_allclose(v.buffer, [1, 2, 3, 4, 1, 0, 1])
+    A.value[0, 1] = 5.0
+    assert_allclose(v.buffer[:4], [1, 5, 3, 4])
+
+    plan = v.plan()
+    plan.scatter(array([0.0, 1, 2, 3, 2, 1, 3]))
+    assert_allclose(A.value, [[0, 1], [2, 3]])
+    assert_allclose(L.factor, [[2, 0], [1, 3]])
+    assert_allclose(L.value, [[4, 2], [2, 10]])
+
+
+class SymmetricFit(MatrixFit):
+    """
+    :class:`MatrixFit` of a symmetric 2-by-2 matrix, with its Hessian over the
+    parameters ``(M[0, 0], M[0, 1], M[1, 1])``.
+    """
+
+    H = array([[2.0, 0.0, 0.0], [0.0, 4.0, 0.0], [0.0, 0.0, 2.0]])
+
+    def hessian(self):
+        return {("M", "M"): self.H}
+
+    def hessian_vector_product(self, v):
+        return {"M": self.H @ v["M"]}
+
+
+def test_matrix_structured_hessian():
+    target = array([[1.0, 2.0], [2.0, 3.0]])
+    f = MatrixFit(Matrix.symmetric(eye(2)), target)
+    H = f._approx_hessian(step=1e-6)[("M", "M")]
+    assert_allclose(H, SymmetricFit.H, atol=1e-4)
+    hv = f._approx_hessian_vector_product({"M": array([1.0, 1.0, 0.0])}, step=1e-6)
+    assert_allclose(hv["M"], [2.0, 4.0, 0.0], atol=1e-4)
+
+    for method in ["trust-constr", "newton-cg"]:
+        M = Matrix.symmetric(eye(2))
+        SymmetricFit(M, target)._minimize(verbose=False, method=method)
+        assert_allclose(M.value, target, atol=1e-5)
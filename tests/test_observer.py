@@ -0,0 +1,52 @@
+import logging
+
+from numpy.testing import assert_, assert_allclose, assert_equal
+
+from optimix._observer import LoggingObserver, MetricsObserver, Observer
+from test_function import Foo1, Foo8
+
+
+def test_metrics_observer():
+    f = Foo1()
+    f._observer = MetricsObserver()
+    r = f._minimize(verbose=False)
+    m = f._observer
+    assert_equal(m.runs, 1)
+    assert_equal(m.evaluations, r.nfev)
+    assert_(m.steps > 0)
+    assert_allclose(m.values[-1], 0, atol=1e-6)
+    assert_(all(g >= 0 for g in m.gradient_norms))
+    assert_equal(m.summary()["evaluations"], r.nfev)
+
+    f._minimize(verbose=False)
+    assert_equal(m.runs, 2)
+    assert_equal(len(m.messages), 1)
+    assert_(m.messages[0].startswith("Gradient near zero"))
+
+
+def test_observer_scalar(capsys):
+    f = Foo8()
+    f._observer = MetricsObserver()
+    f._minimize_scalar(verbose=True)
+    assert_(f._observer.evaluations > 0)
+    assert_(all(g is None for g in f._observer.gradient_norms))
+    assert_equal(capsys.readouterr().err, "")
+
+
+def test_observer_silent(capsys):
+    f = Foo1()
+    f._observer = Observer()
+    f._minimize(verbose=False)
+    f._minimize(verbose=True)
+    assert_equal(capsys.readouterr().out, "")
+
+
+def test_logging_observer(caplog):
+    f = Foo1()
+    f._observer = LoggingObserver()
+    with caplog.at_level(logging.DEBUG, logger="optimix"):
+        r = f._minimize(verbose=False)
+    messages = [rec.getMessage() for rec in caplog.records]
+    assert_(messages[0] == "L-BFGS-B started on 5 entries.")
+    assert_equal(sum(m.startswith("Evaluation") for m in messages), r.nfev)
+    assert_(messages[-1].startswith("Finished"))
@@ -0,0 +1,45 @@
+import json
+
+from numpy.testing import assert_, assert_equal
+
+from test_function import Foo1, Foo2, Foo3, Foo5
+
+
+def test_profile():
+    f1 = Foo1()
+    f2 = Foo2()
+    f = Foo3([f1, f2])
+
+    r = f._minimize(verbose=False)
+    assert_(r.profile is None)
+
+    f1.c = 1.5
+    r = f._minimize(verbose=False, profile=True)
+    p = r.profile
+    assert_equal(p.name, "Foo3")
+    assert_equal(p.phases["call"].count, r.nfev)
+    for phase in ["history", "scatter", "pack", "value", "gradient", "optimizer"]:
+        assert_(p.phases[phase].count > 0)
+        assert_(p.phases[phase].wall >= 0)
+    assert_(p.phases["call"].wall >= p.phases["scatter"].wall)
+    assert_("value_and_gradient" not in p.phases)
+
+    assert_equal(sorted(p.children), ["Foo3[0]", "Foo3[1]"])
+    assert_equal(p.children["Foo3[0]"].phases["value"].count, r.nfev)
+    assert_("value" not in f1.__dict__)
+    assert_("value" not in f.__dict__)
+
+    d = json.loads(p.to_json())
+    assert_equal(d["children"]["Foo3[1]"]["phases"]["gradient"]["count"], r.nfev + 1)
+    assert_("Foo3[0]" in str(p))
+
+
+def test_profile_fused(tmp_path):
+    f = Foo5()
+    r = f._minimize(verbose=False, profile=True)
+    assert_equal(r.profile.phases["value_and_gradient"].count, r.nfev + 1)
+
+    path = tmp_path / "profile.json"
+    r.profile.to_json(str(path))
+    with open(path) as fp:
+        assert_equal(json.load(fp)["name"], "Foo1")
@@ -0,0 +1,156 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+from numpy import array, zeros
+from numpy.testing import assert_, assert_allclose, assert_equal
+
+from optimix import Function, Scalar, Vector
+from optimix._variables import Variables, merge_variables
+
+
+class Quadratic(Function):
+    """
+    ``c - ‖v - t‖²``, maximized at ``t``, or ``c + ‖v - t‖²`` if ``convex``.
+    """
+
+    def __init__(self, t, c=0.0, convex=False):
+        self._v = Vector(zeros(len(t)))
+        self._t = array(t, float)
+        self._c = c
+        self._sign = 1.0 if convex else -1.0
+        super(Quadratic, self).__init__("Quadratic", v=self._v)
+
+    def value(self):
+        d = self._v.value - self._t
+        return self._c + self._sign * (d @ d)
+
+    def gradient(self):
+        return {"v": self._sign * 2 * (self._v.value - self._t)}
+
+
+class Pair(Function):
+    """
+    ``s²`` plus two :class:`Quadratic` children.
+    """
+
+    def __init__(self):
+        self._s = Scalar(1.0)
+        self._a = Quadratic([1.0])
+        self._b = Quadratic([2.0, 3.0])
+        composite = [("a", self._a), ("b", self._b)]
+        super(Pair, self).__init__("Pair", composite, s=self._s)
+
+    def value(self):
+        return float(self._s.value) ** 2 + self._a.value() + self._b.value()
+
+    def gradient(self):
+        g = {"s": 2 * float(self._s.value)}
+        g.update({"a." + k: v for k, v in self._a.gradient().items()})
+        g.update({"b." + k: v for k, v in self._b.gradient().items()})
+        return g
+
+
+def test_maximize_keeps_sign():
+    f = Quadratic([1.0, -1.0], c=2.0)
+    r = f._maximize(verbose=False)
+    assert_allclose(r.value, 2.0)
+    assert_allclose(f.value(), 2.0)
+    assert_allclose(f._v.value, [1.0, -1.0], atol=1e-6)
+
+    # Direct calls report the most recent run.
+    value, grad = f(zeros(2))
+    assert_allclose(value, 0.0)
+    assert_allclose(grad, [-2.0, 2.0])
+    assert_equal(f._history.count, r.nfev + 1)
+
+
+def test_concurrent_runs():
+    targets = [[float(i), -float(i)] for i in range(8)]
+    functions = [Quadratic(t, i, i % 2 == 1) for i, t in enumerate(targets)]
+
+    def run(i):
+        f = functions[i]
+        optimize = f._maximize if i % 2 == 0 else f._minimize
+        return optimize(verbose=False)
+
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(run, range(len(functions))))
+
+    for i, (f, r) in enumerate(zip(functions, results)):
+        assert_(r.success)
+        assert_allclose(f._v.value, targets[i], atol=1e-5)
+        assert_allclose(r.value, i, atol=1e-8)
+        assert_allclose(f.value(), r.value)
+
+
+def test_shared_lock():
+    f = Pair()
+    lock = f._variables.lock
+    assert_(f._a._variables.lock is lock)
+    assert_(f._b._variables.lock is lock)
+    with lock:
+        f._s.value = 0.5
+        assert_(f._variables.lock is lock)
+
+    g = pickle.loads(pickle.dumps(f))
+    assert_(g._a._variables.lock is g._variables.lock)
+    assert_(g._variables.lock is not lock)
+
+    # A lock already in use is kept and handed to the merged set.
+    q = Quadratic([1.0])
+    own = q._variables.lock
+    merged = merge_variables({"": Variables(), "q": q._variables})
+    assert_(merged.lock is own)
+
+
+def test_profile_ends_with_run():
+    f = Quadratic([1.0, -1.0], convex=True)
+    r = f._minimize(verbose=False, profile=True)
+    count = r.profile.phases["call"].count
+    for _ in range(5):
+        f(zeros(2))
+    assert_equal(r.profile.phases["call"].count, count)
+
+
+class Shared(Function):
+    """
+    ``(s - 1)²`` plus a child which may be shared with other functions.
+    """
+
+    def __init__(self, child):
+        self._s = Scalar(0.0)
+        self._child = child
+        super(Shared, self).__init__("Shared", [("c", child)], s=self._s)
+
+    def value(self):
+        return (float(self._s.value) - 1) ** 2 + self._child.value()
+
+    def gradient(self):
+        g = {"s": 2 * (float(self._s.value) - 1)}
+        g.update({"c." + k: v for k, v in self._child.gradient().items()})
+        return g
+
+
+def test_profile_shared_child():
+    child = Quadratic([2.0], convex=True)
+    f, g = Shared(child), Shared(child)
+
+    options = dict(verbose=False, profile=True)
+    with ThreadPoolExecutor(2) as executor:
+        runs = [executor.submit(h._minimize, **options) for h in (f, g)]
+        # Meanwhile, direct calls of the child are not accounted for.
+        for _ in range(50):
+            child.value()
+        rf, rg = [r.result() for r in runs]
+
+    for r, h in [(rf, f), (rg, g)]:
+        assert_(r.success)
+        phases = r.profile.children["c"].phases
+        for name in ["value", "gradient"]:
+            assert_(r.profile.phases[name].count > 0)
+            assert_equal(phases[name].count, r.profile.phases[name].count)
+        assert_("value" not in h.__dict__)
+    assert_("value" not in child.__dict__)
+    count = rf.profile.children["c"].phases["value"].count
+    child.value()
+    assert_equal(rf.profile.children["c"].phases["value"].count, count)
@@ -1,4 +1,4 @@
-from numpy import asarray, atleast_1d
+from numpy import asarray, atleast_1d, inf
 from numpy.testing import assert_, assert_allclose
 
 from optimix import Scalar, Vector
@@ -129,3 +129,120 @@ def test_types_modify_vector():
     value = atleast_1d(a.value)
     value[0] = 2.0
     assert_allclose(a.value, value)
+
+
+def test_types_value_assignment():
+    import pytest
+
+    from optimix._types import _assign
+
+    a = Scalar(1.0)
+    a.value = asarray([2.0])
+    assert_(a.value == 2.0)
+    a.value = "3.5"
+    assert_(a.value == 3.5)
+    with pytest.raises(AttributeError):
+        a.other = 1.0
+
+    b = Vector([1.0, 2.0])
+    b.value = asarray([[3.0], [4.0]])
+    assert_allclose(b.value, [3.0, 4.0])
+    b.value = 0.5
+    assert_allclose(b.value, [0.5, 0.5])
+
+    w = _Watcher()
+    b.listen(w.notify)
+    _assign(b, asarray([5.0, 6.0]))
+    _assign(a, asarray([7.0]))
+    assert_allclose(b.value, [5.0, 6.0])
+    assert_(a.value == 7.0)
+    assert_(w.calls == 1)
+
+
+class _Watcher(object):
+    def __init__(self):
+        self.calls = 0
+
+    def notify(self):
+        self.calls += 1
+
+
+def test_types_pickle():
+    import pickle
+
+    from ndarray_listener import ndl
+
+    from optimix import Matrix
+
+    a = Scalar(1.0)
+    a.bounds = (0.0, 2.0)
+    a.fix()
+    b = Vector([1.0, 2.0])
+    b.bounds = [(0.0, 1.0), (-1.0, 3.0)]
+    m = Matrix(ndl([[1.0, 2.0], [3.0, 4.0]]))
+    w = _Watcher()
+    for v in [a, b, m]:
+        v.listen(w.notify)
+
+    a1, b1, m1, w1 = pickle.loads(pickle.dumps((a, b, m, w)))
+    assert_(a1 == a)
+    assert_(a1.bounds == (0.0, 2.0))
+    assert_(a1.isfixed)
+    assert_allclose(b1.value, [1.0, 2.0])
+    assert_(b1.bounds == [(0.0, 1.0), (-1.0, 3.0)])
+    assert_(not b1.isfixed)
+    assert_allclose(m1.value, [[1.0, 2.0], [3.0, 4.0]])
+
+    a1.value = 2.0
+    b1.value[0] = 0.5
+    m1.value[0, 0] = 0.0
+    assert_(w1.calls == 3)
+    assert_(w.calls == 0)
+    assert_(a.value == 1.0)
+
+
+def test_types_bounds():
+    import pickle
+
+    import pytest
+
+    a = Scalar(1.0)
+    a.bounds = (0.0, 2.0)
+    a.value = 5.0
+    assert_(a.value == 2.0)
+    a.upper = 10.0
+    assert_(a.bounds == (0.0, 10.0))
+    with pytest.raises(ValueError):
+        a.lower = 11.0
+
+    b = Vector([1.0, 2.0, 3.0])
+    assert_(b.bounds == [(-inf, inf)] * 3)
+    b.bounds = (0.0, [1.0, 2.0, 2.5])
+    assert_allclose(b.lower, [0.0, 0.0, 0.0])
+    assert_allclose(b.upper, [1.0, 2.0, 2.5])
+    assert_allclose(b.value, [1.0, 2.0, 3.0])
+    b.value = [-1.0, 1.5, 4.0]
+    assert_allclose(b.value, [0.0, 1.5, 2.5])
+
+    b.lower = -1.0
+    assert_(b.bounds == [(-1.0, 1.0), (-1.0, 2.0), (-1.0, 2.5)])
+    b.bounds = [(0.0, 1.0), (1.0, 2.0), (2.0, 3.0)]
+    assert_allclose(b.lower, [0.0, 1.0, 2.0])
+    with pytest.raises(ValueError):
+        b.upper = 0.5
+    with pytest.raises(ValueError):
+        b.lower[0] = 1.0
+
+    # Per-entry pairs of a two-entry vector are not read as (lower, upper).
+    c = Vector([0.5, 0.5])
+    c.bounds = ((0.0, 1.0), (-1.0, 2.0))
+    assert_(c.bounds == [(0.0, 1.0), (-1.0, 2.0)])
+    c.lower, c.upper = [-1.0, 0.0], [2.0, 1.0]
+    assert_(c.bounds == [(-1.0, 2.0), (0.0, 1.0)])
+    with pytest.raises(ValueError):
+        c.bounds = (0.0, 1.0, 2.0)
+
+    b1 = pickle.loads(pickle.dumps(b))
+    assert_allclose(b1.upper, [1.0, 2.0, 3.0])
+    b1.value = 10.0
+    assert_allclose(b1.value, [1.0, 2.0, 3.0])
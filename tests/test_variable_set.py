@@ -0,0 +1,145 @@
+import pickle
+
+import pytest
+from numpy import arange, array, inf, zeros
+from numpy.testing import assert_, assert_allclose, assert_equal
+
+from optimix import Function, Scalar, Vector, VariableSet
+from optimix._variables import Variables
+
+
+class _Watcher(object):
+    def __init__(self):
+        self.calls = 0
+
+    def notify(self):
+        self.calls += 1
+
+
+def test_variable_set_views():
+    b = Vector([1.0, 2.0])
+    b.bounds = [(0, 5), (-1, 3)]
+    b.fix()
+    vs = VariableSet({"c": 3.0, "a": 1.0, "b": b, "d": [4.0, 5.0, 6.0]})
+
+    assert_equal(vs.names(), ["a", "b", "c", "d"])
+    assert_allclose(vs.buffer, [1, 1, 2, 3, 4, 5, 6])
+    assert_(isinstance(vs["a"], Scalar))
+    assert_(isinstance(vs["d"], Vector))
+    assert_(vs["b"].isfixed)
+    assert_equal(vs["b"].bounds, [(0, 5), (-1, 3)])
+    assert_equal(vs["a"].bounds, (-inf, inf))
+
+    a = vs["a"]
+    a.value = 7.0
+    vs["d"].value = [0.0, 0.5, 1.0]
+    assert_allclose(vs.buffer, [7, 1, 2, 3, 0, 0.5, 1])
+    a.bounds = (-1, 10)
+    assert_equal(vs["a"].bounds, (-1, 10))
+    vs["a"].value = 20.0
+    assert_equal(a.value, 10.0)
+    vs["b"].upper = 4.0
+    assert_equal(vs["b"].bounds, [(0, 4), (-1, 4)])
+    vs["b"].value = [5.0, -2.0]
+    assert_allclose(vs["b"].value, [4.0, -1.0])
+
+    free = vs.select(False)
+    assert_equal(free.names(), ["a", "c", "d"])
+    assert_("b" not in free)
+    with pytest.raises(KeyError):
+        free["b"]
+    with pytest.raises(TypeError):
+        vs["e"] = Scalar(0.0)
+
+    w = _Watcher()
+    vs["c"].listen(w.notify)
+    a.value = 8.0
+    assert_equal(w.calls, 1)
+
+
+def test_variable_set_plan():
+    vs = VariableSet({f"x{i:05d}": float(i) for i in range(10**5)})
+    plan = vs.plan()
+    assert_equal(plan.size, 10**5)
+    assert_equal(plan.index, slice(0, 10**5))
+    assert_(vs.plan() is plan)
+
+    vs["x00001"].fix()
+    plan = vs.plan()
+    assert_equal(plan.size, 10**5 - 1)
+    assert_equal(plan.names[:2], ("x00000", "x00002"))
+    x = plan.gather(zeros(plan.size))
+    assert_allclose(x[:3], [0, 2, 3])
+
+    plan.scatter(x + 1)
+    assert_allclose(vs.buffer[:3], [1, 1, 3])
+    assert_equal(len(vs.select(True)), 1)
+
+
+def test_variable_set_copies():
+    vs = VariableSet({"a": 1.0, "b": [2.0, 3.0]})
+    vs["b"].bounds = [(0, 4), (0, 4)]
+    vs["a"].fix()
+    data = vs.to_bytes()
+    restored = Variables.from_bytes(data)
+    assert_allclose(restored["b"].value, [2, 3])
+    assert_(restored["a"].isfixed)
+
+    copy = pickle.loads(pickle.dumps(vs))
+    assert_allclose(copy.buffer, vs.buffer)
+    assert_(copy["a"].isfixed)
+    copy["b"].value = [0.0, 0.0]
+    assert_allclose(vs["b"].value, [2, 3])
+
+    free = pickle.loads(pickle.dumps(vs.select(False)))
+    assert_equal(free.names(), ["b"])
+
+    view = pickle.loads(pickle.dumps(vs["b"]))
+    assert_(type(view) is Vector)
+    assert_equal(view.bounds, [(0, 4), (0, 4)])
+
+
+class Sphere(Function):
+    def __init__(self, n):
+        self._target = arange(n, dtype=float)
+        vs = VariableSet({"s": 0.0, "v": zeros(n)})
+        self._s = vs["s"]
+        self._v = vs["v"]
+        super(Sphere, self).__init__("Sphere", variables=vs)
+
+    def value(self):
+        d = self._v.value - self._target
+        return (float(self._s.value) - 1) ** 2 + d @ d
+
+    def gradient(self):
+        return {
+            "s": 2 * (float(self._s.value) - 1),
+            "v": 2 * (self._v.value - self._target),
+        }
+
+
+def test_variable_set_function():
+    assert_(Sphere(5)._check_grad() < 1e-4)
+
+    f = Sphere(1000)
+    assert_(isinstance(f._variables, VariableSet))
+    f._minimize(verbose=False)
+    assert_allclose(f._v.value, f._target, atol=1e-5)
+    assert_allclose(f._s.value, 1, atol=1e-5)
+
+    f._s.value = 0.0
+    f._s.fix()
+    f._v.value = zeros(1000)
+    f._minimize(verbose=False)
+    assert_allclose(f._s.value, 0)
+    assert_allclose(f._v.value, f._target, atol=1e-5)
+
+    class Merged(Sphere):
+        def __init__(self, vs):
+            Function.__init__(self, "Merged", variables=vs, b=Scalar(2.0))
+
+    vs = VariableSet({"a": 1.0})
+    g = Merged(vs)
+    assert_equal(g._variables.names(), ["a", "b"])
+    g._variables["a"].value = array(3.0)
+    assert_allclose(vs["a"].value, 3)
@@ -42,3 +42,123 @@ def test_variables_setattr():
 
     assert_equal(a.get("a0").value, 1.0)
     assert_equal(a.get("a1").value, 3.0)
+
+
+def test_variables_contiguous():
+    from numpy import shares_memory
+
+    from optimix import Vector
+
+    a = Variables(a0=Scalar(1.0), a1=Vector([2.0, 3.0]))
+    b = Variables(b0=Scalar(4.0))
+    c = merge_variables(dict(a=a, b=b), contiguous=True)
+
+    assert_allclose(c.buffer, [1.0, 2.0, 3.0, 4.0])
+    for name in c.names():
+        assert_(shares_memory(c[name].raw, c.buffer))
+
+    calls = []
+    b.get("b0").listen(lambda: calls.append(1))
+    c.buffer[:] = [5.0, 6.0, 7.0, 8.0]
+    assert_equal(a.get("a0").value, 5.0)
+    assert_allclose(a.get("a1").value, [6.0, 7.0])
+
+    b.get("b0").value = 9.0
+    assert_equal(c.buffer[3], 9.0)
+    assert_equal(len(calls), 1)
+
+    d = merge_variables(dict(c=c), contiguous=True)
+    assert_(c.buffer is None)
+    assert_(d.buffer is not None)
+
+
+def test_variables_plan():
+    from numpy import inf
+
+    from optimix import Vector
+
+    a = Scalar(1.0)
+    b = Vector([2.0, 3.0])
+    v = Variables(a=a, b=b)
+
+    plan = v.plan()
+    assert_(v.plan() is plan)
+    assert_equal(plan.names, ("a", "b"))
+    assert_equal(plan.offsets, [0, 1, 3])
+    assert_equal(plan.lower, [-inf, -inf, -inf])
+
+    a.fix()
+    plan = v.plan()
+    assert_equal(plan.names, ("b",))
+    assert_allclose(plan.gather(plan.lower.copy()), [2.0, 3.0])
+
+    b.bounds = [(0.0, 1.0), (-1.0, 5.0)]
+    plan = v.plan()
+    assert_equal(plan.lower, [0.0, -1.0])
+    assert_equal(plan.upper, [1.0, 5.0])
+
+    plan.scatter([0.5, 4.0])
+    assert_allclose(b.value, [0.5, 4.0])
+
+    a.unfix()
+    assert_(v.plan() is not plan)
+    assert_equal(v.plan().names, ("a", "b"))
+
+
+def test_variables_bytes():
+    from optimix import Vector
+
+    v = Variables(a=Scalar(1.5), b=Vector([1.0, 2.0, 3.0]))
+    v["a"].bounds = (0.0, 2.0)
+    v["b"].fix()
+
+    w = Variables.from_bytes(v.to_bytes())
+    assert_equal(w.names(), ["a", "b"])
+    assert_equal(w["a"].value, 1.5)
+    assert_equal(w["a"].value.ndim, 0)
+    assert_equal(w["a"].bounds, (0.0, 2.0))
+    assert_allclose(w["b"].value, [1.0, 2.0, 3.0])
+    assert_(w["b"].isfixed)
+    assert_(not w["a"].isfixed)
+
+
+def test_variables_pickle():
+    import pickle
+
+    from numpy import shares_memory
+
+    from optimix import Vector
+
+    a = Variables(a0=Scalar(1.0), a1=Vector([2.0, 3.0]))
+    c = merge_variables(dict(a=a), contiguous=True)
+    d = pickle.loads(pickle.dumps(c))
+    assert_allclose(d.buffer, [1.0, 2.0, 3.0])
+    assert_(shares_memory(d["a.a1"].raw, d.buffer))
+    assert_(not shares_memory(d.buffer, c.buffer))
+
+
+def test_variables_plan_versions():
+    from optimix import VariableSet, Vector
+
+    a = Variables(x=Scalar(1.0), y=Vector([2.0, 3.0]))
+    b = Variables(z=Scalar(4.0))
+    vs = VariableSet({"u": 1.0, "w": [2.0, 3.0]})
+    merged = merge_variables(dict(a=a, s=vs))
+    plans = [v.plan() for v in (a, b, vs, merged)]
+
+    # Changes to unrelated variables leave the plans alone.
+    b["z"].fix()
+    same = [v.plan() is p for v, p in zip((a, b, vs, merged), plans)]
+    assert_equal(same, [True, False, True, True])
+
+    a["y"].fix()
+    assert_(a.plan() is not plans[0] and merged.plan() is not plans[3])
+    assert_(vs.plan() is plans[2])
+    assert_equal(merged.plan().names, ("a.x", "s.u", "s.w"))
+
+    vs["u"].fix()
+    assert_(vs.plan() is not plans[2])
+    assert_equal(merged.plan().names, ("a.x", "s.w"))
+
+    merged["t"] = Scalar(0.0)
+    assert_equal(merged.plan().names, ("a.x", "s.w", "t"))